@@ -46,3 +46,42 @@
 #     list_display = ('name', 'created_by', 'created_at')
 #     search_fields = ('name',)
 #     ordering = ('name',)
+
+
+from django.contrib import admin
+from accounts.models import Organization, OrganizationTeardown
+from accounts.utils.organization_teardown import start_organization_teardown
+
+
+@admin.register(Organization)
+class OrganizationAdmin(admin.ModelAdmin):
+    """
+    Deleting an organization starts a background teardown instead of a cascade
+    that would load and delete all of its users and kudos in one transaction
+    """
+    list_display = ('name', 'is_active', 'created_at')
+    search_fields = ('name',)
+    list_per_page = 10
+
+    def get_deleted_objects(self, objs, request):
+        # Don't collect every related row just to render the confirmation page
+        deleted_objects = [f"{obj} (users and kudos are deleted in the background)" for obj in objs]
+        return deleted_objects, {}, set(), []
+
+    def delete_model(self, request, obj):
+        start_organization_teardown(obj, user=request.user)
+
+    def delete_queryset(self, request, queryset):
+        for organization in queryset:
+            start_organization_teardown(organization, user=request.user)
+
+
+@admin.register(OrganizationTeardown)
+class OrganizationTeardownAdmin(admin.ModelAdmin):
+    list_display = (
+        'organization_name', 'status', 'stage', 'kudos_deleted',
+        'tokens_deleted', 'users_deleted', 'updated_at'
+    )
+    list_filter = ('status',)
+    list_per_page = 10
+    readonly_fields = [field.name for field in OrganizationTeardown._meta.fields]
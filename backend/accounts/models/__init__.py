@@ -1,4 +1,6 @@
 from .organization import Organization
 from .user import User
+from .organization_teardown import OrganizationTeardown
+from .user_import_job import UserImportJob
 
-__all__ = ['Organization', 'User']
\ No newline at end of file
+__all__ = ['Organization', 'User', 'OrganizationTeardown', 'UserImportJob']
@@ -1,6 +1,5 @@
 from django.db import models
 from utils_app.models.base_model import BaseModel
-from django.core.cache import cache
 
 class Organization(BaseModel):
     name = models.CharField(max_length=255, unique=True)
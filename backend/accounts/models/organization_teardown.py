@@ -0,0 +1,56 @@
+from django.db import models
+from utils_app.models.base_model import BaseModel
+
+class OrganizationTeardown(BaseModel):
+    """
+    Progress of the background deletion of an organization, see
+    accounts.tasks.teardown_organization. Stages run in order and every batch
+    commits together with its counters, so a job resumes where it stopped.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    STAGE_KUDOS = 'kudos'
+    STAGE_ARCHIVED_KUDOS = 'archived_kudos'
+    STAGE_TOKENS = 'tokens'
+    STAGE_USERS = 'users'
+    STAGE_ORGANIZATION = 'organization'
+    STAGE_DONE = 'done'
+    STAGE_CHOICES = [
+        (STAGE_KUDOS, 'Kudos'),
+        (STAGE_ARCHIVED_KUDOS, 'Archived kudos'),
+        (STAGE_TOKENS, 'Tokens'),
+        (STAGE_USERS, 'Users'),
+        (STAGE_ORGANIZATION, 'Organization'),
+        (STAGE_DONE, 'Done'),
+    ]
+
+    # Kept after the organization row itself is gone
+    organization = models.ForeignKey(
+        'accounts.Organization', on_delete=models.SET_NULL, null=True, blank=True, related_name="teardowns"
+    )
+    organization_pk = models.PositiveBigIntegerField()
+    organization_name = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    stage = models.CharField(max_length=20, choices=STAGE_CHOICES, default=STAGE_KUDOS)
+    kudos_deleted = models.PositiveIntegerField(default=0)
+    tokens_deleted = models.PositiveIntegerField(default=0)
+    users_deleted = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    # Failed runs since the last batch that committed, see resume_organization_teardowns
+    attempts = models.PositiveIntegerField(default=0)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Teardown of {self.organization_name} ({self.status}, {self.stage})"
+
+    class Meta:
+        ordering = ['-id']
@@ -3,11 +3,11 @@ from django.db import models
 from django.utils import timezone
 from datetime import timedelta
 from accounts.models.organization import Organization
-from utils_app.models.base_model import BaseModel
+from utils_app.models.base_model import BaseModel, SoftDeleteQuerySet
 from django.core.exceptions import ValidationError
 from django.contrib.auth.models import UserManager
 
-class CustomUserManager(UserManager):
+class CustomUserManager(UserManager.from_queryset(SoftDeleteQuerySet)):
     def create_user(self, email, password=None, **extra_fields):
         if not email:
             raise ValueError('The Email field must be set')
@@ -75,4 +75,11 @@ class User(AbstractUser, BaseModel):
         ordering = ['-id']
         indexes = [
             models.Index(fields=['last_kudos_reset']),
+            # Organization.get_all_users() and the leaderboard; partial rather than
+            # (organization, is_active) since SQLite can't seek on a bare boolean term
+            models.Index(
+                fields=['organization', '-id'],
+                condition=models.Q(is_active=True),
+                name='user_org_active_idx',
+            ),
         ]
@@ -0,0 +1,37 @@
+from django.db import models
+from accounts.models.organization import Organization
+from utils_app.models.base_model import BaseModel
+
+class UserImportJob(BaseModel):
+    """
+    A CSV of users uploaded by an organization owner, imported in the
+    background by accounts.tasks.import_organization_users
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="user_imports")
+    # Deleted once imported, since it may hold passwords
+    file = models.FileField(upload_to='user_imports/%Y/%m/', blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    # The first USER_IMPORT_MAX_ERRORS of
+    # [{"row": line number, "email": ..., "errors": {field: [messages]}}]
+    errors = models.JSONField(default=list, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"User import for {self.organization} ({self.status})"
+
+    class Meta:
+        ordering = ['-id']
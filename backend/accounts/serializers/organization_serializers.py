@@ -1,9 +1,13 @@
+import csv
+
+from django.conf import settings
 from django.contrib.auth.models import Group
 from django.db import transaction
 from rest_framework import serializers
 
-from accounts.models import User, Organization
+from accounts.models import User, Organization, UserImportJob
 from accounts.serializers.auth_serializers import UserMinimalSerializer
+from accounts.utils.user_import import count_rows, validate_header
 
 
 class OrganizationDetailSerializer(serializers.ModelSerializer):
@@ -88,3 +92,43 @@ class AddOrganizationUserSerializer(serializers.Serializer):
             raise serializers.ValidationError(
                 {"non_field_errors": f"User creation failed: {str(e)}"}
             )
+
+
+class UserImportUploadSerializer(serializers.Serializer):
+    """
+    Serializer for a CSV of users to import; checks its size, header and row
+    count, the rows themselves are validated by the import
+    """
+    file = serializers.FileField()
+
+    def validate_file(self, value):
+        if value.size > settings.USER_IMPORT_MAX_BYTES:
+            raise serializers.ValidationError(
+                f"The file is larger than {settings.USER_IMPORT_MAX_BYTES // (1024 * 1024)} MB"
+            )
+        try:
+            header = value.readline().decode('utf-8-sig')
+            value.seek(0)
+            rows = count_rows(value, settings.USER_IMPORT_MAX_ROWS)
+        except (UnicodeDecodeError, csv.Error):
+            raise serializers.ValidationError("The file must be a UTF-8 encoded CSV")
+        finally:
+            value.seek(0)
+        error = validate_header(next(csv.reader([header]), []))
+        if error:
+            raise serializers.ValidationError(error)
+        if rows > settings.USER_IMPORT_MAX_ROWS:
+            raise serializers.ValidationError(f"The file has more than {settings.USER_IMPORT_MAX_ROWS} rows")
+        return value
+
+
+class UserImportJobSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the progress and per-row error report of a user import
+    """
+    class Meta:
+        model = UserImportJob
+        fields = [
+            'id', 'status', 'processed_rows', 'created_count', 'error_count',
+            'errors', 'created_at', 'finished_at',
+        ]
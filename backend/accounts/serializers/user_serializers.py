@@ -5,6 +5,7 @@ from datetime import timedelta
 from accounts.models import User
 from accounts.serializers.group_serializers import GroupMinimalSerializer
 from accounts.serializers.organization_serializers import OrganizationDetailSerializer
+from utils_app.serializers import SparseFieldsetMixin
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
@@ -28,7 +29,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
         fields = ['id', 'email', 'first_name', 'last_name', 'kudos_available', 'is_active']
 
 
-class UserProfileRetrieveSerializer(serializers.ModelSerializer):
+class UserProfileRetrieveSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for retrieving user profile information
     """
@@ -90,7 +91,7 @@ class ChangePasswordSerializer(serializers.Serializer):
         return data
 
 
-class UserListSerializer(serializers.ModelSerializer):
+class UserListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for listing users with essential information
     """
@@ -0,0 +1,74 @@
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save, m2m_changed
+from django.dispatch import receiver
+from django.utils.timezone import now
+
+from accounts.models import Organization, User
+from accounts.utils.organization_cache import bump_organization_version, bump_organization_versions
+from utils_app.signals import post_bulk_soft_delete, post_bulk_restore
+
+# User fields that show up in organization-scoped cached responses
+CACHED_USER_FIELDS = {'email', 'first_name', 'last_name', 'is_active', 'organization'}
+
+
+@receiver(post_save, sender=User)
+def invalidate_organization_on_user_change(sender, instance, created, update_fields=None, **kwargs):
+    """Bump the organization version when a user joins, changes or is deactivated"""
+    if update_fields is not None and not CACHED_USER_FIELDS.intersection(update_fields):
+        return
+    organization_id = instance.organization_id
+    transaction.on_commit(lambda: bump_organization_version(organization_id))
+
+
+@receiver(post_bulk_soft_delete, sender=User)
+@receiver(post_bulk_restore, sender=User)
+def invalidate_organizations_on_bulk_user_change(sender, pks, using, **kwargs):
+    """Bump, once each, the organizations of users deactivated or restored in bulk"""
+    organization_ids = list(
+        User.objects.using(using).filter(pk__in=pks).order_by().values_list('organization_id', flat=True).distinct()
+    )
+    transaction.on_commit(lambda: bump_organization_versions(organization_ids), using=using)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def touch_users_on_group_change(sender, instance, action, reverse, pk_set, using, **kwargs):
+    """
+    Move updated_at of users whose role changed so their cached fragments
+    miss, and bump their organizations, whose cached responses embed roles
+    """
+    if reverse and action == 'pre_clear':
+        # pk_set is None on clear, so remember who was in the group
+        instance._cleared_user_pks = list(instance.user_set.using(using).values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        user_pks = [instance.pk]
+    elif action == 'post_clear':
+        user_pks = getattr(instance, '_cleared_user_pks', [])
+    else:
+        user_pks = pk_set or []
+
+    users = User.objects.using(using).filter(pk__in=user_pks)
+    users.update(updated_at=now())
+    organization_ids = list(users.order_by().values_list('organization_id', flat=True).distinct())
+    transaction.on_commit(lambda: bump_organization_versions(organization_ids), using=using)
+
+
+@receiver(pre_save, sender=Organization)
+def detect_organization_rename(sender, instance, using, update_fields=None, **kwargs):
+    """Note on the instance whether this save changes the stored name"""
+    instance._renamed = False
+    if instance.pk is None or (update_fields is not None and 'name' not in update_fields):
+        return
+    stored_name = Organization.objects.using(using).filter(pk=instance.pk).values_list('name', flat=True).first()
+    instance._renamed = stored_name is not None and stored_name != instance.name
+
+
+@receiver(post_save, sender=Organization)
+def touch_users_on_organization_change(sender, instance, created, **kwargs):
+    """Organization names are embedded in user fragments, refresh them on rename"""
+    if created or not getattr(instance, '_renamed', False):
+        return
+    User.objects.filter(organization=instance).update(updated_at=now())
+    transaction.on_commit(lambda: bump_organization_version(instance.pk))
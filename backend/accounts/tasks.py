@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from accounts.models import OrganizationTeardown, UserImportJob
+from accounts.utils.organization_teardown import run_organization_teardown
+from accounts.utils.user_import import run_user_import
+
+
+@shared_task
+def teardown_organization(teardown_id, max_batches=None):
+    """
+    Delete an organization's kudos, tokens, users and finally the organization
+    in bounded batches, re-queueing itself between chunks of batches
+    """
+    max_batches = max_batches or settings.ORGANIZATION_TEARDOWN_BATCHES_PER_RUN
+    try:
+        teardown = run_organization_teardown(teardown_id, max_batches=max_batches)
+    except Exception as e:
+        OrganizationTeardown.objects.filter(pk=teardown_id).update(
+            status=OrganizationTeardown.STATUS_FAILED,
+            last_error=str(e),
+            attempts=F('attempts') + 1,
+            updated_at=timezone.now()
+        )
+        raise
+
+    if teardown.status != OrganizationTeardown.STATUS_COMPLETED:
+        teardown_organization.delay(teardown_id, max_batches)
+    return f"Teardown of {teardown.organization_name}: {teardown.stage}"
+
+
+@shared_task
+def resume_organization_teardowns():
+    """
+    Re-queue teardowns whose worker went away, and failed ones with a delay
+    doubling after each failure, until ORGANIZATION_TEARDOWN_MAX_ATTEMPTS
+    runs in a row failed
+    """
+    now = timezone.now()
+    retry_delay = timedelta(minutes=10)
+    teardowns = OrganizationTeardown.objects.exclude(
+        status=OrganizationTeardown.STATUS_COMPLETED
+    ).filter(
+        updated_at__lt=now - retry_delay,
+        attempts__lt=settings.ORGANIZATION_TEARDOWN_MAX_ATTEMPTS
+    ).only('pk', 'status', 'attempts', 'updated_at')
+
+    resumed = 0
+    for teardown in teardowns:
+        if teardown.status == OrganizationTeardown.STATUS_FAILED:
+            if teardown.updated_at > now - retry_delay * 2 ** (teardown.attempts - 1):
+                continue
+        teardown_organization.delay(teardown.pk)
+        resumed += 1
+    return f"Resumed {resumed} teardowns"
+
+
+@shared_task
+def import_organization_users(job_id):
+    """
+    Import a CSV of users into an organization in batches, recording progress
+    and the per-row error report on the UserImportJob
+    """
+    try:
+        job = run_user_import(job_id)
+    except Exception:
+        UserImportJob.objects.filter(pk=job_id).update(
+            status=UserImportJob.STATUS_FAILED,
+            updated_at=timezone.now()
+        )
+        raise
+    return f"Imported {job.created_count} users, {job.error_count} rows failed"
@@ -0,0 +1,110 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import Organization, OrganizationTeardown, User
+from accounts.tasks import resume_organization_teardowns, teardown_organization
+from accounts.utils.organization_teardown import start_organization_teardown, run_organization_teardown
+from kudos_app.models import Kudos, KudosArchive
+from utils_app.utils import tiered_cache
+from .test_base import AccountsTestCase
+
+
+class OrganizationTeardownTests(AccountsTestCase):
+
+    def setUp(self):
+        super().setUp()
+        tiered_cache.clear()
+        self.organization = Organization.objects.get(name='Test Organization')
+        self.other_user = User.objects.get(email='other@example.com')
+        for user in User.objects.all():
+            RefreshToken.for_user(user)
+        # One archived kudos, moved by hand
+        kudos = Kudos.objects.filter(pk=1).values(*KudosArchive.KUDOS_FIELDS).get()
+        KudosArchive.objects.create(**kudos)
+        Kudos.objects.filter(pk=1).delete()
+
+    def assertTornDown(self, teardown):
+        self.assertEqual(teardown.status, OrganizationTeardown.STATUS_COMPLETED)
+        self.assertEqual(teardown.stage, OrganizationTeardown.STAGE_DONE)
+        self.assertEqual((teardown.kudos_deleted, teardown.tokens_deleted, teardown.users_deleted), (5, 3, 3))
+        self.assertFalse(Organization.objects.filter(pk=self.organization.pk).exists())
+        self.assertFalse(User.objects.filter(organization_id=self.organization.pk).exists())
+        self.assertEqual(Kudos.objects.count() + KudosArchive.objects.count(), 0)
+        # Other organizations are left alone
+        self.assertTrue(User.active_objects.filter(pk=self.other_user.pk).exists())
+        self.assertEqual(list(OutstandingToken.objects.values_list('user_id', flat=True)), [self.other_user.pk])
+
+    def test_start_disables_organization(self):
+        """Test the organization and its users are disabled at once, and a teardown is reused"""
+        owner = User.objects.get(email='test@example.com')
+        teardown = start_organization_teardown(self.organization, user=owner)
+
+        self.assertEqual(teardown.organization_pk, self.organization.pk)
+        self.assertFalse(Organization.active_objects.filter(pk=self.organization.pk).exists())
+        self.assertFalse(User.active_objects.filter(organization=self.organization).exists())
+        self.assertEqual(start_organization_teardown(self.organization), teardown)
+        self.assertEqual(OrganizationTeardown.objects.count(), 1)
+
+    def test_teardown_in_batches(self):
+        """Test a teardown deletes everything in bounded batches"""
+        teardown = start_organization_teardown(self.organization)
+        teardown_organization(teardown.pk)
+        self.assertTornDown(OrganizationTeardown.objects.get(pk=teardown.pk))
+
+    def test_teardown_resumes(self):
+        """Test an interrupted teardown picks up where it stopped and reruns are harmless"""
+        teardown = start_organization_teardown(self.organization)
+
+        teardown = run_organization_teardown(teardown.pk, max_batches=3, batch_size=2)
+        self.assertEqual(teardown.status, OrganizationTeardown.STATUS_RUNNING)
+        self.assertEqual(teardown.kudos_deleted, 4)
+
+        run_organization_teardown(teardown.pk, batch_size=2)
+        teardown = run_organization_teardown(teardown.pk, batch_size=2)
+        self.assertTornDown(teardown)
+
+    @override_settings(ORGANIZATION_TEARDOWN_MAX_ATTEMPTS=3)
+    def test_failed_teardown_retries_are_limited(self):
+        """Test failed runs are counted and retried with a growing delay, up to the maximum"""
+        teardown = start_organization_teardown(self.organization)
+        with mock.patch('accounts.tasks.run_organization_teardown', side_effect=RuntimeError("database is gone")):
+            with self.assertRaises(RuntimeError):
+                teardown_organization(teardown.pk)
+        teardown.refresh_from_db()
+        self.assertEqual((teardown.status, teardown.attempts), (OrganizationTeardown.STATUS_FAILED, 1))
+
+        def resumed(attempts, minutes_ago):
+            OrganizationTeardown.objects.filter(pk=teardown.pk).update(
+                attempts=attempts, updated_at=timezone.now() - timedelta(minutes=minutes_ago)
+            )
+            with mock.patch('accounts.tasks.teardown_organization.delay') as delay:
+                resume_organization_teardowns()
+            return delay.called
+
+        self.assertTrue(resumed(1, 11))
+        self.assertFalse(resumed(2, 11))
+        self.assertTrue(resumed(2, 21))
+        self.assertFalse(resumed(3, 600))
+
+        # A run that gets a batch through starts the count again
+        teardown = run_organization_teardown(teardown.pk)
+        self.assertEqual(teardown.attempts, 0)
+
+    def test_admin_delete_starts_teardown(self):
+        """Test deleting an organization in the admin only disables it and queues the teardown"""
+        admin_user = User.objects.create_superuser(email='root@example.com', first_name='Root', password='x')
+        self.client.force_login(admin_user)
+
+        url = reverse('admin:accounts_organization_delete', args=[self.organization.pk])
+        response = self.client.post(url, {'post': 'yes'})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Organization.objects.filter(pk=self.organization.pk, is_active=False).exists())
+        self.assertTrue(OrganizationTeardown.objects.filter(organization=self.organization).exists())
+        self.assertEqual(Kudos.objects.count(), 4)
@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.test import APIClient
 from accounts.models import Organization
+from utils_app.utils import tiered_cache
 from .test_base import AccountsTestCase
 
 User = get_user_model()
@@ -10,6 +11,7 @@ User = get_user_model()
 class OrganizationViewsTests(AccountsTestCase):
     def setUp(self):
         super().setUp()
+        tiered_cache.clear()
         self.client = APIClient()
         self.user = User.objects.get(email='test@example.com')
         self.client.force_authenticate(user=self.user)
@@ -49,4 +51,66 @@ class OrganizationViewsTests(AccountsTestCase):
       
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('errors', response.data)
-    
\ No newline at end of file
+
+    def test_unchanged_team_list_returns_not_modified(self):
+        """Test the team list short-circuits to 304 after a single probe query"""
+        response = self.client.get(self.org_list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.org_list_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_new_member_changes_team_list_validator(self):
+        """Test adding a user invalidates the team list ETag"""
+        etag = self.client.get(self.org_list_url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.org_user_add_url, {
+                'email': 'newmember@example.com',
+                'first_name': 'New',
+                'password': 'testpass@123',
+                'password_confirm': 'testpass@123',
+            })
+
+        response = self.client.get(self.org_list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unchanged_dashboard_skips_queries(self):
+        """Test dashboard stats revalidate against the organization version only"""
+        response = self.client.get(reverse('dashboard-stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('dashboard-stats'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_bulk_deactivate_and_restore_users(self):
+        """Test owners deactivate and restore members in bulk, never themselves"""
+        member = User.objects.get(email='member@example.com')
+        other = User.objects.get(email='other@example.com')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('deactivate-organization-users'),
+                {'ids': [member.id, other.id, self.user.id]},
+                format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data'], {'ids': [member.id], 'count': 1})
+
+        emails = [row['email'] for row in self.client.get(self.org_list_url).data['data']]
+        self.assertNotIn(member.email, emails)
+        self.assertIn(self.user.email, emails)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('restore-organization-users'), {'ids': [member.id]}, format='json')
+        self.assertEqual(response.data['data']['count'], 1)
+
+        emails = [row['email'] for row in self.client.get(self.org_list_url).data['data']]
+        self.assertIn(member.email, emails)
+
+    def test_bulk_deactivate_validates_ids(self):
+        """Test the bulk endpoint rejects an empty id list"""
+        response = self.client.post(reverse('deactivate-organization-users'), {'ids': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
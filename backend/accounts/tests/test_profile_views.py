@@ -1,7 +1,10 @@
+from unittest import mock
+
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.test import APIClient
+from accounts.serializers.user_serializers import UserProfileRetrieveSerializer
 from .test_base import AccountsTestCase
 
 User = get_user_model()
@@ -23,6 +26,17 @@ class UserProfileViewsTests(AccountsTestCase):
         self.assertEqual(response.data['data']['profile']['email'], 'test@example.com')
         self.assertEqual(response.data['data']['profile']['first_name'], 'Test')
 
+    def test_retrieve_profile_sparse_fields(self):
+        """Test unrequested method fields are never computed"""
+        with mock.patch.object(UserProfileRetrieveSerializer, 'get_role') as get_role, \
+                mock.patch.object(UserProfileRetrieveSerializer, 'get_groups') as get_groups:
+            response = self.client.get(f"{self.profile_url}?fields=id,email")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['profile'], {'id': self.user.id, 'email': 'test@example.com'})
+        get_role.assert_not_called()
+        get_groups.assert_not_called()
+
     def test_update_profile(self):
         """Test updating user profile"""
         payload = {
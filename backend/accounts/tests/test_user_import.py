@@ -0,0 +1,204 @@
+import multiprocessing
+import shutil
+import tempfile
+from unittest import mock
+
+import billiard
+from django.contrib.auth.hashers import check_password
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import Organization, User, UserImportJob
+from accounts.tasks import import_organization_users
+from accounts.utils.user_import import PasswordHasher, insert_users, run_user_import
+from utils_app.utils import tiered_cache
+from .test_base import AccountsTestCase
+
+CSV = (
+    "Email,First_Name,Last_Name,Password\n"
+    "ada@example.com,Ada,Lovelace,engine@123\n"
+    "not-an-email,Bad,Row,x\n"
+    "Grace@Example.com,Grace,Hopper,\n"
+    "ada@example.com,Ada,Again,engine@123\n"
+    "member@example.com,Already,There,pass\n"
+    "alan@example.com,Alan,,turing@123\n"
+)
+
+
+class UserImportTests(AccountsTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.media_override = override_settings(MEDIA_ROOT=cls.media_root, USER_IMPORT_HASH_WORKERS=1)
+        cls.media_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.media_override.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        tiered_cache.clear()
+        self.owner = User.objects.get(email='test@example.com')
+        self.organization = Organization.objects.get(name='Test Organization')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+
+    def create_job(self, content=CSV):
+        job = UserImportJob(organization=self.organization, created_by=self.owner)
+        job.file.save('users.csv', ContentFile(content.encode()), save=False)
+        job.save()
+        return job
+
+    def test_import_creates_users_and_reports_errors(self):
+        """Test valid rows become org members and every invalid row is reported by line"""
+        job = run_user_import(self.create_job().pk, batch_size=2)
+
+        self.assertEqual(job.status, UserImportJob.STATUS_COMPLETED)
+        self.assertEqual((job.processed_rows, job.created_count, job.error_count), (6, 3, 3))
+        self.assertEqual(
+            [(error['row'], list(error['errors'])) for error in job.errors],
+            [(3, ['email']), (5, ['email']), (6, ['email'])]
+        )
+        self.assertEqual(job.errors[1]['errors']['email'], ["Duplicate email in file"])
+        self.assertEqual(job.errors[2]['errors']['email'], ["Email already exists"])
+        # The CSV may hold passwords, so it doesn't outlive the import
+        self.assertFalse(job.file)
+
+        users = User.objects.filter(email__in=['ada@example.com', 'grace@example.com', 'alan@example.com'])
+        self.assertEqual(users.count(), 3)
+        for user in users:
+            self.assertEqual(user.organization, self.organization)
+            self.assertEqual(user.created_by, self.owner)
+            self.assertEqual(list(user.groups.values_list('name', flat=True)), ['org_member'])
+        self.assertTrue(check_password('engine@123', users.get(email='ada@example.com').password))
+        self.assertFalse(users.get(email='grace@example.com').has_usable_password())
+
+    def test_import_resumes_after_failure(self):
+        """Test a failed batch rolls back alone and a rerun continues after the committed rows"""
+        job = self.create_job()
+        calls = []
+
+        def insert_once(users, member_group):
+            if calls:
+                raise RuntimeError("worker lost")
+            calls.append(users)
+            insert_users(users, member_group)
+
+        with mock.patch('accounts.utils.user_import.insert_users', side_effect=insert_once):
+            with self.assertRaises(RuntimeError):
+                run_user_import(job.pk, batch_size=2)
+
+        job.refresh_from_db()
+        self.assertEqual((job.processed_rows, job.created_count, job.error_count), (2, 1, 1))
+        self.assertFalse(User.objects.filter(email='grace@example.com').exists())
+
+        job = run_user_import(job.pk, batch_size=2)
+        self.assertEqual((job.status, job.processed_rows, job.created_count, job.error_count), (UserImportJob.STATUS_COMPLETED, 6, 3, 3))
+        self.assertEqual(User.objects.filter(email__in=['ada@example.com', 'grace@example.com', 'alan@example.com']).count(), 3)
+
+    def test_password_hasher(self):
+        """Test the pool and serial paths hash the same way and blanks get unusable passwords"""
+        for workers in (1, 2):
+            with PasswordHasher(workers=workers) as hasher:
+                hashes = hasher.hash(['first@123', '', 'second@123'])
+            self.assertTrue(check_password('first@123', hashes[0]))
+            self.assertTrue(hashes[1].startswith('!'))
+            self.assertTrue(check_password('second@123', hashes[2]))
+
+    @override_settings(USER_IMPORT_HASH_WORKERS=2)
+    def test_task_hashes_in_pool_inside_celery_worker(self):
+        """Test the import task hashes in a pool from a daemonic process, as a Celery prefork child is"""
+        job = self.create_job()
+        daemon = {'daemon': True}
+        with mock.patch.dict(multiprocessing.current_process()._config, daemon), \
+                mock.patch.dict(billiard.current_process()._config, daemon), \
+                self.assertNoLogs('accounts.utils.user_import', 'WARNING'):
+            import_organization_users.apply(args=[job.pk])
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.created_count), (UserImportJob.STATUS_COMPLETED, 3))
+        self.assertTrue(check_password('turing@123', User.objects.get(email='alan@example.com').password))
+
+    def test_password_hasher_falls_back_to_serial(self):
+        """Test hashing continues in-process when the pool can't run"""
+        with PasswordHasher(workers=2) as hasher:
+            with mock.patch.object(hasher.pool, 'map', side_effect=OSError("Too many open files")):
+                hashes = hasher.hash(['first@123', 'second@123'])
+            self.assertIsNone(hasher.pool)
+        self.assertTrue(check_password('second@123', hashes[1]))
+
+    def test_upload_and_progress(self):
+        """Test an owner uploads a CSV and reads the progress of their import"""
+        upload = SimpleUploadedFile('users.csv', CSV.encode(), content_type='text/csv')
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(reverse('import-organization-users'), {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['data']['status'], UserImportJob.STATUS_PENDING)
+        # The task is queued once the job commits
+        self.assertEqual(len(callbacks), 1)
+
+        job_id = response.data['data']['id']
+        run_user_import(job_id)
+        response = self.client.get(reverse('organization-user-import', args=[job_id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['created_count'], 3)
+        self.assertEqual(len(response.data['data']['errors']), 3)
+
+    @override_settings(USER_IMPORT_MAX_ERRORS=2)
+    def test_error_report_is_capped(self):
+        """Test the report keeps the first errors while error_count counts them all"""
+        job = run_user_import(self.create_job().pk, batch_size=2)
+        self.assertEqual(job.error_count, 3)
+        self.assertEqual([error['row'] for error in job.errors], [3, 5])
+
+    def test_upload_limits(self):
+        """Test files over the size or row limit, or not UTF-8, are rejected before a job is created"""
+        url = reverse('import-organization-users')
+        cases = [
+            (dict(USER_IMPORT_MAX_BYTES=len(CSV) - 1), CSV.encode(), 'larger than'),
+            (dict(USER_IMPORT_MAX_ROWS=5), CSV.encode(), 'more than 5 rows'),
+            ({}, CSV.encode('utf-16'), 'UTF-8'),
+        ]
+        for limits, content, message in cases:
+            with self.subTest(message), override_settings(**limits):
+                upload = SimpleUploadedFile('users.csv', content, content_type='text/csv')
+                response = self.client.post(url, {'file': upload}, format='multipart')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(message, str(response.data['errors']['file']))
+        self.assertFalse(UserImportJob.objects.exists())
+
+        with override_settings(USER_IMPORT_MAX_ROWS=6):
+            upload = SimpleUploadedFile('users.csv', CSV.encode(), content_type='text/csv')
+            response = self.client.post(url, {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_upload_rejects_missing_columns(self):
+        """Test a CSV without the required columns is rejected before a job is created"""
+        upload = SimpleUploadedFile('users.csv', b"email,name\na@example.com,A\n", content_type='text/csv')
+        response = self.client.post(reverse('import-organization-users'), {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('first_name', str(response.data['errors']['file']))
+        self.assertFalse(UserImportJob.objects.exists())
+
+    def test_import_is_owner_only(self):
+        """Test members can't upload and owners can't read other organizations' imports"""
+        job = self.create_job()
+        self.client.force_authenticate(user=User.objects.get(email='member@example.com'))
+        upload = SimpleUploadedFile('users.csv', CSV.encode(), content_type='text/csv')
+        response = self.client.post(reverse('import-organization-users'), {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.owner)
+        job.organization = Organization.objects.get(name='Other Organization')
+        job.save()
+        response = self.client.get(reverse('organization-user-import', args=[job.pk]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -1,7 +1,7 @@
 from django.urls import path
 from accounts.views.auth_views import UserSignupView, UserLoginView, CustomTokenRefreshView, LogoutAPIView
 from accounts.views.user_profile_views import UserProfileView, ChangePasswordView
-from accounts.views.organization_views import OrganizationListView, AddOrganizationUserView
+from accounts.views.organization_views import OrganizationListView, AddOrganizationUserView, BulkOrganizationUserView, UserImportView, UserImportDetailView
 from accounts.views.dashboard_views import DashboardStatsView
 urlpatterns = [
     path('signup/', UserSignupView.as_view(), name='user-signup'),
@@ -12,5 +12,9 @@ urlpatterns = [
     path('profile/change-password/', ChangePasswordView.as_view(), name='change-password'),
     path('organizations/', OrganizationListView.as_view(), name='organization-list'),
     path('organizations/users/add/', AddOrganizationUserView.as_view(), name='add-organization-user'),
+    path('organizations/users/deactivate/', BulkOrganizationUserView.as_view(), name='deactivate-organization-users'),
+    path('organizations/users/restore/', BulkOrganizationUserView.as_view(restore=True), name='restore-organization-users'),
+    path('organizations/users/import/', UserImportView.as_view(), name='import-organization-users'),
+    path('organizations/users/import/<int:pk>/', UserImportDetailView.as_view(), name='organization-user-import'),
     path('dashboard/stats/', DashboardStatsView.as_view(), name='dashboard-stats'),
 ]
@@ -0,0 +1,29 @@
+from utils_app.utils.custom_cache import tiered_cache
+from utils_app.utils.custom_db_router import stick_to_primary
+
+# Namespace of every cache entry derived from an organization's users or kudos
+ORGANIZATION_NAMESPACE = 'org'
+
+
+def get_organization_version(organization_id):
+    """Return the current cache version of an organization"""
+    return tiered_cache.get_version(ORGANIZATION_NAMESPACE, organization_id)
+
+
+def bump_organization_version(organization_id):
+    """
+    Invalidate every cached entry of an organization
+
+    Its reads also stay on the primary for a while, so entries cached under
+    the new version aren't filled from a replica that hasn't caught up yet.
+    """
+    if organization_id is None:
+        return None
+    stick_to_primary(ORGANIZATION_NAMESPACE, organization_id)
+    return tiered_cache.bump_version(ORGANIZATION_NAMESPACE, organization_id)
+
+
+def bump_organization_versions(organization_ids):
+    """Invalidate several organizations, each once"""
+    for organization_id in set(organization_ids):
+        bump_organization_version(organization_id)
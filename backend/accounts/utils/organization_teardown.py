@@ -0,0 +1,128 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils.timezone import now
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+
+from accounts.models import Organization, OrganizationTeardown, User
+from accounts.utils.organization_cache import bump_organization_version
+from kudos_app.models import Kudos, KudosArchive
+from utils_app.models import delete_by_pk
+
+
+def start_organization_teardown(organization, user=None):
+    """
+    Disable an organization and its users right away and queue the deletion
+    of everything it owns; returns the (possibly already running) teardown
+    """
+    # accounts.tasks imports this module
+    from accounts.tasks import teardown_organization
+
+    with transaction.atomic():
+        teardown = OrganizationTeardown.objects.filter(organization=organization).exclude(
+            status=OrganizationTeardown.STATUS_COMPLETED
+        ).first()
+        if teardown is None:
+            teardown = OrganizationTeardown.objects.create(
+                organization=organization,
+                organization_pk=organization.pk,
+                organization_name=organization.name,
+                created_by=user
+            )
+        # Signs everyone out: simplejwt rejects inactive users
+        Organization.objects.filter(pk=organization.pk).soft_delete(user=user)
+        User.objects.filter(organization=organization).soft_delete(user=user)
+        transaction.on_commit(lambda: bump_organization_version(organization.pk))
+        transaction.on_commit(lambda: teardown_organization.delay(teardown.pk))
+    return teardown
+
+
+def _members(organization_pk):
+    return User.objects.filter(organization_id=organization_pk).values('pk')
+
+
+def _batch(queryset, batch_size):
+    return list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+
+
+def delete_kudos_batch(model, organization_pk, batch_size):
+    members = _members(organization_pk)
+    pks = _batch(model.objects.filter(Q(sender__in=members) | Q(receiver__in=members)), batch_size)
+    if not pks:
+        return 0
+    # Without delete signals: the organization's caches are already invalidated
+    return delete_by_pk(model, pks)
+
+
+def delete_tokens_batch(organization_pk, batch_size):
+    pks = _batch(OutstandingToken.objects.filter(user__in=_members(organization_pk)), batch_size)
+    if not pks:
+        return 0
+    # Their BlacklistedTokens cascade
+    OutstandingToken.objects.filter(pk__in=pks).delete()
+    return len(pks)
+
+
+def delete_users_batch(organization_pk, batch_size):
+    pks = _batch(User.objects.filter(organization_id=organization_pk), batch_size)
+    if not pks:
+        return 0
+    # Small by now: their kudos and tokens are gone; group memberships cascade
+    # and references from other rows are set to NULL
+    User.objects.filter(pk__in=pks).delete()
+    return len(pks)
+
+
+def delete_organization(organization_pk, batch_size):
+    Organization.objects.filter(pk=organization_pk).delete()
+    # A single step, so nothing is counted and the stage moves on
+    return 0
+
+
+# stage: (delete one batch, counter field, next stage)
+STAGES = {
+    OrganizationTeardown.STAGE_KUDOS: (
+        lambda pk, size: delete_kudos_batch(Kudos, pk, size), 'kudos_deleted', OrganizationTeardown.STAGE_ARCHIVED_KUDOS
+    ),
+    OrganizationTeardown.STAGE_ARCHIVED_KUDOS: (
+        lambda pk, size: delete_kudos_batch(KudosArchive, pk, size), 'kudos_deleted', OrganizationTeardown.STAGE_TOKENS
+    ),
+    OrganizationTeardown.STAGE_TOKENS: (delete_tokens_batch, 'tokens_deleted', OrganizationTeardown.STAGE_USERS),
+    OrganizationTeardown.STAGE_USERS: (delete_users_batch, 'users_deleted', OrganizationTeardown.STAGE_ORGANIZATION),
+    OrganizationTeardown.STAGE_ORGANIZATION: (delete_organization, None, OrganizationTeardown.STAGE_DONE),
+}
+
+
+def run_organization_teardown(teardown_id, max_batches=None, batch_size=None):
+    """
+    Run up to ``max_batches`` batches of a teardown, each in its own
+    transaction together with its progress, and return the teardown
+
+    A stage moves on once a batch finds nothing left, so running a job again,
+    or twice, only repeats empty batches.
+    """
+    batch_size = batch_size or settings.ORGANIZATION_TEARDOWN_BATCH_SIZE
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            teardown = OrganizationTeardown.objects.select_for_update().get(pk=teardown_id)
+            if teardown.stage == OrganizationTeardown.STAGE_DONE:
+                return teardown
+
+            delete_batch, counter, next_stage = STAGES[teardown.stage]
+            deleted = delete_batch(teardown.organization_pk, batch_size)
+            if deleted:
+                setattr(teardown, counter, getattr(teardown, counter) + deleted)
+            else:
+                teardown.stage = next_stage
+            teardown.status = OrganizationTeardown.STATUS_RUNNING
+            teardown.last_error = ''
+            teardown.attempts = 0
+            if teardown.stage == OrganizationTeardown.STAGE_DONE:
+                teardown.status = OrganizationTeardown.STATUS_COMPLETED
+                teardown.finished_at = now()
+                # Its row is gone; SET_NULL already cleared the column
+                teardown.organization = None
+            teardown.save()
+        batches += 1
+    return teardown
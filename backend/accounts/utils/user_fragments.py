@@ -0,0 +1,89 @@
+from django.contrib.auth.models import Group
+from django.db.models import Prefetch, prefetch_related_objects
+from django.db.models.manager import BaseManager
+from rest_framework import serializers
+
+from accounts.models import User
+from accounts.serializers.user_serializers import UserListSerializer
+from utils_app.utils.custom_cache import tiered_cache
+
+USER_FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+
+def user_fragment_key(user):
+    """Cache key of a user's serialized row; any change to the user moves updated_at"""
+    return f"user-fragment:{user.pk}:{user.updated_at.timestamp()}"
+
+
+def get_user_fragments(users):
+    """
+    Return {user_id: UserListSerializer data} for the given users
+
+    Fragments are read with one get_many; only the misses are serialized,
+    with their organizations and groups loaded in bulk.
+    """
+    users_by_key = {}
+    for user in users:
+        users_by_key.setdefault(user_fragment_key(user), user)
+
+    fragments = tiered_cache.get_many(list(users_by_key))
+    missing = [user for key, user in users_by_key.items() if key not in fragments]
+    if missing:
+        prefetch_related_objects(
+            missing,
+            'organization',
+            Prefetch('groups', queryset=Group.objects.order_by('pk'))
+        )
+        fresh = {
+            user_fragment_key(user): dict(UserListSerializer(user).data)
+            for user in missing
+        }
+        tiered_cache.set_many(fresh, timeout=USER_FRAGMENT_TIMEOUT)
+        fragments.update(fresh)
+
+    return {users_by_key[key].pk: fragment for key, fragment in fragments.items()}
+
+
+def get_user_fragments_by_ids(user_ids):
+    """
+    Return {user_id: UserListSerializer data} for the given ids, loading the users with one IN query
+    """
+    if not user_ids:
+        return {}
+    users = User.objects.filter(pk__in=set(user_ids)).select_related('organization')
+    return get_user_fragments(users)
+
+
+class UserFragmentField(serializers.Field):
+    """
+    Read-only nested user rendered from the fragment cache
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, user):
+        fragments = self.context.get('user_fragments') or {}
+        if user.pk not in fragments:
+            fragments = get_user_fragments([user])
+        return fragments[user.pk]
+
+
+class UserFragmentListSerializer(serializers.ListSerializer):
+    """
+    List serializer that fetches the user fragments of a whole page at once
+    for the child's UserFragmentFields
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, BaseManager) else data)
+        sources = [
+            field.source for field in self.child.fields.values()
+            if isinstance(field, UserFragmentField)
+        ]
+        users = [getattr(item, source) for item in items for source in sources]
+        self.context['user_fragments'] = get_user_fragments(
+            user for user in users if user is not None
+        )
+        return super().to_representation(items)
@@ -0,0 +1,223 @@
+import csv
+import io
+import itertools
+import logging
+import os
+
+from billiard.exceptions import WorkerLostError
+from billiard.pool import Pool
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.utils.timezone import now
+from rest_framework import serializers
+
+from accounts.models import User, UserImportJob
+from accounts.utils.organization_cache import bump_organization_version
+
+logger = logging.getLogger(__name__)
+
+# Optional: last_name, and password (users without one get an unusable password)
+REQUIRED_COLUMNS = {'email', 'first_name'}
+
+
+class UserImportRowSerializer(serializers.Serializer):
+    """
+    One CSV row; emails are checked against the database per batch, not per row
+    """
+    email = serializers.EmailField()
+    first_name = serializers.CharField(max_length=150)
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    password = serializers.CharField(required=False, allow_blank=True)
+
+    def validate_email(self, value):
+        return value.lower()
+
+
+def validate_header(header):
+    """Return an error message when the CSV header lacks required columns, else None"""
+    columns = {column.strip().lower() for column in header or []}
+    missing = REQUIRED_COLUMNS - columns
+    if missing:
+        return f"Missing columns: {', '.join(sorted(missing))}"
+    return None
+
+
+def read_rows(binary_file):
+    """Yield (line number, row) from a CSV upload, streaming it"""
+    text = io.TextIOWrapper(binary_file, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+    for row in reader:
+        yield reader.line_num, row
+
+
+def count_rows(binary_file, limit):
+    """Count the data rows of a CSV upload, stopping once past ``limit``"""
+    text = io.TextIOWrapper(binary_file, encoding='utf-8-sig', newline='')
+    try:
+        rows = csv.reader(text)
+        next(rows, None)
+        return sum(1 for _ in itertools.islice(rows, limit + 1))
+    finally:
+        # Leave the upload open for the caller
+        text.detach()
+
+
+def _setup_hasher_process():
+    # Forked workers inherit Django's setup; spawned ones (macOS, Windows) start without it
+    from django.apps import apps
+    if not apps.ready:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+        import django
+        django.setup()
+
+
+class PasswordHasher:
+    """
+    Hash passwords with make_password in a process pool, since each hash is
+    deliberately slow CPU work. The pool is billiard's, which unlike
+    concurrent.futures can start inside a daemonic Celery prefork worker;
+    hashing falls back to serial if it still can't run.
+
+        with PasswordHasher() as hasher:
+            hashes = hasher.hash(passwords)
+    """
+
+    def __init__(self, workers=None):
+        self.workers = settings.USER_IMPORT_HASH_WORKERS if workers is None else workers
+        self.pool = None
+
+    def __enter__(self):
+        if self.workers > 1:
+            self.pool = Pool(processes=self.workers, initializer=_setup_hasher_process)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.pool is not None:
+            # map() already returned every result, and join() idles ~30s on billiard's handler threads
+            self.pool.terminate()
+
+    def hash(self, passwords):
+        """Return the hashes of ``passwords``; empty ones get unusable password hashes"""
+        to_hash = [password for password in passwords if password]
+        hashed = None
+        if self.pool is not None and len(to_hash) > 1:
+            try:
+                chunksize = max(1, len(to_hash) // (self.workers * 4))
+                hashed = list(self.pool.map(make_password, to_hash, chunksize=chunksize))
+            except (OSError, WorkerLostError) as e:
+                logger.warning("Hashing passwords serially, the process pool is unavailable: %s", e)
+                self.pool.terminate()
+                self.pool = None
+        if hashed is None:
+            hashed = [make_password(password) for password in to_hash]
+
+        hashed = iter(hashed)
+        return [next(hashed) if password else make_password(None) for password in passwords]
+
+
+def build_users(job, rows, seen_emails, hasher):
+    """
+    Validate a batch of (line number, row) and return (unsaved users, error entries)
+    """
+    errors, valid = [], []
+    for line, row in rows:
+        serializer = UserImportRowSerializer(data={key: value for key, value in row.items() if key})
+        if not serializer.is_valid():
+            errors.append({
+                'row': line,
+                'email': row.get('email'),
+                'errors': {field: [str(message) for message in messages] for field, messages in serializer.errors.items()}
+            })
+            continue
+        email = serializer.validated_data['email']
+        if email in seen_emails:
+            errors.append({'row': line, 'email': email, 'errors': {'email': ["Duplicate email in file"]}})
+            continue
+        seen_emails.add(email)
+        valid.append((line, serializer.validated_data))
+
+    existing = set(User.objects.filter(
+        email__in=[data['email'] for _, data in valid]
+    ).values_list('email', flat=True))
+    for line, data in valid:
+        if data['email'] in existing:
+            errors.append({'row': line, 'email': data['email'], 'errors': {'email': ["Email already exists"]}})
+    valid = [(line, data) for line, data in valid if data['email'] not in existing]
+    if not valid:
+        return [], errors
+
+    hashes = hasher.hash([data.get('password') for _, data in valid])
+    users = [
+        User(
+            email=data['email'],
+            username=data['email'],
+            first_name=data['first_name'],
+            last_name=data.get('last_name', ''),
+            password=password_hash,
+            organization_id=job.organization_id,
+            created_by_id=job.created_by_id,
+        )
+        for (_, data), password_hash in zip(valid, hashes)
+    ]
+    return users, errors
+
+
+def insert_users(users, member_group):
+    """Insert users and their org_member memberships with two bulk INSERTs"""
+    User.objects.bulk_create(users)
+    if any(user.pk is None for user in users):
+        # Backends that can't return pks from a bulk insert
+        pks = dict(User.objects.filter(email__in=[user.email for user in users]).values_list('email', 'pk'))
+        for user in users:
+            user.pk = pks[user.email]
+    User.groups.through.objects.bulk_create([
+        User.groups.through(user_id=user.pk, group_id=member_group.pk) for user in users
+    ])
+
+
+def run_user_import(job_id, batch_size=None):
+    """
+    Import a UserImportJob's CSV in batches, saving progress and the per-row
+    error report after each one
+    """
+    batch_size = batch_size or settings.USER_IMPORT_BATCH_SIZE
+    max_errors = settings.USER_IMPORT_MAX_ERRORS
+    job = UserImportJob.objects.get(pk=job_id)
+    if job.status == UserImportJob.STATUS_COMPLETED:
+        return job
+    job.status = UserImportJob.STATUS_RUNNING
+    job.save(update_fields=['status', 'updated_at'])
+
+    member_group = Group.objects.get(name='org_member')
+    seen_emails = set()
+    with job.file.open('rb') as binary_file, PasswordHasher() as hasher:
+        rows = read_rows(binary_file)
+        # A rerun skips what an interrupted run already imported
+        rows = itertools.islice(rows, job.processed_rows, None)
+        while batch := list(itertools.islice(rows, batch_size)):
+            # Hash before the transaction so it isn't held open meanwhile
+            users, errors = build_users(job, batch, seen_emails, hasher)
+            # The users of a batch and the progress they make commit together
+            with transaction.atomic():
+                insert_users(users, member_group)
+                job.created_count += len(users)
+                job.processed_rows += len(batch)
+                job.error_count += len(errors)
+                update_fields = ['processed_rows', 'created_count', 'error_count', 'updated_at']
+                # The report is capped, so a bad file doesn't rewrite an ever-growing row
+                kept = errors[:max_errors - len(job.errors)]
+                if kept:
+                    job.errors = job.errors + kept
+                    update_fields.append('errors')
+                job.save(update_fields=update_fields)
+
+    job.status = UserImportJob.STATUS_COMPLETED
+    job.finished_at = now()
+    job.save(update_fields=['status', 'finished_at', 'updated_at'])
+    job.file.delete(save=True)
+    # bulk_create sends no post_save, so invalidate the organization once
+    bump_organization_version(job.organization_id)
+    return job
@@ -3,33 +3,52 @@ from rest_framework.permissions import IsAuthenticated
 from django.db.models import Count
 
 from accounts.serializers.dashboard_serializers import DashboardStatsSerializer
-from kudos_app.models import Kudos
+from kudos_app.models import Kudos, KudosArchive
 from accounts.models import User
+from accounts.utils.organization_cache import get_organization_version
 from utils_app.utils import (
     SUCCESS_MESSAGES,
     ERROR_MESSAGES,
-    api_response
+    api_response,
+    make_etag,
+    conditional_response,
+    ReadOnlyViewMixin
 )
 
-class DashboardStatsView(APIView):
+class DashboardStatsView(ReadOnlyViewMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         try:
+            # Every count below changes only with kudos or users of the organization
+            etag = make_etag(
+                'dashboard', request.user.id,
+                get_organization_version(request.user.organization_id),
+                request.accepted_renderer.format
+            )
+            not_modified = conditional_response(request, etag=etag)
+            if not_modified:
+                return not_modified
+
             # Get user's organization
             organization = request.user.organization
 
             # Calculate stats
             stats = {
                 'total_team_members': User.objects.filter(organization=organization).count(),
-                'total_kudos_received': Kudos.objects.filter(receiver=request.user).count(),
-                'total_kudos_sent': Kudos.objects.filter(sender=request.user).count(),
+                'total_kudos_received': sum(
+                    model.objects.filter(receiver=request.user).count() for model in (Kudos, KudosArchive)
+                ),
+                'total_kudos_sent': sum(
+                    model.objects.filter(sender=request.user).count() for model in (Kudos, KudosArchive)
+                ),
             }
 
             serializer = DashboardStatsSerializer(stats)
             return api_response(
                 SUCCESS_MESSAGES["RETRIEVE"],
-                data=serializer.data
+                data=serializer.data,
+                etag=etag
             )
         except Exception as e:
             return api_response(
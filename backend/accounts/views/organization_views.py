@@ -1,20 +1,30 @@
+from django.db import transaction
 from rest_framework.views import APIView
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
-from accounts.models import Organization, User
+from accounts.models import Organization, User, UserImportJob
 from accounts.serializers.organization_serializers import (
     OrganizationListSerializer,
-    AddOrganizationUserSerializer
+    AddOrganizationUserSerializer,
+    UserImportUploadSerializer,
+    UserImportJobSerializer
 )
+from accounts.tasks import import_organization_users
 from accounts.serializers.user_serializers import UserListSerializer
+from accounts.utils.organization_cache import get_organization_version
+from accounts.utils.user_fragments import get_user_fragments
+from utils_app.serializers import requested_fields
+from utils_app.views.bulk_views import BulkSoftDeleteView
 from utils_app.utils import (
     SUCCESS_MESSAGES,
     ERROR_MESSAGES,
     api_response,
     CustomPagination,
-    IsOrganizationOwner
+    IsOrganizationOwner,
+    ReadOnlyViewMixin
 )
 
-class OrganizationListView(APIView):
+class OrganizationListView(ReadOnlyViewMixin, APIView):
     """
     API view for listing organization and its users
     """
@@ -31,10 +41,21 @@ class OrganizationListView(APIView):
             users = organization.get_all_users()
             
             paginator = self.pagination_class()
+            not_modified = paginator.get_conditional_response(
+                request, users, get_organization_version(organization.id)
+            )
+            if not_modified:
+                return not_modified
+
             paginated_users = paginator.paginate_queryset(users, request)
-            user_serializer = UserListSerializer(paginated_users, many=True)
+            fragments = get_user_fragments(paginated_users)
+            rows = [fragments[user.pk] for user in paginated_users]
+
+            fields = requested_fields(request)
+            if fields is not None:
+                rows = [{name: row[name] for name in row if name in fields} for row in rows]
             
-            return paginator.get_paginated_response(user_serializer.data)
+            return paginator.get_paginated_response(rows)
             
         except Exception as e:
             return api_response(
@@ -74,4 +95,72 @@ class AddOrganizationUserView(APIView):
         return api_response(
             ERROR_MESSAGES["VALIDATION"],
             errors=serializer.errors
-        ) 
\ No newline at end of file
+        ) 
+
+class BulkOrganizationUserView(BulkSoftDeleteView):
+    """
+    API view for organization owners deactivating (or restoring) users of their organization in bulk
+    """
+
+    def get_queryset(self, request):
+        # Owners can't lock themselves out
+        return User.objects.filter(organization=request.user.organization).exclude(pk=request.user.pk)
+
+
+class UserImportView(APIView):
+    """
+    API view for organization owners uploading a CSV of users
+    (email, first_name and optionally last_name, password) to import in the background
+    """
+    permission_classes = [IsAuthenticated, IsOrganizationOwner]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        serializer = UserImportUploadSerializer(data=request.data)
+
+        if serializer.is_valid():
+            try:
+                job = UserImportJob.objects.create(
+                    organization=request.user.organization,
+                    file=serializer.validated_data['file'],
+                    created_by=request.user
+                )
+                transaction.on_commit(lambda: import_organization_users.delay(job.pk))
+
+                return api_response(
+                    SUCCESS_MESSAGES["CREATE"],
+                    data=UserImportJobSerializer(job).data
+                )
+            except Exception as e:
+                return api_response(
+                    ERROR_MESSAGES["SERVER_ERROR"],
+                    errors={"detail": str(e)}
+                )
+
+        return api_response(
+            ERROR_MESSAGES["VALIDATION"],
+            errors=serializer.errors
+        )
+
+
+class UserImportDetailView(APIView):
+    """
+    API view for the progress and per-row error report of a user import
+    """
+    permission_classes = [IsAuthenticated, IsOrganizationOwner]
+
+    def get(self, request, pk):
+        try:
+            job = UserImportJob.objects.filter(pk=pk, organization=request.user.organization).first()
+            if job is None:
+                return api_response(ERROR_MESSAGES["NOT_FOUND"])
+
+            return api_response(
+                SUCCESS_MESSAGES["RETRIEVE"],
+                data=UserImportJobSerializer(job).data
+            )
+        except Exception as e:
+            return api_response(
+                ERROR_MESSAGES["SERVER_ERROR"],
+                errors={"detail": str(e)}
+            )
@@ -28,8 +28,7 @@ class UserProfileView(APIView):
     def get(self, request):
         """Get the current user's profile information"""
         try:
-            serializer = UserProfileRetrieveSerializer(request.user)
-            print(f"serializer {serializer.data}")
+            serializer = UserProfileRetrieveSerializer(request.user, context={'request': request})
             return api_response(
                 SUCCESS_MESSAGES["RETRIEVE"],
                 data={"profile": serializer.data}
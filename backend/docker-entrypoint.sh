@@ -6,10 +6,7 @@ until python -c "import redis; redis.Redis(host='redis', port=6379).ping()" 2>/d
   sleep 1
 done
 
-# Apply database migrations
-python manage.py migrate
-
-
+# Migrations run once in the migrate service (docker-compose.yml), not on every start
 
 # Start the application based on the command
 exec "$@" 
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+Gunicorn configuration for serving the backend in production.
+
+    gunicorn core.asgi:application -c gunicorn.conf.py
+
+The application is imported once in the master (preload_app) and its objects
+are frozen out of the garbage collector before forking, so the workers share
+those memory pages copy-on-write instead of each touching them on collection.
+
+Reloading:
+    kill -HUP <master pid>   re-reads this file and replaces the workers one
+                             by one; in-flight requests get graceful_timeout
+                             to finish. With preload_app the code itself is
+                             not re-imported, so ship code by restarting the
+                             container (SIGTERM drains the same way).
+
+Metrics: every worker writes its Prometheus samples to PROMETHEUS_MULTIPROC_DIR
+and /api/v1/utils/metrics sums them, whichever worker serves the scrape. It is
+set here, before the app is imported, and emptied when the master starts.
+"""
+import gc
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# (2 x cores) + 1 unless set explicitly
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'uvicorn_worker.UvicornWorker'
+preload_app = True
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Recycle workers periodically so slow leaks can't accumulate
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = 200
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'kudos-prometheus'))
+
+# Don't let collections in the master punch holes into pages the workers share
+gc.disable()
+
+
+def on_starting(server):
+    # Samples of a previous run would be summed into this one's
+    directory = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def pre_fork(server, worker):
+    # Move everything allocated so far to the permanent generation
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Connections must not be shared across processes
+    from django.db import connections
+    connections.close_all()
+
+    gc.enable()
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class KudosAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'kudos_app'
+
+    def ready(self):
+        from kudos_app import signals  # Connect signal receivers
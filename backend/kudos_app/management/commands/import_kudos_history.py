@@ -0,0 +1,139 @@
+import csv
+import io
+import itertools
+import json
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import User
+from accounts.utils.organization_cache import bump_organization_versions
+from kudos_app.models import Kudos
+from kudos_app.tasks import archive_old_kudos
+from utils_app.models import explicit_timestamps
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib decoder
+    orjson = None
+
+json_loads = orjson.loads if orjson else json.loads
+
+COLUMNS = ('sender', 'receiver', 'message', 'created_at')
+
+
+def read_ndjson(binary_file):
+    """Yield (line number, row) from one JSON object per line, skipping blank lines"""
+    for line, raw in enumerate(binary_file, start=1):
+        if raw.strip():
+            try:
+                yield line, json_loads(raw)
+            except ValueError:
+                yield line, None
+
+
+def read_csv(binary_file):
+    """Yield (line number, row) from a CSV with a header row"""
+    reader = csv.DictReader(io.TextIOWrapper(binary_file, encoding='utf-8-sig', newline=''))
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+    missing = set(COLUMNS) - set(reader.fieldnames)
+    if missing:
+        raise CommandError(f"Missing columns: {', '.join(sorted(missing))}")
+    for row in reader:
+        yield reader.line_num, row
+
+
+def parse_timestamp(value):
+    created_at = datetime.fromisoformat(value)
+    if timezone.is_naive(created_at):
+        created_at = timezone.make_aware(created_at)
+    return created_at
+
+
+class Command(BaseCommand):
+    help = (
+        'Imports historical kudos from an NDJSON or CSV file with sender and receiver emails, '
+        'message and created_at, without spending kudos quota'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='NDJSON (.ndjson, .jsonl) or CSV file')
+        parser.add_argument('--format', choices=['ndjson', 'csv'], help='Defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Kudos inserted per transaction')
+        parser.add_argument('--skip', type=int, default=0, help='Rows to skip, to resume an interrupted import')
+        parser.add_argument('--show-errors', type=int, default=20, help='Rejected rows to print')
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or ('csv' if options['path'].lower().endswith('.csv') else 'ndjson')
+        read_rows = read_csv if file_format == 'csv' else read_ndjson
+
+        # Built once: email -> (user id, organization id)
+        self.users = {
+            email.lower(): (pk, organization_id)
+            for email, pk, organization_id in User.objects.values_list('email', 'pk', 'organization_id')
+        }
+        self.organization_ids = set()
+        imported, rejected, processed = 0, 0, options['skip']
+
+        with open(options['path'], 'rb') as binary_file, explicit_timestamps(Kudos):
+            rows = itertools.islice(read_rows(binary_file), options['skip'], None)
+            while batch := list(itertools.islice(rows, options['batch_size'])):
+                kudos = []
+                for line, row in batch:
+                    try:
+                        kudos.append(self.build_kudos(row))
+                    except ValueError as e:
+                        rejected += 1
+                        if rejected <= options['show_errors']:
+                            self.stderr.write(f"Line {line}: {e}")
+                try:
+                    # bulk_create skips Kudos.save(): no quota, full_clean or signals
+                    with transaction.atomic():
+                        Kudos.objects.bulk_create(kudos)
+                except Exception:
+                    self.stderr.write(f"Import stopped; rerun with --skip {processed} to resume")
+                    raise
+                imported += len(kudos)
+                processed += len(batch)
+                if options['verbosity'] > 1:
+                    self.stdout.write(f"{processed} rows processed")
+
+        # Rebuilt once instead of per kudos: old rows move to the archive, oldest
+        # first, and every cached list and leaderboard of the organizations expires
+        self.stdout.write(archive_old_kudos())
+        bump_organization_versions(self.organization_ids)
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {imported} kudos, rejected {rejected} rows"))
+
+    def build_kudos(self, row):
+        """Return an unsaved Kudos for a row, or raise ValueError saying why it is rejected"""
+        if not isinstance(row, dict):
+            raise ValueError("not a JSON object")
+        sender = self.users.get(str(row.get('sender') or '').strip().lower())
+        receiver = self.users.get(str(row.get('receiver') or '').strip().lower())
+        if sender is None:
+            raise ValueError(f"unknown sender {row.get('sender')!r}")
+        if receiver is None:
+            raise ValueError(f"unknown receiver {row.get('receiver')!r}")
+        if sender == receiver:
+            raise ValueError("sender and receiver are the same user")
+        if sender[1] != receiver[1]:
+            raise ValueError("sender and receiver are in different organizations")
+        if not row.get('message'):
+            raise ValueError("missing message")
+        try:
+            created_at = parse_timestamp(row.get('created_at') or '')
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid created_at {row.get('created_at')!r}")
+
+        self.organization_ids.add(receiver[1])
+        return Kudos(
+            sender_id=sender[0],
+            receiver_id=receiver[0],
+            message=row['message'],
+            created_by_id=sender[0],
+            created_at=created_at,
+            updated_at=created_at,
+        )
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+# PostgreSQL-only indexes, built CONCURRENTLY so big tables stay writable.
+# Leaderboard counts of active kudos per receiver use kudos_active_received_idx
+# (0006), whose leading column is the receiver.
+POSTGRESQL_INDEXES = [
+    (
+        'kudos_created_at_brin',
+        # Kudos are append-only, so a tiny BRIN index serves created_at range scans
+        'CREATE INDEX CONCURRENTLY IF NOT EXISTS kudos_created_at_brin '
+        'ON kudos_app_kudos USING brin (created_at)',
+    ),
+]
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, sql in POSTGRESQL_INDEXES:
+        schema_editor.execute(sql)
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, sql in POSTGRESQL_INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('kudos_app', '0004_kudos_kudos_app_k_sender__fd06b1_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
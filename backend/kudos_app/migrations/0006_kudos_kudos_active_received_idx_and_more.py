@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-19 05:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kudos_app', '0005_postgresql_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='kudos',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['receiver', '-created_at', '-id'], name='kudos_active_received_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kudos',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['sender', '-created_at', '-id'], name='kudos_active_sent_idx'),
+        ),
+    ]
@@ -1,3 +1,4 @@
 from .kudos import Kudos
+from .kudos_archive import KudosArchive
 
-__all__ = ['Kudos']
\ No newline at end of file
+__all__ = ['Kudos', 'KudosArchive']
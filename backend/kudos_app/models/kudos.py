@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from accounts.models.user import User
 from utils_app.models.base_model import BaseModel
+from utils_app.utils.custom_tracing import start_span, traced
 
 class Kudos(BaseModel):
     sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name="sent_kudos")
@@ -29,26 +30,39 @@ class Kudos(BaseModel):
                 "sender": "Insufficient kudos available"
             })
 
+    @traced('Kudos.save')
     def save(self, *args, **kwargs):
         if not self.pk:  # Only on creation
             self.full_clean()
-            # Get a fresh instance of the sender to avoid race conditions
-            sender = User.objects.select_for_update().get(pk=self.sender.pk)
-            if sender.kudos_available <= 0:
-                raise ValidationError({
-                    "sender": "Insufficient kudos available"
-                })
-            # Decrease available kudos
-            sender.kudos_available -= 1
-            sender.save(update_fields=['kudos_available'])
+            with start_span('kudos quota update'):
+                # Get a fresh instance of the sender to avoid race conditions
+                sender = User.objects.select_for_update().get(pk=self.sender.pk)
+                if sender.kudos_available <= 0:
+                    raise ValidationError({
+                        "sender": "Insufficient kudos available"
+                    })
+                # Decrease available kudos
+                sender.kudos_available -= 1
+                sender.save(update_fields=['kudos_available'])
         super().save(*args, **kwargs)
 
     def total_kudos_received(self):
-        return self.receiver.received_kudos.count()
+        return self.receiver.received_kudos.count() + self.receiver.archived_received_kudos.count()
 
     class Meta:
         indexes = [
             models.Index(fields=['sender', 'created_at']),
             models.Index(fields=['receiver', 'created_at']),
+            # The kudos lists: active rows of one user, newest first, id breaking ties
+            models.Index(
+                fields=['receiver', '-created_at', '-id'],
+                condition=models.Q(is_active=True),
+                name='kudos_active_received_idx',
+            ),
+            models.Index(
+                fields=['sender', '-created_at', '-id'],
+                condition=models.Q(is_active=True),
+                name='kudos_active_sent_idx',
+            ),
         ]
 
@@ -0,0 +1,48 @@
+from django.db import models
+from accounts.models.user import User
+from utils_app.models.base_model import ActiveManager, AllObjectsManager
+
+class KudosArchive(models.Model):
+    """
+    Kudos older than KUDOS_ARCHIVE_AFTER_DAYS, moved out of the hot table by
+    kudos_app.tasks.archive_old_kudos with their ids and timestamps unchanged
+    """
+    id = models.BigIntegerField(primary_key=True)
+    sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name="archived_sent_kudos")
+    receiver = models.ForeignKey(User, on_delete=models.CASCADE, related_name="archived_received_kudos")
+    message = models.TextField()
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    updated_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    is_active = models.BooleanField(default=True)
+    deleted_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    is_deleted = models.BooleanField(default=False)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    objects = AllObjectsManager()
+    active_objects = ActiveManager()
+
+    # Columns copied over from Kudos
+    KUDOS_FIELDS = [
+        'id', 'sender_id', 'receiver_id', 'message', 'created_by_id', 'updated_by_id',
+        'created_at', 'updated_at', 'is_active', 'deleted_by_id', 'deleted_at', 'is_deleted'
+    ]
+
+    def __str__(self):
+        return f"{self.sender} → {self.receiver}: {self.message[:20]}"
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['receiver', '-created_at', '-id'],
+                condition=models.Q(is_active=True),
+                name='kudos_archive_received_idx',
+            ),
+            models.Index(
+                fields=['sender', '-created_at', '-id'],
+                condition=models.Q(is_active=True),
+                name='kudos_archive_sent_idx',
+            ),
+        ]
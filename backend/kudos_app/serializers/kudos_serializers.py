@@ -2,7 +2,12 @@ from rest_framework import serializers
 
 from accounts.models import User
 from kudos_app.models import Kudos
-from accounts.serializers.user_serializers import UserListSerializer
+from utils_app.serializers import SparseFieldsetMixin
+from accounts.utils.user_fragments import (
+    UserFragmentField,
+    UserFragmentListSerializer,
+    get_user_fragments_by_ids
+)
 
 class KudosCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -28,16 +33,48 @@ class KudosCreateSerializer(serializers.ModelSerializer):
             
         return value
 
-class KudosDetailSerializer(serializers.ModelSerializer):
-    sender = UserListSerializer(read_only=True)
-    receiver = UserListSerializer(read_only=True)
+class KudosDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    # Same output as UserListSerializer, served from the user fragment cache
+    sender = UserFragmentField()
+    receiver = UserFragmentField()
+    sender_id = serializers.IntegerField(read_only=True)
+    receiver_id = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Kudos
-        fields = ['id', 'sender', 'receiver', 'message', 'created_at']
+        fields = ['id', 'sender', 'receiver', 'message', 'created_at', 'sender_id', 'receiver_id']
+        optional_fields = ['sender_id', 'receiver_id']
+        list_serializer_class = UserFragmentListSerializer
 
 
-class KudosLeaderboardSerializer(serializers.ModelSerializer):
+class KudosSideloadListSerializer(serializers.ListSerializer):
+    """
+    List serializer that side-loads the users referenced by its rows
+    """
+
+    def get_users(self):
+        """Map of every distinct sender/receiver, built from one IN query"""
+        user_ids = {
+            row[field] for row in self.data
+            for field in ('sender_id', 'receiver_id') if field in row
+        }
+        return get_user_fragments_by_ids(user_ids)
+
+
+class KudosSideloadSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Kudos row referencing users by id, for side-loaded (normalized) responses
+    """
+    sender_id = serializers.IntegerField(read_only=True)
+    receiver_id = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Kudos
+        fields = ['id', 'sender_id', 'receiver_id', 'message', 'created_at']
+        list_serializer_class = KudosSideloadListSerializer
+
+
+class KudosLeaderboardSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     kudos_received_count = serializers.IntegerField()
     
     class Meta:
@@ -0,0 +1,29 @@
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from accounts.models import User
+from accounts.utils.organization_cache import bump_organization_version, bump_organization_versions
+from kudos_app.models import Kudos
+from utils_app.signals import post_bulk_soft_delete, post_bulk_restore
+
+
+@receiver(post_save, sender=Kudos)
+@receiver(post_delete, sender=Kudos)
+def invalidate_organization_on_kudos_change(sender, instance, **kwargs):
+    """Bump the receiver's organization version once the kudos is committed"""
+    organization_id = instance.receiver.organization_id
+    transaction.on_commit(lambda: bump_organization_version(organization_id))
+
+
+@receiver(post_bulk_soft_delete, sender=Kudos)
+@receiver(post_bulk_restore, sender=Kudos)
+def invalidate_organizations_on_bulk_kudos_change(sender, pks, using, **kwargs):
+    """Bump, once each, the organizations whose members sent or received the kudos"""
+    organization_ids = list(
+        User.objects.using(using).filter(
+            Q(sent_kudos__pk__in=pks) | Q(received_kudos__pk__in=pks)
+        ).order_by().values_list('organization_id', flat=True).distinct()
+    )
+    transaction.on_commit(lambda: bump_organization_versions(organization_ids), using=using)
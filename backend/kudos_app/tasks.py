@@ -1,8 +1,11 @@
 from celery import shared_task
+from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
 from django.db import transaction
 from accounts.models import User
+from kudos_app.models import Kudos, KudosArchive
+from utils_app.models import delete_by_pk
 
 @shared_task
 def reset_weekly_kudos():
@@ -22,4 +25,43 @@ def reset_weekly_kudos():
             last_kudos_reset=now
         )
     
-    return f"Reset kudos for {updated} users" 
\ No newline at end of file
+    return f"Reset kudos for {updated} users" 
+
+
+def archive_kudos_batch(horizon, batch_size):
+    """
+    Copy the oldest kudos created before ``horizon`` to the archive and delete
+    them from the hot table in one transaction; return how many moved
+    """
+    with transaction.atomic():
+        rows = list(
+            Kudos.objects.select_for_update().filter(created_at__lt=horizon)
+            .order_by('created_at', 'id').values(*KudosArchive.KUDOS_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0
+        # Overlapping runs can't duplicate rows
+        KudosArchive.objects.bulk_create([KudosArchive(**row) for row in rows], ignore_conflicts=True)
+        # Without delete signals: the kudos lists, leaderboard and dashboard
+        # read the archive too, so no cached response changes
+        return delete_by_pk(Kudos, [row['id'] for row in rows])
+
+
+@shared_task
+def archive_old_kudos(batch_size=None, max_batches=None):
+    """
+    Move kudos older than KUDOS_ARCHIVE_AFTER_DAYS to the archive in batches,
+    oldest first, so the archive always holds the tail of every kudos list
+    """
+    horizon = timezone.now() - timedelta(days=settings.KUDOS_ARCHIVE_AFTER_DAYS)
+    batch_size = batch_size or settings.KUDOS_ARCHIVE_BATCH_SIZE
+
+    archived, batches = 0, 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_kudos_batch(horizon, batch_size)
+        if not moved:
+            break
+        archived += moved
+        batches += 1
+
+    return f"Archived {archived} kudos in {batches} batches"
@@ -6,11 +6,13 @@ from kudos_app.models import Kudos
 from accounts.models import User
 from django.utils import timezone
 from datetime import timedelta
+from utils_app.utils import tiered_cache
 
 class KudosAPITests(APITestCase):
     fixtures = ['fixtures/test_data.json']
 
     def setUp(self):
+        tiered_cache.clear()
         self.client = APIClient()
         # Get users from fixtures
         self.sender = User.objects.get(email="test@example.com")  # org_owner
@@ -205,4 +207,84 @@ class KudosAPITests(APITestCase):
         # Test present date
         response = self.client.get(f"{self.history_url}?start_date={today_str}&end_date={today_str}")
         self.assertEqual(len(response.data['data']), 4)
-   
\ No newline at end of file
+   
+    def test_sideloaded_users(self):
+        """Test side-loaded mode references users by id and lists each user once"""
+        response = self.client.get(f"{self.received_url}?sideload=users")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        rows = response.data['data']
+        users = response.data['users']
+        self.assertTrue(rows)
+        for row in rows:
+            self.assertNotIn('sender', row)
+            self.assertEqual(row['receiver_id'], self.sender.id)
+            self.assertIn(row['sender_id'], users)
+            self.assertIn(row['receiver_id'], users)
+        self.assertEqual(set(users), {row['sender_id'] for row in rows} | {self.sender.id})
+        self.assertEqual(users[self.sender.id]['email'], self.sender.email)
+
+        # Side-loaded rows carry the same kudos as the embedded ones
+        embedded = self.client.get(self.received_url).data['data']
+        self.assertEqual([row['id'] for row in rows], [row['id'] for row in embedded])
+        self.assertEqual(
+            [users[row['sender_id']] for row in rows],
+            [row['sender'] for row in embedded]
+        )
+
+    def test_sparse_fieldsets(self):
+        """Test ?fields= limits rows to the requested fields, including opt-in id fields"""
+        response = self.client.get(f"{self.history_url}?fields=id,sender_id,created_at")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for row in response.data['data']:
+            self.assertEqual(list(row), ['id', 'created_at', 'sender_id'])
+            self.assertEqual(row['sender_id'], self.sender.id)
+
+        # Optional fields stay hidden by default
+        response = self.client.get(self.history_url)
+        self.assertNotIn('sender_id', response.data['data'][0])
+
+        response = self.client.get(f"{self.leaderboard_url}?fields=id,kudos_received_count")
+        self.assertEqual(list(response.data['data'][0]), ['id', 'kudos_received_count'])
+
+    def test_compact_envelope(self):
+        """Test the compact envelope drops message/status_code/action and empty errors"""
+        response = self.client.get(f"{self.history_url}?envelope=compact")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        body = response.json()
+        for key in ('message', 'status_code', 'action', 'errors'):
+            self.assertNotIn(key, body)
+        self.assertEqual(len(body['data']), 2)
+        self.assertIn('count', body)
+
+    def test_bulk_delete_and_restore_kudos(self):
+        """Test owners remove and restore their organization's kudos in bulk"""
+        colleague = User.objects.create_user(
+            email='colleague@example.com', first_name='Colleague',
+            password='testpass@123', organization=self.other_org_user.organization
+        )
+        other_org_kudos = Kudos.objects.create(
+            sender=self.other_org_user, receiver=colleague, message='Elsewhere', created_by=self.other_org_user
+        )
+
+        response = self.client.post(
+            reverse('kudos-bulk-delete'), {'ids': [1, 2, other_org_kudos.id]}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data'], {'ids': [1, 2], 'count': 2})
+        self.assertTrue(Kudos.active_objects.filter(pk=other_org_kudos.id).exists())
+
+        response = self.client.get(self.received_url)
+        self.assertNotIn(2, [row['id'] for row in response.data['data']])
+
+        response = self.client.post(reverse('kudos-bulk-restore'), {'ids': [1, 2]}, format='json')
+        self.assertEqual(response.data['data']['count'], 2)
+        self.assertEqual(Kudos.active_objects.filter(pk__in=[1, 2]).count(), 2)
+
+    def test_bulk_delete_requires_owner(self):
+        """Test members can't remove kudos in bulk"""
+        self.client.force_authenticate(user=self.receiver)
+        response = self.client.post(reverse('kudos-bulk-delete'), {'ids': [1]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(Kudos.active_objects.filter(pk=1).exists())
@@ -0,0 +1,98 @@
+import json
+from datetime import timedelta
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from accounts.models import User
+from kudos_app.models import Kudos, KudosArchive
+from kudos_app.tasks import archive_old_kudos
+from utils_app.utils import tiered_cache
+
+
+class KudosArchiveTests(APITestCase):
+    fixtures = ['fixtures/test_data.json']
+
+    def setUp(self):
+        tiered_cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.get(email="test@example.com")
+        self.client.force_authenticate(user=self.user)
+
+        # Kudos 1 and 2 fall behind the default 365-day horizon
+        now = timezone.now()
+        for pk in range(1, 6):
+            days = 400 + pk if pk <= 2 else pk
+            Kudos.objects.filter(pk=pk).update(created_at=now - timedelta(days=days))
+
+    def walk(self, name, **params):
+        """Return every page of a list, one kudos per page so the walk crosses the horizon"""
+        pages, page = [], 1
+        while True:
+            response = self.client.get(reverse(name), {'page_size': 1, 'page': page, **params})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            # Parsed, since the order of the side-loaded users map follows the fragment cache
+            pages.append((json.loads(response.content), response['ETag']))
+            if response.data['next'] is None:
+                return pages
+            page += 1
+
+    def walk_all(self):
+        pages = {}
+        for lean in (True, False):
+            with override_settings(LEAN_READ_PATH=lean):
+                for name in ('kudos-history', 'kudos-received'):
+                    pages[lean, name] = self.walk(name)
+                    pages[lean, name, 'sideload'] = self.walk(name, sideload='users')
+        return pages
+
+    def test_archive_moves_old_kudos(self):
+        """Test old kudos move in batches with their ids and timestamps"""
+        created_at = Kudos.objects.get(pk=1).created_at
+
+        self.assertEqual(archive_old_kudos(batch_size=1), "Archived 2 kudos in 2 batches")
+        self.assertEqual(archive_old_kudos(), "Archived 0 kudos in 0 batches")
+
+        self.assertEqual(sorted(KudosArchive.objects.values_list('pk', flat=True)), [1, 2])
+        self.assertFalse(Kudos.objects.filter(pk__in=[1, 2]).exists())
+        self.assertEqual(KudosArchive.objects.get(pk=1).created_at, created_at)
+
+    def test_archive_respects_max_batches(self):
+        """Test a run can be capped and resumed"""
+        self.assertEqual(archive_old_kudos(batch_size=1, max_batches=1), "Archived 1 kudos in 1 batches")
+        self.assertEqual(archive_old_kudos(batch_size=1), "Archived 1 kudos in 1 batches")
+
+    def test_lists_read_through_the_archive(self):
+        """Test every page of the kudos lists is unchanged by archiving"""
+        before = self.walk_all()
+        archive_old_kudos()
+        self.assertEqual(KudosArchive.objects.count(), 2)
+        self.assertEqual(self.walk_all(), before)
+
+    def test_first_page_skips_the_archive(self):
+        """Test pages within the hot rows don't read archived rows"""
+        archive_old_kudos()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('kudos-received'), {'page_size': 1})
+        self.assertEqual(response.data['count'], 2)
+
+        archive_queries = [query for query in queries if 'kudosarchive' in query['sql']]
+        # Only the validator probe, which counts hot and archived rows in one query
+        self.assertEqual(len(archive_queries), 1)
+        self.assertIn('UNION', archive_queries[0]['sql'])
+
+    def test_counts_include_the_archive(self):
+        """Test the leaderboard and dashboard still count archived kudos"""
+        leaderboard = self.client.get(reverse('kudos-leaderboard')).data['data']
+        dashboard = self.client.get(reverse('dashboard-stats')).data['data']
+
+        archive_old_kudos()
+        tiered_cache.clear()
+
+        self.assertEqual(self.client.get(reverse('kudos-leaderboard')).data['data'], leaderboard)
+        self.assertEqual(self.client.get(reverse('dashboard-stats')).data['data'], dashboard)
@@ -0,0 +1,262 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from accounts.models import Organization, User
+from accounts.utils.organization_cache import get_organization_version
+from kudos_app.models import Kudos
+from utils_app.utils import tiered_cache
+
+
+class LeaderboardCachingTests(APITestCase):
+    fixtures = ['fixtures/test_data.json']
+
+    def setUp(self):
+        tiered_cache.clear()
+        self.client = APIClient()
+        self.sender = User.objects.get(email="test@example.com")
+        self.receiver = User.objects.get(email="member@example.com")
+        self.client.force_authenticate(user=self.sender)
+
+        self.give_kudos_url = reverse('give-kudos')
+        self.leaderboard_url = reverse('kudos-leaderboard')
+
+    def get_count(self, response, user):
+        return next(row['kudos_received_count'] for row in response.data['data'] if row['id'] == user.id)
+
+    def test_repeat_hits_skip_database(self):
+        """Test a cached leaderboard page is served without queries"""
+        first = self.client.get(self.leaderboard_url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.leaderboard_url)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.data, second.data)
+
+    def test_pages_are_cached_separately(self):
+        """Test page and page_size are part of the cache key"""
+        full = self.client.get(self.leaderboard_url)
+        paged = self.client.get(f"{self.leaderboard_url}?page=2&page_size=1")
+
+        self.assertEqual(len(full.data['data']), 3)
+        self.assertEqual(len(paged.data['data']), 1)
+        self.assertEqual(paged.data['current_page'], 2)
+
+    @override_settings(ALLOWED_HOSTS=['first.example.com', 'second.example.com'])
+    def test_links_are_built_per_request(self):
+        """Test a cached page doesn't carry the host and query string of the request that filled it"""
+        self.client.get(f"{self.leaderboard_url}?page_size=1&fields=id", HTTP_HOST='first.example.com')
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                f"{self.leaderboard_url}?page_size=1&fields=id&extra=1", HTTP_HOST='second.example.com'
+            )
+        self.assertTrue(response.data['next'].startswith('http://second.example.com/'))
+        self.assertIn('extra=1', response.data['next'])
+        self.assertEqual(response.data['count'], 3)
+
+    def test_giving_kudos_invalidates_cache(self):
+        """Test the cached page is refreshed once new kudos are committed"""
+        before = self.get_count(self.client.get(self.leaderboard_url), self.receiver)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.give_kudos_url, {
+                'receiver': self.receiver.id,
+                'message': 'Thanks for the review!'
+            })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        after = self.get_count(self.client.get(self.leaderboard_url), self.receiver)
+        self.assertEqual(after, before + 1)
+
+    def test_user_deactivation_invalidates_cache(self):
+        """Test deactivated users drop off the cached leaderboard"""
+        self.client.get(self.leaderboard_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.receiver.is_active = False
+            self.receiver.save()
+
+        response = self.client.get(self.leaderboard_url)
+        self.assertNotIn(self.receiver.id, [row['id'] for row in response.data['data']])
+
+    def test_if_none_match_returns_not_modified(self):
+        """Test a matching ETag short-circuits to 304 without queries"""
+        response = self.client.get(self.leaderboard_url)
+        etag = response['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.leaderboard_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.give_kudos_url, {
+                'receiver': self.receiver.id,
+                'message': 'Great demo!'
+            })
+
+        response = self.client.get(self.leaderboard_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class ConditionalListTests(APITestCase):
+    fixtures = ['fixtures/test_data.json']
+
+    def setUp(self):
+        tiered_cache.clear()
+        self.client = APIClient()
+        self.sender = User.objects.get(email="test@example.com")
+        self.receiver = User.objects.get(email="member@example.com")
+        self.client.force_authenticate(user=self.sender)
+
+        self.history_url = reverse('kudos-history')
+        self.received_url = reverse('kudos-received')
+
+    def test_unchanged_history_saves_queries(self):
+        """Test an unchanged history page costs one probe query instead of the full page"""
+        with CaptureQueriesContext(connection) as full:
+            response = self.client.get(self.history_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+
+        with CaptureQueriesContext(connection) as revalidated:
+            response = self.client.get(self.history_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(revalidated), 1)
+        self.assertLess(len(revalidated), len(full))
+
+    def test_deleting_older_kudos_changes_validator(self):
+        """Test removing a row other than the latest change still yields a fresh page"""
+        etag = self.client.get(self.received_url)['ETag']
+        received = Kudos.objects.filter(receiver=self.sender).order_by('updated_at')
+        self.assertGreater(received.count(), 1)
+        received.first().soft_delete()
+
+        response = self.client.get(self.received_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # If-Modified-Since alone never short-circuits, there is no Last-Modified
+        response = self.client.get(self.received_url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_new_kudos_changes_validator(self):
+        """Test giving kudos produces a fresh history page"""
+        etag = self.client.get(self.history_url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('give-kudos'), {
+                'receiver': self.receiver.id,
+                'message': 'Nice catch in the review!'
+            })
+
+        response = self.client.get(self.history_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']), 3)
+
+    def test_role_change_changes_validators(self):
+        """Test adding or removing a group invalidates the pages embedding the user's role"""
+        leaderboard_url = reverse('kudos-leaderboard')
+        member = User.objects.get(pk=self.receiver.pk)
+        group = member.groups.first()
+        self.assertIsNotNone(group)
+
+        for change in (lambda: member.groups.remove(group), lambda: group.user_set.add(member)):
+            etags = [self.client.get(url)['ETag'] for url in (self.received_url, leaderboard_url)]
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+            for url, etag in zip((self.received_url, leaderboard_url), etags):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+
+    def test_validator_depends_on_page(self):
+        """Test each page gets its own ETag"""
+        first = self.client.get(f"{self.received_url}?page_size=1")
+        second = self.client.get(f"{self.received_url}?page_size=1&page=2")
+
+        self.assertNotEqual(first['ETag'], second['ETag'])
+        response = self.client.get(f"{self.received_url}?page_size=1&page=2", HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+@override_settings(LEAN_READ_PATH=False)
+class UserFragmentCacheTests(APITestCase):
+    fixtures = ['fixtures/test_data.json']
+
+    def setUp(self):
+        tiered_cache.clear()
+        self.client = APIClient()
+        self.sender = User.objects.get(email="test@example.com")
+        self.receiver = User.objects.get(email="member@example.com")
+        self.client.force_authenticate(user=self.sender)
+
+        self.received_url = reverse('kudos-received')
+
+    def test_warm_fragments_skip_user_lookups(self):
+        """Test nested users come from the cache once their fragments are warm"""
+        with CaptureQueriesContext(connection) as cold:
+            cold_response = self.client.get(self.received_url)
+
+        with CaptureQueriesContext(connection) as warm:
+            warm_response = self.client.get(self.received_url)
+
+        # Validator probe, paginator count and page query only
+        self.assertEqual(len(warm), 2)
+        self.assertLess(len(warm), len(cold))
+        self.assertEqual(cold_response.data['data'], warm_response.data['data'])
+
+    def test_fragment_matches_user_list_serializer(self):
+        """Test cached fragments keep the UserListSerializer shape"""
+        response = self.client.get(self.received_url)
+        sender = response.data['data'][0]['sender']
+
+        self.assertEqual(
+            list(sender),
+            ['id', 'email', 'first_name', 'last_name', 'organization', 'role', 'is_active']
+        )
+
+    def test_profile_change_refreshes_fragment(self):
+        """Test editing a user invalidates their fragment"""
+        self.client.get(self.received_url)
+
+        member = User.objects.get(pk=self.receiver.pk)
+        member.first_name = 'Renamed'
+        member.save()
+
+        response = self.client.get(self.received_url)
+        names = {row['sender']['first_name'] for row in response.data['data'] if row['sender']['id'] == member.pk}
+        self.assertEqual(names, {'Renamed'})
+
+    def test_organization_save_without_rename(self):
+        """Test only a rename refreshes the organization's users and cache version"""
+        organization = Organization.objects.get(pk=self.receiver.organization_id)
+        updated_at = User.objects.get(pk=self.receiver.pk).updated_at
+        version = get_organization_version(organization.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            organization.save()
+        self.assertEqual(User.objects.get(pk=self.receiver.pk).updated_at, updated_at)
+        self.assertEqual(get_organization_version(organization.pk), version)
+
+        organization.name = 'Renamed Organization'
+        with self.captureOnCommitCallbacks(execute=True):
+            organization.save()
+        self.assertGreater(User.objects.get(pk=self.receiver.pk).updated_at, updated_at)
+        self.assertNotEqual(get_organization_version(organization.pk), version)
+
+    def test_role_change_refreshes_fragment(self):
+        """Test a group change invalidates the cached role"""
+        self.client.get(self.received_url)
+
+        member = User.objects.get(pk=self.receiver.pk)
+        member.groups.clear()
+
+        response = self.client.get(self.received_url)
+        roles = {row['sender']['role'] for row in response.data['data'] if row['sender']['id'] == member.pk}
+        self.assertEqual(roles, {None})
@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import User
+from accounts.utils.organization_cache import get_organization_version
+from kudos_app.models import Kudos, KudosArchive
+from utils_app.utils import tiered_cache
+
+
+class ImportKudosHistoryTests(TestCase):
+    fixtures = ['fixtures/test_data.json']
+
+    def setUp(self):
+        tiered_cache.clear()
+        self.user = User.objects.get(email="test@example.com")
+        self.member = User.objects.get(email="member@example.com")
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as file:
+            file.write(content)
+        return path
+
+    def import_history(self, path, *args):
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_kudos_history', path, *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_ndjson(self):
+        """Test valid rows keep their timestamps without spending quota and bad rows are reported"""
+        recent = (timezone.now() - timedelta(days=30)).replace(microsecond=0)
+        old = timezone.now() - timedelta(days=800)
+        rows = [
+            {'sender': 'Member@Example.com', 'receiver': 'test@example.com', 'message': 'Recent', 'created_at': recent.isoformat()},
+            {'sender': 'test@example.com', 'receiver': 'member@example.com', 'message': 'Old', 'created_at': old.isoformat()},
+            {'sender': 'test@example.com', 'receiver': 'other@example.com', 'message': 'Cross', 'created_at': recent.isoformat()},
+            {'sender': 'nobody@example.com', 'receiver': 'test@example.com', 'message': 'Ghost', 'created_at': recent.isoformat()},
+            {'sender': 'test@example.com', 'receiver': 'member@example.com', 'message': 'When?', 'created_at': 'yesterday'},
+        ]
+        path = self.write('history.ndjson', '\n'.join(json.dumps(row) for row in rows) + '\n\n{broken\n')
+        version = get_organization_version(self.user.organization_id)
+        kudos_before = Kudos.objects.count()
+        self.assertEqual(KudosArchive.objects.count(), 0)
+
+        stdout, stderr = self.import_history(path, '--batch-size', '2')
+
+        self.assertIn("Imported 2 kudos, rejected 4 rows", stdout)
+        self.assertEqual(
+            [line.split(':')[0] for line in stderr.splitlines()],
+            ['Line 3', 'Line 4', 'Line 5', 'Line 7']
+        )
+        kudos = Kudos.objects.get(message='Recent')
+        self.assertEqual((kudos.sender, kudos.receiver, kudos.created_by), (self.member, self.user, self.member))
+        self.assertEqual((kudos.created_at, kudos.updated_at), (recent, recent))
+        # Everything past the archive horizon, the fixture's 2024 kudos included,
+        # ends up in the archive
+        self.assertEqual(list(Kudos.objects.values_list('message', flat=True)), ['Recent'])
+        self.assertEqual(KudosArchive.objects.count(), kudos_before + 1)
+        self.assertTrue(KudosArchive.objects.filter(message='Old', sender=self.user).exists())
+        self.assertEqual(User.objects.get(pk=self.user.pk).kudos_available, self.user.kudos_available)
+        self.assertNotEqual(get_organization_version(self.user.organization_id), version)
+        # Saves outside the import stamp the time again
+        self.assertGreater(Kudos.objects.create(sender=self.user, receiver=self.member, message='Now').created_at, recent)
+
+    def test_import_csv_resumes(self):
+        """Test a CSV import skips the rows an interrupted run already committed"""
+        # Naive timestamps, in the current time zone
+        created_at = (timezone.localtime() - timedelta(days=10)).replace(tzinfo=None).isoformat()
+        path = self.write('history.csv', (
+            "sender,receiver,message,created_at\n"
+            f"test@example.com,member@example.com,First,{created_at}\n"
+            f"test@example.com,member@example.com,Second,{created_at}\n"
+        ))
+        stdout, _ = self.import_history(path, '--skip', '1')
+
+        self.assertIn("Imported 1 kudos", stdout)
+        self.assertFalse(Kudos.objects.filter(message='First').exists())
+        self.assertTrue(timezone.is_aware(Kudos.objects.get(message='Second').created_at))
+
+    def test_csv_without_required_columns(self):
+        """Test a CSV missing columns is refused before anything is imported"""
+        path = self.write('history.csv', "sender,receiver\ntest@example.com,member@example.com\n")
+        with self.assertRaisesMessage(CommandError, 'created_at, message'):
+            self.import_history(path)
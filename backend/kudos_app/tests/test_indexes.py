@@ -0,0 +1,51 @@
+from django.db import connection
+from django.db.models import Count, Q
+from django.test import TestCase
+
+from accounts.models import User
+from kudos_app.models import Kudos
+
+
+class HotQueryIndexTests(TestCase):
+    """
+    EXPLAIN the hot list queries so an ORM change can't silently turn them
+    into table scans
+    """
+    fixtures = ['fixtures/test_data.json']
+
+    def setUp(self):
+        self.user = User.objects.get(email="test@example.com")
+        if connection.vendor == 'postgresql':
+            # The fixture is tiny, so make the planner prove an index path exists
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        # The index already returns the rows in order
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_kudos_history_uses_partial_index(self):
+        """Test the history page reads the active sent kudos index"""
+        kudos = Kudos.objects.filter(sender=self.user, is_active=True).order_by('-created_at', '-id')
+        self.assertUsesIndex(kudos[:10], 'kudos_active_sent_idx')
+
+    def test_kudos_received_uses_partial_index(self):
+        """Test the received page reads the active received kudos index"""
+        kudos = Kudos.objects.filter(receiver=self.user, is_active=True).order_by('-created_at', '-id')
+        self.assertUsesIndex(kudos[:10], 'kudos_active_received_idx')
+
+    def test_organization_users_use_index(self):
+        """Test active members of an organization are found through the index"""
+        self.assertUsesIndex(self.user.organization.get_all_users(), 'user_org_active_idx')
+
+    def test_leaderboard_uses_index(self):
+        """Test the leaderboard finds the organization's active users through the index"""
+        users = User.objects.filter(
+            organization=self.user.organization,
+            is_active=True
+        ).annotate(
+            kudos_received_count=Count('received_kudos', filter=Q(received_kudos__is_active=True))
+        )
+        self.assertIn('user_org_active_idx', users.explain())
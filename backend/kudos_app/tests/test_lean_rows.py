@@ -0,0 +1,69 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from accounts.models import User
+from kudos_app.models import Kudos
+from utils_app.utils import tiered_cache
+
+
+class LeanReadPathTests(APITestCase):
+    fixtures = ['fixtures/test_data.json']
+
+    def setUp(self):
+        tiered_cache.clear()
+        self.client = APIClient()
+        self.sender = User.objects.get(email="test@example.com")
+        self.receiver = User.objects.get(email="member@example.com")
+        self.client.force_authenticate(user=self.sender)
+
+    def get_both(self, url):
+        """Return the response bodies of the serializer path and the lean path"""
+        bodies = []
+        for lean in (False, True):
+            tiered_cache.clear()
+            with override_settings(LEAN_READ_PATH=lean):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            bodies.append(response.content)
+        return bodies
+
+    def assertSameOutput(self, url):
+        serializer_body, lean_body = self.get_both(url)
+        self.assertEqual(serializer_body, lean_body, url)
+
+    def test_lists_match_serializers(self):
+        """Test the lean path is byte-for-byte identical to the serializers"""
+        for name in ('kudos-history', 'kudos-received', 'kudos-leaderboard'):
+            url = reverse(name)
+            self.assertSameOutput(url)
+            self.assertSameOutput(f"{url}?page_size=1&page=2")
+
+    def test_sparse_fieldsets_match_serializers(self):
+        """Test requested and optional fields keep the serializer order"""
+        self.assertSameOutput(f"{reverse('kudos-history')}?fields=created_at,receiver_id,receiver,id")
+        self.assertSameOutput(f"{reverse('kudos-received')}?fields=sender_id")
+        self.assertSameOutput(f"{reverse('kudos-leaderboard')}?fields=kudos_received_count,email")
+
+    def test_missing_role_matches_serializers(self):
+        """Test users without groups and messages needing escapes render the same"""
+        self.receiver.groups.clear()
+        Kudos.objects.create(
+            sender=self.sender,
+            receiver=self.receiver,
+            message='Zoë says "thanks"   <3',
+            created_by=self.sender
+        )
+        self.assertSameOutput(reverse('kudos-history'))
+
+    @override_settings(LEAN_READ_PATH=True)
+    def test_lean_path_queries(self):
+        """Test a lean page costs the validator probe and one page query"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('kudos-received'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 2)
@@ -0,0 +1,116 @@
+import copy
+import os
+import sqlite3
+import tempfile
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from kudos_app.models import Kudos
+from utils_app.utils import tiered_cache, use_primary, use_replica
+from utils_app.utils.custom_db_router import REPLICA_ALIAS
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Replica snapshot uses the SQLite backup API')
+class LaggingReplicaTests(TransactionTestCase):
+    """
+    The replica is a second SQLite file holding a snapshot of the primary,
+    so it lags behind every write made after the snapshot
+    """
+    fixtures = ['fixtures/test_data.json']
+    # The replica alias only exists while this class runs
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        replica_settings = copy.deepcopy(connections.settings['default'])
+        replica_settings['NAME'] = os.path.join(cls.directory.name, 'replica.sqlite3')
+        connections.settings[REPLICA_ALIAS] = replica_settings
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA_ALIAS].close()
+        del connections[REPLICA_ALIAS]
+        del connections.settings[REPLICA_ALIAS]
+        cls.directory.cleanup()
+
+    def setUp(self):
+        tiered_cache.clear()
+        cache.clear()
+        self.client = APIClient()
+        self.sender = User.objects.get(email="test@example.com")
+        self.receiver = User.objects.get(email="member@example.com")
+        self.client.force_authenticate(user=self.sender)
+        self.history_url = reverse('kudos-history')
+        self.snapshot_replica()
+
+    def tearDown(self):
+        cache.clear()
+
+    def snapshot_replica(self):
+        """Copy the primary into the replica file"""
+        connections[REPLICA_ALIAS].close()
+        connection.ensure_connection()
+        target = sqlite3.connect(connections.settings[REPLICA_ALIAS]['NAME'])
+        connection.connection.backup(target)
+        target.close()
+
+    def give_kudos_behind_replica(self, message):
+        """Write on the primary only, then let every sticky window expire"""
+        Kudos.objects.create(sender=self.sender, receiver=self.receiver, message=message, created_by=self.sender)
+        tiered_cache.clear()
+        cache.clear()
+
+    def history_messages(self):
+        response = self.client.get(self.history_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row['message'] for row in response.data['data']]
+
+    def test_read_only_views_use_replica(self):
+        """Test read-only views read the (lagging) replica"""
+        self.give_kudos_behind_replica('Only on the primary')
+
+        self.assertNotIn('Only on the primary', self.history_messages())
+        with use_primary():
+            self.assertTrue(Kudos.objects.filter(message='Only on the primary').exists())
+
+    def test_own_write_sticks_to_primary(self):
+        """Test a user's own kudos shows up in their history despite replica lag"""
+        response = self.client.post(reverse('give-kudos'), {
+            'receiver': self.receiver.id,
+            'message': 'Thanks for pairing!'
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn('Thanks for pairing!', self.history_messages())
+
+        # Once the sticky window is over the replica serves the user again
+        cache.clear()
+        tiered_cache.clear()
+        self.assertNotIn('Thanks for pairing!', self.history_messages())
+
+    def test_organization_write_sticks_to_primary(self):
+        """Test another member's write keeps the organization's reads on the primary"""
+        # Autocommit runs the organization version bump straight away
+        Kudos.objects.create(sender=self.receiver, receiver=self.sender, message='From a teammate', created_by=self.receiver)
+
+        response = self.client.get(reverse('kudos-received'))
+        self.assertIn('From a teammate', [row['message'] for row in response.data['data']])
+
+    def test_writes_go_to_primary(self):
+        """Test writes inside a replica block still hit the primary"""
+        with use_replica():
+            Kudos.objects.create(sender=self.sender, receiver=self.receiver, message='Routed write', created_by=self.sender)
+
+        with use_primary():
+            self.assertTrue(Kudos.objects.filter(message='Routed write').exists())
+        with use_replica():
+            self.assertFalse(Kudos.objects.filter(message='Routed write').exists())
@@ -4,7 +4,8 @@ from kudos_app.views.kudos_views import (
     GiveKudosView,
     UserKudosHistoryView,
     OrganizationKudosLeaderboardView,
-    ReceivedKudosView
+    ReceivedKudosView,
+    BulkKudosView
 )
 
 urlpatterns = [
@@ -12,4 +13,6 @@ urlpatterns = [
     path('history/', UserKudosHistoryView.as_view(), name='kudos-history'),
     path('received/', ReceivedKudosView.as_view(), name='kudos-received'),
     path('leaderboard/', OrganizationKudosLeaderboardView.as_view(), name='kudos-leaderboard'),
+    path('bulk-delete/', BulkKudosView.as_view(), name='kudos-bulk-delete'),
+    path('bulk-restore/', BulkKudosView.as_view(restore=True), name='kudos-bulk-restore'),
 ]
\ No newline at end of file
@@ -0,0 +1,92 @@
+from django.contrib.auth.models import Group
+from django.db.models import OuterRef, Subquery
+from rest_framework import serializers
+
+from kudos_app.serializers.kudos_serializers import KudosDetailSerializer, KudosLeaderboardSerializer
+from utils_app.serializers import sparse_field_names
+
+# Formats datetimes exactly like the ModelSerializer fields
+_datetime_field = serializers.DateTimeField()
+
+
+def role_subquery(user_ref):
+    """The name of the user's lowest-pk group, i.e. what ``user.groups.first()`` returns"""
+    return Subquery(
+        Group.objects.filter(user=OuterRef(user_ref)).order_by('pk').values('name')[:1]
+    )
+
+
+def user_columns(prefix):
+    return [
+        f'{prefix}__id', f'{prefix}__email', f'{prefix}__first_name',
+        f'{prefix}__last_name', f'{prefix}__organization__name', f'{prefix}__is_active'
+    ]
+
+
+def build_user(row, prefix):
+    """Same output as UserListSerializer"""
+    user = {
+        'id': row[f'{prefix}__id'],
+        'email': row[f'{prefix}__email'],
+        'first_name': row[f'{prefix}__first_name'],
+        'last_name': row[f'{prefix}__last_name'],
+    }
+    # UserListSerializer skips organization when the user has none
+    if row[f'{prefix}__organization__name'] is not None:
+        user['organization'] = row[f'{prefix}__organization__name']
+    user['role'] = row[f'{prefix}_role']
+    user['is_active'] = row[f'{prefix}__is_active']
+    return user
+
+
+def kudos_values(queryset, names):
+    """
+    Project a kudos queryset onto the columns needed for ``names``, joining the
+    sender/receiver organizations and roles in SQL
+    """
+    columns = ['id', 'message', 'created_at', 'sender_id', 'receiver_id']
+    roles = {}
+    for prefix in ('sender', 'receiver'):
+        if prefix in names:
+            columns += user_columns(prefix)
+            roles[f'{prefix}_role'] = role_subquery(f'{prefix}_id')
+    return queryset.values(*columns, **roles)
+
+
+def build_kudos_rows(rows, names):
+    """
+    Build KudosDetailSerializer(many=True).data from kudos_values() rows
+    """
+    builders = {
+        'id': lambda row: row['id'],
+        'sender': lambda row: build_user(row, 'sender'),
+        'receiver': lambda row: build_user(row, 'receiver'),
+        'message': lambda row: row['message'],
+        'created_at': lambda row: _datetime_field.to_representation(row['created_at']),
+        'sender_id': lambda row: row['sender_id'],
+        'receiver_id': lambda row: row['receiver_id'],
+    }
+    builders = [(name, builders[name]) for name in names]
+    return [{name: build(row) for name, build in builders} for row in rows]
+
+
+def kudos_field_names(requested=None):
+    return sparse_field_names(KudosDetailSerializer, requested)
+
+
+def leaderboard_values(queryset, names):
+    """
+    Project an annotated leaderboard queryset onto the columns of ``names``
+    """
+    return queryset.values(*names)
+
+
+def build_leaderboard_rows(rows, names):
+    """
+    Build KudosLeaderboardSerializer(many=True).data from leaderboard_values() rows
+    """
+    return [{name: row[name] for name in names} for row in rows]
+
+
+def leaderboard_field_names(requested=None):
+    return sparse_field_names(KudosLeaderboardSerializer, requested)
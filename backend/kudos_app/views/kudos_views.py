@@ -1,20 +1,36 @@
+from django.conf import settings
 from django.db import transaction
-from django.db.models import Count, Q
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 
 from accounts.models import User
-from accounts.serializers.user_serializers import UserListSerializer
-from kudos_app.models import Kudos
+from accounts.utils.organization_cache import ORGANIZATION_NAMESPACE, get_organization_version
+from kudos_app.models import Kudos, KudosArchive
 from kudos_app.serializers.kudos_serializers import (
     KudosCreateSerializer,
-    KudosDetailSerializer, KudosLeaderboardSerializer
+    KudosDetailSerializer, KudosLeaderboardSerializer,
+    KudosSideloadSerializer
 )
+from kudos_app.utils.lean_rows import (
+    kudos_field_names, kudos_values, build_kudos_rows,
+    leaderboard_field_names, leaderboard_values, build_leaderboard_rows
+)
+from utils_app.serializers import requested_fields
+from utils_app.views.bulk_views import BulkSoftDeleteView
 from utils_app.utils import (
     SUCCESS_MESSAGES,
     ERROR_MESSAGES,
     api_response,
-    CustomPagination
+    CustomPagination,
+    QuerySetChain,
+    tiered_cache,
+    make_etag,
+    conditional_response,
+    set_validators,
+    ReadOnlyViewMixin,
+    start_span
 )
 
 
@@ -31,14 +47,17 @@ class GiveKudosView(APIView):
             context={'request': request}
         )
         
-        if serializer.is_valid():
+        with start_span('KudosCreateSerializer.is_valid'):
+            valid = serializer.is_valid()
+        if valid:
             try:
                 kudos = serializer.save(
                     sender=request.user,
                     created_by=request.user
                 )
-                request.user.kudos_available -= 1
-                request.user.save()
+                with start_span('sender quota update'):
+                    request.user.kudos_available -= 1
+                    request.user.save()
                 
                 detail_serializer = KudosDetailSerializer(kudos)
                 return api_response(
@@ -56,23 +75,64 @@ class GiveKudosView(APIView):
             errors=serializer.errors
         )
 
-class UserKudosHistoryView(APIView):
+class KudosListView(ReadOnlyViewMixin, APIView):
     """
-    API view for viewing kudos history of the logged-in user
+    Base API view for the paginated kudos lists of the logged-in user
+
+    ``?sideload=users`` returns rows with ``sender_id``/``receiver_id`` only
+    and a top-level ``users`` map holding each distinct user once.
+
+    With ``LEAN_READ_PATH`` the rows are built from a values() projection
+    instead of KudosDetailSerializer, with identical output.
+
+    Rows come from the hot table first, then from KudosArchive; the archive
+    is only read by pages that go past the hot rows.
     """
     permission_classes = [IsAuthenticated]
     pagination_class = CustomPagination
 
+    def get_queryset(self, request, model):
+        raise NotImplementedError
+
     def get(self, request):
         try:
-            kudos_given = Kudos.objects.filter(
-                sender=request.user,
-                is_active=True
-            ).select_related('sender', 'receiver').order_by('-created_at')
-            
+            kudos = QuerySetChain(*(
+                self.get_queryset(request, model).order_by('-created_at', '-id')
+                for model in (Kudos, KudosArchive)
+            ))
+            sideload_users = request.query_params.get('sideload') == 'users'
+
             paginator = self.pagination_class()
-            paginated_kudos = paginator.paginate_queryset(kudos_given, request)
-            serializer = KudosDetailSerializer(paginated_kudos, many=True)
+            not_modified = paginator.get_conditional_response(
+                request, kudos, get_organization_version(request.user.organization_id)
+            )
+            if not_modified:
+                return not_modified
+
+            if sideload_users:
+                paginated_kudos = paginator.paginate_queryset(kudos, request)
+                serializer = KudosSideloadSerializer(
+                    paginated_kudos, many=True, context={'request': request}
+                )
+                return paginator.get_paginated_response(
+                    serializer.data,
+                    extra={'users': serializer.get_users()}
+                )
+
+            fields = requested_fields(request)
+            if settings.LEAN_READ_PATH:
+                names = kudos_field_names(fields)
+                rows = paginator.paginate_queryset(kudos.map(lambda part: kudos_values(part, names)), request)
+                return paginator.get_paginated_response(build_kudos_rows(rows, names))
+
+            # Only join the users that will be rendered
+            related = [name for name in ('sender', 'receiver') if fields is None or name in fields]
+            paginated_kudos = paginator.paginate_queryset(
+                kudos.map(lambda part: part.select_related(*related)), request
+            )
+            serializer = KudosDetailSerializer(
+                paginated_kudos, many=True, context={'request': request}
+            )
             
             return paginator.get_paginated_response(serializer.data)
             
@@ -82,59 +142,112 @@ class UserKudosHistoryView(APIView):
                 errors={"detail": str(e)}
             )
 
-class OrganizationKudosLeaderboardView(APIView):
+class UserKudosHistoryView(KudosListView):
+    """
+    API view for viewing kudos history of the logged-in user
+    """
+
+    def get_queryset(self, request, model):
+        return model.objects.filter(
+            sender=request.user,
+            is_active=True
+        )
+
+class OrganizationKudosLeaderboardView(ReadOnlyViewMixin, APIView):
     """
     API view for viewing organization users sorted by kudos received
+
+    Page rows and the row count are cached per (organization, page,
+    page_size) under the organization's cache version, which is bumped
+    whenever kudos are given or users change, and revalidated through
+    ETag/If-None-Match. Pagination links are built per request.
     """
     permission_classes = [IsAuthenticated]
     pagination_class = CustomPagination
+    cache_timeout = 300
 
     def get(self, request):
         try:
-            users = User.objects.filter(
-                organization=request.user.organization,
-                is_active=True
-            ).annotate(
-                kudos_received_count=Count(
-                    'received_kudos',
-                    filter=Q(received_kudos__is_active=True)
-                )
-            ).order_by('-kudos_received_count')
+            organization_id = request.user.organization_id
+            version = get_organization_version(organization_id)
+
+            etag = make_etag(
+                'leaderboard', organization_id, version, request.get_full_path(), request.accepted_renderer.format
+            )
+            not_modified = conditional_response(request, etag=etag)
+            if not_modified:
+                return not_modified
 
             paginator = self.pagination_class()
-            paginated_users = paginator.paginate_queryset(users, request)
-            serializer = KudosLeaderboardSerializer(paginated_users, many=True)
-            
-            return paginator.get_paginated_response(serializer.data)
-            
+            cache_key = tiered_cache.versioned_key(
+                ORGANIZATION_NAMESPACE, organization_id, 'leaderboard-rows',
+                request.query_params.get(paginator.page_query_param, 1),
+                paginator.get_page_size(request),
+                ','.join(requested_fields(request) or []),
+                version=version
+            )
+            page = tiered_cache.get_or_set(
+                cache_key,
+                lambda: self.get_leaderboard_page(request, paginator),
+                timeout=self.cache_timeout
+            )
+
+            # The links carry this request's host and query string, so they
+            # are never cached
+            paginator.paginate_queryset(range(page['count']), request)
+            response = paginator.get_paginated_response(page['data'])
+            return set_validators(response, etag=etag)
+
         except Exception as e:
             return api_response(
                 ERROR_MESSAGES["SERVER_ERROR"],
                 errors={"detail": str(e)}
             )
 
-class ReceivedKudosView(APIView):
+    def get_leaderboard_page(self, request, paginator):
+        """Return the rows of the requested page and the total row count"""
+        users = User.objects.filter(
+            organization=request.user.organization,
+            is_active=True
+        ).annotate(
+            # A subquery for the archive, since a second join would multiply the counts
+            kudos_received_count=Count(
+                'received_kudos',
+                filter=Q(received_kudos__is_active=True)
+            ) + Coalesce(Subquery(
+                KudosArchive.objects.filter(receiver=OuterRef('pk'), is_active=True)
+                .order_by().values('receiver').annotate(count=Count('pk')).values('count'),
+                output_field=IntegerField()
+            ), 0)
+        ).order_by('-kudos_received_count', 'id')
+
+        if settings.LEAN_READ_PATH:
+            names = leaderboard_field_names(requested_fields(request))
+            rows = paginator.paginate_queryset(leaderboard_values(users, names), request)
+            data = build_leaderboard_rows(rows, names)
+        else:
+            paginated_users = paginator.paginate_queryset(users, request)
+            data = KudosLeaderboardSerializer(
+                paginated_users, many=True, context={'request': request}
+            ).data
+
+        return {'count': paginator.page.paginator.count, 'data': data}
+
+class ReceivedKudosView(KudosListView):
     """
     API view for viewing kudos received by the logged-in user
     """
-    permission_classes = [IsAuthenticated]
-    pagination_class = CustomPagination
 
-    def get(self, request):
-        try:
-            kudos_received = Kudos.objects.filter(
-                receiver=request.user,
-                is_active=True
-            ).select_related('sender', 'receiver').order_by('-created_at')
-            
-            paginator = self.pagination_class()
-            paginated_kudos = paginator.paginate_queryset(kudos_received, request)
-            serializer = KudosDetailSerializer(paginated_kudos, many=True)
-            
-            return paginator.get_paginated_response(serializer.data)
-            
-        except Exception as e:
-            return api_response(
-                ERROR_MESSAGES["SERVER_ERROR"],
-                errors={"detail": str(e)}
-            ) 
\ No newline at end of file
+    def get_queryset(self, request, model):
+        return model.objects.filter(
+            receiver=request.user,
+            is_active=True
+        )
+
+class BulkKudosView(BulkSoftDeleteView):
+    """
+    API view for organization owners removing (or restoring) kudos received in their organization in bulk
+    """
+
+    def get_queryset(self, request):
+        return Kudos.objects.filter(receiver__organization=request.user.organization)
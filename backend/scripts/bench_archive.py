@@ -0,0 +1,100 @@
+"""
+Archive benchmark: index size of the hot kudos table and latency of the
+received-kudos list before and after archive_old_kudos() moves the kudos
+older than KUDOS_ARCHIVE_AFTER_DAYS out of it.
+
+Kudos are spread evenly over --days days, oldest ids first.
+
+Usage: python scripts/bench_archive.py [--kudos N] [--days N] [--repeat N]
+"""
+import argparse
+import os
+import tempfile
+from datetime import timedelta
+
+from bench_utils import create_test_database, seed, measure, summarize, print_table
+
+
+def table_sizes(connection, table):
+    """Return (table bytes, index bytes) of ``table``"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT pg_relation_size(%s), pg_indexes_size(%s)', [table, table])
+            return cursor.fetchone()
+        cursor.execute(
+            'SELECT SUM(CASE WHEN m.type = %s THEN s.pgsize ELSE 0 END), '
+            'SUM(CASE WHEN m.type = %s THEN s.pgsize ELSE 0 END) '
+            'FROM dbstat s JOIN sqlite_master m ON m.name = s.name WHERE m.tbl_name = %s',
+            ['table', 'index', table]
+        )
+        return cursor.fetchone()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--kudos', type=int, default=100000)
+    parser.add_argument('--days', type=int, default=3 * 365)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        connection = create_test_database(name=os.path.join(directory, 'bench.sqlite3'))
+        _, members = seed(users=50, kudos=args.kudos)
+
+        from django.conf import settings
+        from django.urls import reverse
+        from django.utils import timezone
+        from rest_framework.test import APIClient
+        from kudos_app.models import Kudos, KudosArchive
+        from kudos_app.tasks import archive_old_kudos
+
+        # Backdate: the first ids are the oldest, one slice of ids per day
+        now = timezone.now()
+        first_id = Kudos.objects.order_by('id').values_list('id', flat=True).first()
+        per_day = max(1, args.kudos // args.days)
+        for day in range(args.days):
+            start = first_id + day * per_day
+            Kudos.objects.filter(id__gte=start, id__lt=start + per_day).update(
+                created_at=now - timedelta(days=args.days - day)
+            )
+
+        client = APIClient()
+        client.force_authenticate(user=members[1])
+        url = reverse('kudos-received')
+        last_page = {'page_size': 100, 'page': client.get(url, {'page_size': 100}).data['total_pages']}
+
+        def first_page():
+            client.get(url, {'page_size': 100})
+
+        def oldest_page():
+            client.get(url, last_page)
+
+        rows = []
+        for stage in ('before', 'after'):
+            if stage == 'after':
+                print(archive_old_kudos())
+                if connection.vendor == 'sqlite':
+                    with connection.cursor() as cursor:
+                        cursor.execute('VACUUM')
+            hot_rows = Kudos.objects.count()
+            table_bytes, index_bytes = table_sizes(connection, Kudos._meta.db_table)
+            first = summarize(measure(first_page, repeat=args.repeat))
+            oldest = summarize(measure(oldest_page, repeat=args.repeat))
+            rows.append([
+                stage, hot_rows, f"{table_bytes / 1024:,.0f}", f"{index_bytes / 1024:,.0f}",
+                first['p50_ms'], first['p99_ms'], oldest['p50_ms'], oldest['p99_ms']
+            ])
+
+        print(
+            f"{args.kudos} kudos over {args.days} days, archive horizon "
+            f"{settings.KUDOS_ARCHIVE_AFTER_DAYS} days, {KudosArchive.objects.count()} archived"
+        )
+        print_table(
+            ['stage', 'hot rows', 'table KiB', 'index KiB',
+             'first page p50', 'first page p99', 'last page p50', 'last page p99'],
+            rows
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Compression benchmark: bytes on the wire and CPU time per response size for
+gzip and Brotli at the levels CompressionMiddleware picks (and a few fixed
+levels for comparison), on leaderboard-shaped JSON.
+
+Usage: python scripts/bench_compression.py [--repeat N]
+"""
+import argparse
+
+from bench_utils import measure, summarize, print_table
+
+SIZES = [1024, 16 * 1024, 128 * 1024, 1024 * 1024, 4 * 1024 * 1024]
+
+
+def make_payload(size):
+    """Leaderboard-like JSON body of roughly ``size`` bytes"""
+    from utils_app.utils.custom_renderers import CustomJSONRenderer
+
+    rows, body = [], b''
+    while len(body) < size:
+        i = len(rows)
+        rows.extend({
+            'id': i + n,
+            'email': f'user{i + n}@example.com',
+            'first_name': f'First{(i + n) % 97}',
+            'last_name': f'Last{(i + n) % 89}',
+            'kudos_received_count': ((i + n) * 37) % 250,
+        } for n in range(max(1, (size - len(body)) // 110)))
+        body = CustomJSONRenderer().render({'status_code': 200, 'data': rows, 'errors': None})
+    return body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    from utils_app.middleware.compression_middleware import CompressionMiddleware, STREAMS
+
+    middleware = CompressionMiddleware(lambda request: None)
+    rows = []
+    for size in SIZES:
+        payload = make_payload(size)
+        variants = [('identity', None, None)]
+        for encoding in STREAMS:
+            adaptive = middleware.get_level(encoding, len(payload))
+            # Brotli 11 takes seconds per megabyte, so it is only shown for small bodies
+            fixed = {'gzip': (1, 6, 9), 'br': (1, 5, 11) if size <= 128 * 1024 else (1, 5)}[encoding]
+            for level in sorted(set(fixed) | {adaptive}):
+                label = f"{encoding}-{level}" + (' (adaptive)' if level == adaptive else '')
+                variants.append((label, STREAMS[encoding], level))
+
+        for label, stream_class, level in variants:
+            if stream_class is None:
+                rows.append([len(payload), label, len(payload), '1.00', 0.0])
+                continue
+            compressed = stream_class.compress_all(payload, level)
+            stats = summarize(measure(lambda: stream_class.compress_all(payload, level), repeat=args.repeat, warmup=1))
+            rows.append([len(payload), label, len(compressed), f"{len(payload) / len(compressed):.2f}", stats['mean_ms']])
+
+    print(f"Compressing leaderboard JSON ({args.repeat} runs per cell)")
+    print_table(['body bytes', 'encoding', 'wire bytes', 'ratio', 'cpu ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Database throughput benchmark: concurrent give-kudos and leaderboard traffic
+on SQLite (tuned, WAL) and on PostgreSQL (pooled connections).
+
+PostgreSQL comes from --postgres-url or a throwaway cluster started with
+postgres_harness. Each database runs in its own process because DATABASES
+is read from DATABASE_URL at startup.
+
+Usage: python scripts/bench_database_throughput.py [--postgres-url URL | --pg-bin DIR]
+                                                   [--readers N] [--writers N] [--duration S]
+"""
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+
+def run_worker(args):
+    """Seed the configured database and print the mix results as JSON"""
+    from bench_utils import create_test_database, seed, run_read_write_mix, percentile
+
+    connection = create_test_database(name=args.sqlite_file)
+    _, members = seed(users=50, kudos=5000)
+    results = run_read_write_mix(members, args.readers, args.writers, args.duration)
+
+    summary = {'vendor': connection.vendor}
+    for kind in ('read', 'write'):
+        latencies = results[kind] or [0.0]
+        summary[kind] = {
+            'ops': len(results[kind]) / args.duration,
+            'errors': results[f'{kind}_errors'],
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+        }
+    connection.creation.destroy_test_db(connection.settings_dict['NAME'], verbosity=0)
+    print(json.dumps(summary))
+
+
+def spawn(database_url, args, sqlite_file=None):
+    command = [
+        sys.executable, __file__, '--worker',
+        '--readers', str(args.readers), '--writers', str(args.writers), '--duration', str(args.duration),
+    ]
+    if sqlite_file:
+        command += ['--sqlite-file', sqlite_file]
+    output = subprocess.run(
+        command, env={**os.environ, 'DATABASE_URL': database_url},
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--postgres-url', help='server to create the test database on')
+    parser.add_argument('--pg-bin', help='directory holding initdb and pg_ctl for a throwaway cluster')
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--sqlite-file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return run_worker(args)
+
+    from postgres_harness import temporary_postgres
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        sqlite_file = os.path.join(directory, 'bench.sqlite3')
+        results.append(spawn(f'sqlite:///{sqlite_file}', args, sqlite_file=sqlite_file))
+
+    postgres = contextlib.nullcontext(args.postgres_url) if args.postgres_url else temporary_postgres(args.pg_bin)
+    with postgres as database_url:
+        results.append(spawn(database_url, args))
+
+    print(f"{args.readers} leaderboard readers + {args.writers} give-kudos writers for {args.duration:.0f}s")
+    print(f"{'database':12} {'op':6} {'ops/s':>8} {'errors':>7} {'p50 ms':>8} {'p99 ms':>8}")
+    for result in results:
+        for kind in ('read', 'write'):
+            row = result[kind]
+            print(
+                f"{result['vendor']:12} {kind:6} {row['ops']:8.0f} {row['errors']:7d} "
+                f"{row['p50_ms']:8.2f} {row['p99_ms']:8.2f}"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Kudos history import benchmark: rows per second of the import_kudos_history
+command against saving each kudos the way loaddata does, projected to 1M rows.
+
+History spans --days days, so most of it also goes through the archive pass.
+
+Usage: python scripts/bench_import_history.py [--rows N] [--baseline-rows N] [--days N]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+
+from bench_utils import create_test_database, seed, print_table
+
+
+def write_history(path, members, rows, days):
+    from django.utils import timezone
+
+    now = timezone.now()
+    with open(path, 'w') as file:
+        for i in range(rows):
+            sender, receiver = members[i % len(members)], members[(i * 7 + 1) % len(members)]
+            if sender == receiver:
+                receiver = members[(i + 1) % len(members)]
+            file.write(json.dumps({
+                'sender': sender.email,
+                'receiver': receiver.email,
+                'message': f"Imported thanks #{i}",
+                'created_at': (now - timedelta(days=days * (rows - i) / rows)).isoformat(),
+            }) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--baseline-rows', type=int, default=2000)
+    parser.add_argument('--days', type=int, default=3 * 365)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        create_test_database(name=os.path.join(directory, 'bench.sqlite3'))
+        _, members = seed(users=200, kudos=0)
+
+        from django.core.management import call_command
+        from django.db import transaction
+        from kudos_app.models import Kudos, KudosArchive
+
+        path = os.path.join(directory, 'history.ndjson')
+        write_history(path, members, args.rows, args.days)
+
+        start = time.perf_counter()
+        call_command('import_kudos_history', path, stdout=StringIO())
+        command_seconds = time.perf_counter() - start
+        imported = Kudos.objects.count() + KudosArchive.objects.count()
+
+        # Saving each kudos like loaddata does, with full_clean and the quota update;
+        # the sender's quota is topped up so no row is refused
+        from accounts.models import User
+        with open(path) as file:
+            baseline = [json.loads(next(file)) for _ in range(args.baseline_rows)]
+        users = {member.email: member for member in members}
+        start = time.perf_counter()
+        for row in baseline:
+            with transaction.atomic():
+                sender = users[row['sender']]
+                User.objects.filter(pk=sender.pk).update(kudos_available=3)
+                sender.kudos_available = 3
+                Kudos(sender=sender, receiver=users[row['receiver']], message=row['message'], created_by=sender).save()
+        baseline_seconds = time.perf_counter() - start
+
+        rows = []
+        for name, count, seconds in (
+            ('import_kudos_history', imported, command_seconds),
+            ('save() per row', args.baseline_rows, baseline_seconds),
+        ):
+            rate = count / seconds
+            rows.append([name, count, f"{seconds:.1f}", f"{rate:,.0f}", f"{1_000_000 / rate / 60:.1f}"])
+        print_table(['method', 'rows', 'seconds', 'rows/s', 'minutes per 1M'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Serialization benchmark: KudosDetailSerializer vs the lean values() path,
+reported as rows per second for one page of the received-kudos list
+(query execution included).
+
+Usage: python scripts/bench_lean_rows.py [--page-size N] [--repeat N]
+"""
+import argparse
+
+from bench_utils import create_test_database, seed, measure, summarize, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    create_test_database()
+    _, members = seed(users=50, kudos=5000)
+
+    from kudos_app.models import Kudos
+    from kudos_app.serializers.kudos_serializers import KudosDetailSerializer
+    from kudos_app.utils.lean_rows import kudos_field_names, kudos_values, build_kudos_rows
+    from utils_app.utils import tiered_cache
+
+    kudos = Kudos.objects.filter(receiver=members[1], is_active=True).order_by('-created_at')
+    names = kudos_field_names()
+
+    def serializer_cold():
+        tiered_cache.clear()
+        return KudosDetailSerializer(kudos.select_related('sender', 'receiver')[:args.page_size], many=True).data
+
+    def serializer_warm():
+        return KudosDetailSerializer(kudos.select_related('sender', 'receiver')[:args.page_size], many=True).data
+
+    def lean():
+        return build_kudos_rows(kudos_values(kudos, names)[:args.page_size], names)
+
+    rows_per_page = len(lean())
+    assert serializer_cold() == lean(), 'lean rows differ from the serializer output'
+
+    paths = [
+        ('KudosDetailSerializer (cold fragments)', serializer_cold),
+        ('KudosDetailSerializer (warm fragments)', serializer_warm),
+        ('lean values() path', lean),
+    ]
+    rows = []
+    for name, fn in paths:
+        stats = summarize(measure(fn, repeat=args.repeat))
+        rows.append([name, stats['mean_ms'], stats['p99_ms'], f"{rows_per_page / stats['mean_ms'] * 1000:,.0f}"])
+
+    print(f"Serializing {rows_per_page}-row pages ({args.repeat} runs)")
+    print_table(['path', 'mean ms', 'p99 ms', 'rows/s'], rows)
+
+
+if __name__ == '__main__':
+    main()
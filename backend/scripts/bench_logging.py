@@ -0,0 +1,74 @@
+"""
+Logging benchmark: latency of requests that log (404s, which django.request
+logs as warnings) when the log sink stalls on every write, with a plain
+synchronous handler against the queued handler of settings.LOGGING.
+
+Usage: python scripts/bench_logging.py [--delay-ms N] [--repeat N]
+"""
+import argparse
+import io
+import logging
+import os
+import tempfile
+import time
+
+from bench_utils import create_test_database, measure, summarize, print_table
+
+
+class SlowStream(io.StringIO):
+    """Stream stalling every write, like a blocked disk or a full pipe"""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def write(self, text):
+        time.sleep(self.delay)
+        return super().write(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--delay-ms', type=float, default=5.0, help='stall per write of the slow sink')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        create_test_database(name=os.path.join(directory, 'bench.sqlite3'))
+
+        from django.test import Client
+        from utils_app.log_handlers import JsonFormatter, QueuedStreamHandler
+
+        client = Client()
+        logger = logging.getLogger('django')
+        original_handlers = logger.handlers[:]
+
+        def request():
+            client.get('/api/v1/kudos/no-such-endpoint/')
+
+        rows = []
+        for name, make_handler in (
+            ('no sink', None),
+            ('StreamHandler (sync)', lambda stream: logging.StreamHandler(stream)),
+            ('QueuedStreamHandler', lambda stream: QueuedStreamHandler(stream=stream, queue_size=100000)),
+        ):
+            stream = SlowStream(args.delay_ms / 1000)
+            handlers = []
+            if make_handler is not None:
+                handler = make_handler(stream)
+                handler.setFormatter(JsonFormatter())
+                handlers = [handler]
+            logger.handlers = handlers
+            result = summarize(measure(request, repeat=args.repeat))
+            for handler in handlers:
+                handler.close()
+            written = len(stream.getvalue().splitlines())
+            rows.append([name, result['p50_ms'], result['p99_ms'], written])
+
+        logger.handlers = original_handlers
+        print(f"Sink stalls {args.delay_ms} ms per write, {args.repeat} requests")
+        print_table(['handler', 'p50 ms', 'p99 ms', 'lines written'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Middleware benchmark: per-request latency of JWT-authenticated API calls
+through the full settings stack vs the lean /api/ stack of PathDispatchMiddleware.
+
+Usage: python scripts/bench_middleware.py [--repeat N]
+"""
+import argparse
+
+from bench_utils import create_test_database, seed, measure, summarize, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    create_test_database()
+    _, members = seed(users=50, kudos=1000)
+
+    from django.conf import settings
+    from django.http import HttpResponse
+    from django.test import Client, RequestFactory, override_settings
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from utils_app.middleware.dispatch_middleware import MiddlewareStack, PathDispatchMiddleware
+
+    # Middleware alone, around a view that does nothing
+    request = RequestFactory().get('/api/v1/kudos/received/')
+    stacks = [
+        ('full stack', MiddlewareStack(settings.FULL_MIDDLEWARE, lambda request: HttpResponse()).handler),
+        ('path dispatch (/api/)', PathDispatchMiddleware(lambda request: HttpResponse())),
+    ]
+
+    token = str(RefreshToken.for_user(members[1]).access_token)
+    endpoints = ['/api/v1/kudos/leaderboard/', '/api/v1/kudos/received/']
+
+    rows = []
+    for name, handler in stacks:
+        stats = summarize(measure(lambda: handler(request), repeat=args.repeat))
+        rows.append(['middleware only', name, stats['mean_ms'], stats['p50_ms'], stats['p99_ms']])
+
+    for endpoint in endpoints:
+        for name, middleware in [('full stack', settings.FULL_MIDDLEWARE), ('path dispatch (/api/)', settings.MIDDLEWARE)]:
+            with override_settings(MIDDLEWARE=middleware):
+                client = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+                assert client.get(endpoint).status_code == 200
+                stats = summarize(measure(lambda: client.get(endpoint), repeat=args.repeat))
+            rows.append([endpoint, name, stats['mean_ms'], stats['p50_ms'], stats['p99_ms']])
+
+    print(f"Per-request latency ({args.repeat} requests per row)")
+    print_table(['request', 'middleware', 'mean ms', 'p50 ms', 'p99 ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
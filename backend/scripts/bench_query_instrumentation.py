@@ -0,0 +1,76 @@
+"""
+Query instrumentation benchmark: per-query overhead of the metrics, slow-log
+and tracing observers, alone and stacked as the request middleware stacks them.
+Runs a trivial statement through the ORM's cursor, so the instrumentation dominates.
+
+Usage: python scripts/bench_query_instrumentation.py [--repeat N]
+"""
+import argparse
+import contextlib
+
+from bench_utils import create_test_database, measure, summarize, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20000)
+    args = parser.parse_args()
+
+    create_test_database()
+
+    from django.db import connection
+    from django.test import RequestFactory, override_settings
+    from utils_app.utils.custom_metrics import track_queries
+    from utils_app.utils.custom_slow_log import record_queries
+    from utils_app.utils.custom_tracing import InMemorySpanExporter, start_trace, trace_queries, use_exporter
+
+    request = RequestFactory().get('/api/v1/kudos/received/')
+
+    def query():
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+
+    def sampled_trace():
+        return start_trace('GET /api/v1/kudos/received/', traceparent=f'00-{"1" * 32}-{"2" * 16}-01')
+
+    modes = [
+        ('none', []),
+        ('metrics', [track_queries]),
+        ('slow log', [lambda: record_queries(request)]),
+        ('metrics + slow log', [track_queries, lambda: record_queries(request)]),
+        ('metrics + slow log + unsampled trace', [
+            lambda: start_trace('GET', traceparent=f'00-{"1" * 32}-{"2" * 16}-00'), trace_queries,
+            track_queries, lambda: record_queries(request)
+        ]),
+        ('metrics + slow log + sampled trace', [
+            sampled_trace, trace_queries, track_queries, lambda: record_queries(request)
+        ]),
+    ]
+
+    rounds = 5
+    timings = {name: [] for name, _ in modes}
+    # No query is slow or sampled, as in production
+    with override_settings(SLOW_QUERY_MS=10000, SLOW_QUERY_SAMPLE_RATE=0, SLOW_REQUEST_MS=10000), \
+            use_exporter(InMemorySpanExporter()) as exporter:
+        # Modes take turns so drift on the machine affects them alike
+        for _ in range(rounds):
+            for name, observers in modes:
+                with contextlib.ExitStack() as stack:
+                    for observer in observers:
+                        stack.enter_context(observer())
+                    timings[name].append(summarize(measure(query, repeat=args.repeat // rounds)))
+                exporter.clear()
+
+    rows = []
+    baseline = min(stats['p50_ms'] for stats in timings['none'])
+    for name, _ in modes:
+        p50 = min(stats['p50_ms'] for stats in timings[name])
+        p99 = min(stats['p99_ms'] for stats in timings[name])
+        rows.append([name, p50, p99, round((p50 - baseline) * 1000, 1)])
+
+    print(f"Per-query latency ({args.repeat} queries per row, best of {rounds} rounds)")
+    print_table(['observers', 'p50 ms', 'p99 ms', 'p50 overhead us'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Render benchmark: stock JSONRenderer vs the orjson and MessagePack renderers
+on a 100-row KudosDetailSerializer page wrapped in the paginated envelope.
+
+Usage: python scripts/bench_renderers.py [--repeat N]
+"""
+import argparse
+
+from bench_utils import create_test_database, seed, measure, summarize, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    create_test_database()
+    seed(users=50, kudos=500)
+
+    from rest_framework.renderers import JSONRenderer
+    from kudos_app.models import Kudos
+    from kudos_app.serializers.kudos_serializers import KudosDetailSerializer
+    from utils_app.utils.custom_renderers import CustomJSONRenderer, CustomMessagePackRenderer
+
+    page = Kudos.objects.select_related('sender', 'receiver').order_by('-created_at')[:100]
+    body = {
+        "message": "Data retrieved successfully",
+        "status_code": 200,
+        "action": "retrieved",
+        "count": 500,
+        "next": "http://testserver/api/v1/kudos/history/?page=2&page_size=100",
+        "previous": None,
+        "current_page": 1,
+        "total_pages": 5,
+        "page_size": 100,
+        "data": KudosDetailSerializer(page, many=True).data,
+        "errors": None,
+    }
+
+    renderers = [
+        ('JSONRenderer (stock)', JSONRenderer()),
+        ('CustomJSONRenderer (orjson)', CustomJSONRenderer()),
+        ('CustomMessagePackRenderer', CustomMessagePackRenderer()),
+    ]
+    rows = []
+    baseline = None
+    for name, renderer in renderers:
+        stats = summarize(measure(lambda: renderer.render(body), repeat=args.repeat))
+        baseline = baseline or stats['mean_ms']
+        rows.append([
+            name, len(renderer.render(body)), stats['mean_ms'], stats['p99_ms'],
+            f"{baseline / stats['mean_ms']:.1f}x"
+        ])
+
+    print(f"Rendering a 100-row KudosDetailSerializer page ({args.repeat} runs)")
+    print_table(['renderer', 'bytes', 'mean ms', 'p99 ms', 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    main()
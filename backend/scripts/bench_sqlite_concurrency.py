@@ -0,0 +1,57 @@
+"""
+SQLite concurrency benchmark: leaderboard reads mixed with give-kudos writes
+from several threads, with the stock connection settings (rollback journal,
+deferred transactions, 5s timeout) and with the tuned DATABASES options
+(WAL, busy_timeout, immediate transactions, larger cache, mmap).
+
+Usage: python scripts/bench_sqlite_concurrency.py [--readers N] [--writers N] [--duration S]
+"""
+import argparse
+import os
+import tempfile
+
+from bench_utils import create_test_database, seed, run_read_write_mix, percentile, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        connection = create_test_database(name=os.path.join(directory, 'bench.sqlite3'))
+        _, members = seed(users=50, kudos=5000)
+        tuned_options = dict(connection.settings_dict['OPTIONS'])
+
+        from django.db import connections
+
+        configurations = [
+            ('stock (rollback journal)', {}, 'DELETE'),
+            ('tuned (WAL)', tuned_options, 'WAL'),
+        ]
+        rows = []
+        for name, options, journal_mode in configurations:
+            connections.close_all()
+            connection.settings_dict['OPTIONS'] = options
+            with connection.cursor() as cursor:
+                cursor.execute(f'PRAGMA journal_mode={journal_mode}')
+            connection.close()
+
+            results = run_read_write_mix(members, args.readers, args.writers, args.duration)
+            for kind in ('read', 'write'):
+                latencies = results[kind] or [0.0]
+                rows.append([
+                    name, kind, f"{len(results[kind]) / args.duration:,.0f}",
+                    results[f'{kind}_errors'], percentile(latencies, 50) * 1000, percentile(latencies, 99) * 1000
+                ])
+
+        connections.close_all()
+
+    print(f"{args.readers} readers + {args.writers} writers for {args.duration:.0f}s each")
+    print_table(['configuration', 'op', 'ops/s', 'locked errors', 'p50 ms', 'p99 ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Tracing benchmark: per-request latency of JWT-authenticated API calls with
+tracing off, on but unsampled, and sampling every request to the file exporter.
+
+Usage: python scripts/bench_tracing.py [--repeat N]
+"""
+import argparse
+import os
+import tempfile
+
+from bench_utils import create_test_database, seed, measure, summarize, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    create_test_database()
+    _, members = seed(users=50, kudos=1000)
+
+    from django.test import Client, override_settings
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from utils_app.utils.custom_tracing import get_processor
+
+    token = str(RefreshToken.for_user(members[1]).access_token)
+    endpoints = ['/api/v1/kudos/leaderboard/', '/api/v1/kudos/received/']
+    modes = [
+        ('off', dict(TRACING_ENABLED=False)),
+        ('on, unsampled', dict(TRACING_ENABLED=True, TRACE_SAMPLE_RATE=0.0)),
+        ('on, every request', dict(TRACING_ENABLED=True, TRACE_SAMPLE_RATE=1.0)),
+    ]
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        trace_file = os.path.join(directory, 'traces.jsonl')
+        for endpoint in endpoints:
+            for name, tracing in modes:
+                with override_settings(TRACE_EXPORTER='file', TRACE_FILE=trace_file, **tracing):
+                    client = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+                    assert client.get(endpoint).status_code == 200
+                    stats = summarize(measure(lambda: client.get(endpoint), repeat=args.repeat))
+                rows.append([endpoint, name, stats['mean_ms'], stats['p50_ms'], stats['p99_ms']])
+
+        get_processor().force_flush()
+        with open(trace_file) as file:
+            spans = sum(1 for _ in file)
+
+    print(f"Per-request latency ({args.repeat} requests per row, {spans} spans written)")
+    print_table(['request', 'tracing', 'mean ms', 'p50 ms', 'p99 ms'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+Shared helpers for the benchmark scripts: Django setup, a throwaway test
+database and synthetic organizations, users and kudos.
+"""
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the project root directory to the Python path
+project_root = str(Path(__file__).resolve().parent.parent)
+sys.path.append(project_root)
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+
+def create_test_database(verbosity=0, name=None):
+    """
+    Create the test database so real data is never touched
+
+    SQLite test databases are in-memory unless a file ``name`` is given.
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    if name:
+        connection.settings_dict['TEST']['NAME'] = name
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=True)
+    return connection
+
+
+def seed(organization_name='bench', users=50, kudos=2000, batch_size=1000):
+    """Create one organization with members and kudos exchanged between them"""
+    from django.contrib.auth.models import Group
+    from accounts.models import Organization, User
+    from kudos_app.models import Kudos
+
+    member_group, _ = Group.objects.get_or_create(name='org_member')
+    organization = Organization.objects.create(name=organization_name)
+
+    members = User.objects.bulk_create([
+        User(
+            username=f"user{i}@{organization_name}.test",
+            email=f"user{i}@{organization_name}.test",
+            first_name=f"User{i}",
+            last_name=organization_name.title(),
+            organization=organization,
+            password='!',
+        )
+        for i in range(users)
+    ], batch_size=batch_size)
+    User.groups.through.objects.bulk_create([
+        User.groups.through(user_id=member.pk, group_id=member_group.pk) for member in members
+    ], batch_size=batch_size)
+
+    Kudos.objects.bulk_create([
+        Kudos(
+            sender=members[i % users],
+            receiver=members[(i * 7 + 1) % users] if (i * 7 + 1) % users != i % users else members[(i + 1) % users],
+            message=f"Thanks for the help with ticket #{i}, great work!",
+            created_by=members[i % users],
+        )
+        for i in range(kudos)
+    ], batch_size=batch_size)
+
+    return organization, members
+
+
+def run_read_write_mix(members, readers, writers, duration):
+    """
+    Run leaderboard reads and give-kudos transactions from concurrent threads
+    for ``duration`` seconds; return per-kind latencies and lock/operational errors
+    """
+    from django.db import connection, transaction, OperationalError
+    from django.db.models import Count, Q
+    from accounts.models import User
+    from kudos_app.models import Kudos
+
+    organization_id = members[0].organization_id
+    results = {'read': [], 'write': [], 'read_errors': 0, 'write_errors': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def read_leaderboard():
+        list(User.objects.filter(organization_id=organization_id, is_active=True).annotate(
+            kudos_received_count=Count('received_kudos', filter=Q(received_kudos__is_active=True))
+        ).order_by('-kudos_received_count').values('id', 'kudos_received_count')[:10])
+
+    def give_kudos(index):
+        # Same shape as GiveKudosView: read the sender, insert, then update the sender
+        with transaction.atomic():
+            sender = User.objects.get(pk=members[index % len(members)].pk)
+            Kudos.objects.create(
+                sender=sender,
+                receiver=members[(index + 1) % len(members)],
+                message='Benchmark thanks!',
+                created_by=sender
+            )
+            sender.kudos_available = 3
+            sender.save(update_fields=['kudos_available'])
+
+    def worker(kind, number):
+        latencies, errors, index = [], 0, number
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                read_leaderboard() if kind == 'read' else give_kudos(index)
+                latencies.append(time.perf_counter() - start)
+            except OperationalError:
+                errors += 1
+            index += writers
+        connection.close()
+        with lock:
+            results[kind].extend(latencies)
+            results[f'{kind}_errors'] += errors
+
+    threads = [threading.Thread(target=worker, args=('read', n)) for n in range(readers)]
+    threads += [threading.Thread(target=worker, args=('write', n)) for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def measure(fn, repeat=200, warmup=5):
+    """Run ``fn`` repeatedly and return the per-call durations in seconds"""
+    for _ in range(warmup):
+        fn()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def percentile(durations, pct):
+    ordered = sorted(durations)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(durations):
+    return {
+        'mean_ms': statistics.mean(durations) * 1000,
+        'p50_ms': percentile(durations, 50) * 1000,
+        'p99_ms': percentile(durations, 99) * 1000,
+    }
+
+
+def print_table(headers, rows):
+    """Print rows as a plain aligned table"""
+    cells = [[str(cell) for cell in headers]] + [
+        [f"{cell:.3f}" if isinstance(cell, float) else str(cell) for cell in row] for row in rows
+    ]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    for index, row in enumerate(cells):
+        print('  '.join(cell.ljust(width) for cell, width in zip(row, widths)))
+        if index == 0:
+            print('  '.join('-' * width for width in widths))
@@ -0,0 +1,134 @@
+"""
+Load test: compare the throughput of running servers (e.g. runserver against
+gunicorn + uvicorn workers) on the same authenticated API endpoints.
+
+Start the servers against the same database first, for example:
+
+    python manage.py runserver --noreload 127.0.0.1:8001
+    gunicorn core.asgi:application -c gunicorn.conf.py --bind 127.0.0.1:8000
+
+then run:
+
+    python scripts/load_test.py --email test@example.com --password ... \\
+        --target runserver=http://127.0.0.1:8001 --target production=http://127.0.0.1:8000
+
+Only the standard library is used, so it can run from any machine.
+"""
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_ENDPOINTS = [
+    '/api/v1/kudos/leaderboard/?page_size=100',
+    '/api/v1/kudos/received/',
+    '/api/v1/kudos/history/',
+    '/api/v1/accounts/dashboard/stats/',
+]
+
+
+def connect(base_url):
+    parts = urlsplit(base_url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+    return connection_class(parts.hostname, parts.port, timeout=30)
+
+
+def login(base_url, email, password):
+    connection = connect(base_url)
+    connection.request(
+        'POST', '/api/v1/accounts/login/',
+        body=json.dumps({'email': email, 'password': password}),
+        headers={'Content-Type': 'application/json'}
+    )
+    response = connection.getresponse()
+    body = json.loads(response.read())
+    if response.status != 200:
+        raise SystemExit(f"Login on {base_url} failed: {response.status} {body}")
+    return body['data']['access_token']
+
+
+def run_endpoint(base_url, path, token, concurrency, duration):
+    """Hit one endpoint from ``concurrency`` keep-alive connections for ``duration`` seconds"""
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    headers = {'Authorization': f'Bearer {token}', 'Accept-Encoding': 'gzip, br'}
+
+    def client():
+        connection = connect(base_url)
+        local_latencies, local_errors = [], 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    local_errors += 1
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                connection.close()
+                connection = connect(base_url)
+                continue
+            local_latencies.append(time.perf_counter() - start)
+        connection.close()
+        with lock:
+            latencies.extend(local_latencies)
+            errors[0] += local_errors
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+        'p99_ms': latencies[int(0.99 * (len(latencies) - 1))] * 1000 if latencies else 0.0,
+        'errors': errors[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--target', action='append', required=True, help='name=base_url, repeatable')
+    parser.add_argument('--email', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--endpoint', action='append', help='path to hit, repeatable (defaults to the hot list endpoints)')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per endpoint and target')
+    args = parser.parse_args()
+
+    targets = [target.split('=', 1) for target in args.target]
+    endpoints = args.endpoint or DEFAULT_ENDPOINTS
+
+    rows = []
+    for name, base_url in targets:
+        token = login(base_url, args.email, args.password)
+        for path in endpoints:
+            result = run_endpoint(base_url, path, token, args.concurrency, args.duration)
+            rows.append((path, name, result))
+            print(
+                f"{path:45} {name:12} {result['rps']:9.1f} req/s  p50 {result['p50_ms']:7.1f} ms  "
+                f"p99 {result['p99_ms']:7.1f} ms  errors {result['errors']}"
+            )
+
+    if len(targets) > 1:
+        baseline_name = targets[0][0]
+        print(f"\nThroughput relative to {baseline_name}:")
+        baseline = {path: result['rps'] for path, name, result in rows if name == baseline_name}
+        for path, name, result in rows:
+            if name != baseline_name and baseline.get(path):
+                print(f"{path:45} {name:12} {result['rps'] / baseline[path]:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
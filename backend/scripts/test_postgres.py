@@ -0,0 +1,29 @@
+"""
+Run the test suite against a throwaway local PostgreSQL.
+
+Usage: python scripts/test_postgres.py [--pg-bin DIR] [test labels and manage.py test options...]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from postgres_harness import temporary_postgres
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pg-bin', help='directory holding initdb and pg_ctl')
+    args, test_args = parser.parse_known_args()
+
+    with temporary_postgres(args.pg_bin) as database_url:
+        env = {**os.environ, 'DATABASE_URL': database_url}
+        result = subprocess.run([sys.executable, 'manage.py', 'test', *test_args], cwd=BACKEND_DIR, env=env)
+    sys.exit(result.returncode)
+
+
+if __name__ == '__main__':
+    main()
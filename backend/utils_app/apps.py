@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class UtilsAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'utils_app'
+
+    def ready(self):
+        from utils_app.utils.custom_tracing import connect_celery_signals
+        connect_celery_signals()
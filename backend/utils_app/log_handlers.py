@@ -0,0 +1,174 @@
+"""
+Logging handlers and formatters referenced from settings.LOGGING
+"""
+import json
+import logging
+import os
+import queue
+import random
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, WatchedFileHandler
+
+# Attributes every LogRecord has; anything else came in through ``extra``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line: timestamp, level, logger,
+    message, the fields passed through ``extra`` and any traceback
+    """
+
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'process': record.process,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry['stack_info'] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Let through only a fraction of the INFO (and lower) records of chatty
+    loggers; ``rates`` maps a logger name, which covers its children, to the
+    fraction kept. Warnings and errors always pass.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = dict(rates or {})
+        self.resolved = {}
+
+    def rate_for(self, name):
+        if name not in self.resolved:
+            rate, prefix = 1.0, name
+            while prefix:
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+                prefix = prefix.rpartition('.')[0]
+            self.resolved[name] = rate
+        return self.resolved[name]
+
+    def filter(self, record):
+        if record.levelno > logging.INFO:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+class QueuedHandler(QueueHandler):
+    """
+    Base handler whose writes happen on a background thread: emit() only
+    formats the record and puts it on a bounded queue, so a slow disk or
+    pipe never holds up the logging thread. When the queue is full, records
+    are dropped and counted instead, and a warning saying how many follows
+    once there is room.
+
+    Subclasses build the handler doing the writing in create_target(). The
+    writer thread is (re)started per process, since gunicorn and Celery
+    fork after logging is configured.
+    """
+
+    def __init__(self, queue_size=10000):
+        self.queue_size = queue_size
+        super().__init__(queue.Queue(queue_size))
+        self.target = self.create_target()
+        # Records arrive formatted by prepare()
+        self.target.setFormatter(logging.Formatter('%(message)s'))
+        self.listener = None
+        self.listener_pid = None
+        self._listener_lock = threading.Lock()
+        self.dropped = 0
+
+    def create_target(self):
+        raise NotImplementedError
+
+    def start_listener(self):
+        if self.listener_pid != os.getpid():
+            with self._listener_lock:
+                if self.listener_pid != os.getpid():
+                    # A forked child inherits the queue but not the writer thread
+                    self.queue = queue.Queue(self.queue_size)
+                    self.listener = QueueListener(self.queue, self.target)
+                    self.listener.start()
+                    self.listener_pid = os.getpid()
+
+    def listening(self):
+        return self.listener is not None and self.listener_pid == os.getpid()
+
+    def stop_listener(self):
+        """Write out what is queued and stop the writer thread"""
+        with self._listener_lock:
+            if self.listening():
+                self.listener.stop()
+            self.listener = self.listener_pid = None
+
+    def enqueue(self, record):
+        try:
+            if self.dropped:
+                self.queue.put_nowait(self.dropped_record())
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def dropped_record(self):
+        record = logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0,
+            "Dropped %d log records, the log queue was full", (self.dropped,), None
+        )
+        return self.prepare(record)
+
+    def emit(self, record):
+        self.start_listener()
+        super().emit(record)
+
+    def flush(self):
+        """Wait until the queued records are written"""
+        if self.listening():
+            self.queue.join()
+        self.target.flush()
+
+    # logging.shutdown() closes every handler at exit, which drains the queue
+    def close(self):
+        self.stop_listener()
+        self.target.close()
+        super().close()
+
+
+class QueuedWatchedFileHandler(QueuedHandler):
+    """
+    QueuedHandler appending to a file that several processes may share and
+    something outside them, such as logrotate, rotates: each record is one
+    append, and the file is reopened once it has been moved away.
+    """
+
+    def __init__(self, filename, encoding='utf-8', queue_size=10000):
+        self.file_args = dict(filename=filename, encoding=encoding)
+        super().__init__(queue_size=queue_size)
+
+    def create_target(self):
+        return WatchedFileHandler(**self.file_args, delay=True)
+
+
+class QueuedStreamHandler(QueuedHandler):
+    """QueuedHandler writing to a stream, stderr by default"""
+
+    def __init__(self, stream=None, queue_size=10000):
+        self.stream = stream
+        super().__init__(queue_size=queue_size)
+
+    def create_target(self):
+        return logging.StreamHandler(self.stream)
@@ -0,0 +1,171 @@
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # Only gzip is offered without Brotli
+    brotli = None
+
+INCOMPRESSIBLE_TYPES = ('image/', 'video/', 'audio/', 'application/zip', 'application/gzip')
+
+
+class GzipStream:
+    """
+    Incremental gzip encoder; every chunk is flushed so streams stay live
+    """
+    encoding = 'gzip'
+
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk):
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+    @staticmethod
+    def compress_all(data, level):
+        return zlib.compress(data, level, wbits=16 + zlib.MAX_WBITS)
+
+
+class BrotliStream:
+    """
+    Incremental Brotli encoder; every chunk is flushed so streams stay live
+    """
+    encoding = 'br'
+
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, chunk):
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+    @staticmethod
+    def compress_all(data, level):
+        return brotli.compress(data, quality=level)
+
+
+# In order of server preference
+STREAMS = {'br': BrotliStream, 'gzip': GzipStream} if brotli else {'gzip': GzipStream}
+
+
+def parse_accept_encoding(header):
+    """
+    Return {coding: q} for an Accept-Encoding header
+    """
+    codings = {}
+    for item in header.split(','):
+        coding, _, params = item.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        codings[coding] = quality
+    return codings
+
+
+def choose_encoding(header, available=tuple(STREAMS)):
+    """
+    Pick the available encoding with the highest q-value (ties go to the
+    server's preference), or None when the client accepts none of them
+    """
+    codings = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = codings.get(encoding, codings.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress API responses with Brotli or gzip, as negotiated via Accept-Encoding.
+
+    Only paths under COMPRESSION_PATH_PREFIXES and bodies of at least
+    COMPRESSION_MIN_SIZE bytes are compressed. The level drops as the body
+    grows so large pages don't cost disproportionate CPU. Streaming responses
+    are compressed chunk by chunk, and strong ETags are weakened because the
+    encoded bytes differ from the identity representation.
+    """
+    # (max body size, level) pairs, checked in order
+    levels = {
+        'br': ((256 * 1024, 5), (None, 1)),
+        'gzip': ((64 * 1024, 6), (1024 * 1024, 4), (None, 1)),
+    }
+    streaming_levels = {'br': 1, 'gzip': 4}
+
+    def get_level(self, encoding, size):
+        for max_size, level in self.levels[encoding]:
+            if max_size is None or size <= max_size:
+                return level
+
+    def should_compress(self, request, response):
+        if not request.path.startswith(tuple(settings.COMPRESSION_PATH_PREFIXES)):
+            return False
+        if response.has_header('Content-Encoding') or response.status_code == 206:
+            return False
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return False
+        if response.get('Content-Type', '').startswith(INCOMPRESSIBLE_TYPES):
+            return False
+        return response.streaming or len(response.content) >= settings.COMPRESSION_MIN_SIZE
+
+    def process_response(self, request, response):
+        if not self.should_compress(request, response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+        stream_class = STREAMS[encoding]
+
+        if response.streaming:
+            stream = stream_class(self.streaming_levels[encoding])
+            original_iterator = response.streaming_content
+            if response.is_async:
+                async def compressed():
+                    async for chunk in original_iterator:
+                        yield stream.compress(chunk)
+                    yield stream.finish()
+            else:
+                def compressed():
+                    for chunk in original_iterator:
+                        yield stream.compress(chunk)
+                    yield stream.finish()
+            response.streaming_content = compressed()
+            # The compressed size is unknown until the stream is consumed
+            del response.headers['Content-Length']
+        else:
+            content = response.content
+            compressed_content = stream_class.compress_all(content, self.get_level(encoding, len(content)))
+            # Return the compressed content only if it's actually shorter
+            if len(compressed_content) >= len(content):
+                return response
+            response.content = compressed_content
+            response.headers['Content-Length'] = str(len(compressed_content))
+
+        # A strong ETag must not be shared by different encodings of a response
+        # (RFC 9110 8.8.1); the weak one still matches If-None-Match.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+
+        return response
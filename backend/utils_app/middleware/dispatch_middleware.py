@@ -0,0 +1,93 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+
+
+class MiddlewareStack:
+    """
+    A middleware chain built the way BaseHandler.load_middleware() builds
+    settings.MIDDLEWARE, keeping its view/template-response/exception hooks
+    """
+
+    def __init__(self, middleware_paths, get_response):
+        self.view_middleware = []
+        self.template_response_middleware = []
+        self.exception_middleware = []
+
+        handler = get_response
+        for middleware_path in reversed(middleware_paths):
+            middleware = import_string(middleware_path)
+            try:
+                instance = middleware(handler)
+            except MiddlewareNotUsed:
+                continue
+            if instance is None:
+                raise ImproperlyConfigured(f"Middleware factory {middleware_path} returned None.")
+
+            if hasattr(instance, 'process_view'):
+                self.view_middleware.insert(0, instance.process_view)
+            if hasattr(instance, 'process_template_response'):
+                self.template_response_middleware.append(instance.process_template_response)
+            if hasattr(instance, 'process_exception'):
+                self.exception_middleware.append(instance.process_exception)
+
+            handler = convert_exception_to_response(instance)
+
+        self.handler = handler
+
+
+class PathDispatchMiddleware:
+    """
+    Run a different middleware stack depending on the request path.
+
+    Paths starting with a prefix of PATH_MIDDLEWARE get that stack; everything
+    else (the admin included) gets FULL_MIDDLEWARE. This keeps sessions, CSRF,
+    messages and session authentication off the bearer-token API routes.
+
+    The view, template-response and exception hooks of the chosen stack are
+    proxied, since the handler only knows about this middleware. Stacks run
+    synchronously, like the DRF views behind them.
+    """
+    sync_capable = True
+    async_capable = False
+
+    def __init__(self, get_response):
+        self.stacks = [
+            (prefix, MiddlewareStack(middleware_paths, get_response))
+            for prefix, middleware_paths in settings.PATH_MIDDLEWARE.items()
+        ]
+        self.default_stack = MiddlewareStack(settings.FULL_MIDDLEWARE, get_response)
+
+    def get_stack(self, request):
+        for prefix, stack in self.stacks:
+            if request.path_info.startswith(prefix):
+                return stack
+        return self.default_stack
+
+    def __call__(self, request):
+        return self.get_stack(request).handler(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        for process_view in self.get_stack(request).view_middleware:
+            response = process_view(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def process_template_response(self, request, response):
+        for process_template_response in self.get_stack(request).template_response_middleware:
+            response = process_template_response(request, response)
+            if response is None:
+                raise ValueError(
+                    f"{process_template_response.__self__.__class__.__name__}.process_template_response "
+                    "didn't return an HttpResponse object. It returned None instead."
+                )
+        return response
+
+    def process_exception(self, request, exception):
+        for process_exception in self.get_stack(request).exception_middleware:
+            response = process_exception(request, exception)
+            if response is not None:
+                return response
+        return None
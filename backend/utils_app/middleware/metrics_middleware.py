@@ -0,0 +1,27 @@
+import time
+
+from django.core.exceptions import MiddlewareNotUsed
+
+from utils_app.utils.custom_metrics import metrics_enabled, observe_request, track_queries
+
+
+class MetricsMiddleware:
+    """
+    Record the latency, status, database query count and time, and response
+    size of every request per route, for the Prometheus metrics endpoint
+
+    Listed first so the timings cover the other middleware and the size is
+    what goes over the wire.
+    """
+
+    def __init__(self, get_response):
+        if not metrics_enabled():
+            raise MiddlewareNotUsed("prometheus_client is not installed")
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with track_queries() as queries:
+            response = self.get_response(request)
+        observe_request(request, response, time.perf_counter() - start, queries)
+        return response
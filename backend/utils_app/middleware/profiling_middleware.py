@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from utils_app.utils.custom_profiling import profile_requested, profiling_user, run_profiled
+
+
+class ProfilingMiddleware:
+    """
+    Run a request under cProfile and tracemalloc when a staff user asks for it
+    with ``?_profile=1`` or an ``X-Profile: 1`` header; the profile, memory
+    and SQL timings are stored and served by the profile endpoints
+
+    Not loaded at all unless PROFILING_ENABLED, so it costs nothing when off.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed("PROFILING_ENABLED is off")
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if profile_requested(request):
+            user = profiling_user(request)
+            if user is not None:
+                return run_profiled(self.get_response, request, user)
+        return self.get_response(request)
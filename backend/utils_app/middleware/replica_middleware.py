@@ -0,0 +1,22 @@
+from utils_app.utils.custom_db_router import stick_to_primary, track_writes
+
+
+class PrimaryStickinessMiddleware:
+    """
+    Keep a user's reads on the primary for a short while after a request of
+    theirs wrote to the database, so read-only views served by a lagging
+    replica still show their own changes
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with track_writes() as writes:
+            response = self.get_response(request)
+
+        # DRF sets the authenticated user on the underlying request as well
+        user = getattr(request, 'user', None)
+        if writes['wrote'] and user is not None and user.is_authenticated:
+            stick_to_primary('user', user.pk)
+        return response
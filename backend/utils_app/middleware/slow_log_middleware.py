@@ -0,0 +1,26 @@
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from utils_app.utils.custom_slow_log import log_slow_request, record_queries
+
+
+class SlowLogMiddleware:
+    """
+    Log slow (and a sample of other) queries with the view and frame that ran
+    them, and requests slower than SLOW_REQUEST_MS with their full query list,
+    to the ``utils_app.slow_log`` logger
+    """
+
+    def __init__(self, get_response):
+        if not settings.SLOW_LOG_ENABLED:
+            raise MiddlewareNotUsed("SLOW_LOG_ENABLED is off")
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with record_queries(request) as recorder:
+            response = self.get_response(request)
+        log_slow_request(request, response, time.perf_counter() - start, recorder)
+        return response
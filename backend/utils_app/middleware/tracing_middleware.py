@@ -0,0 +1,53 @@
+import contextlib
+
+from django.core.exceptions import MiddlewareNotUsed
+
+from utils_app.utils.custom_metrics import route_of
+from utils_app.utils.custom_slow_log import view_name
+from utils_app.utils.custom_tracing import TRACEPARENT, start_span, start_trace, trace_queries, tracing_enabled
+
+TRACE_ID_HEADER = 'X-Trace-Id'
+
+
+class TracingMiddleware:
+    """
+    Trace requests: a server span per request, continuing the caller's trace
+    when it sends a traceparent header, a span for the view and one per SQL
+    query. New traces are sampled at TRACE_SAMPLE_RATE; sampled responses
+    carry their trace id in X-Trace-Id.
+
+    Listed first so the request span covers the other middleware.
+    """
+
+    def __init__(self, get_response):
+        if not tracing_enabled():
+            raise MiddlewareNotUsed("TRACING_ENABLED is off")
+        self.get_response = get_response
+
+    def __call__(self, request):
+        attributes = {'http.method': request.method, 'http.target': request.path}
+        traceparent = request.headers.get(TRACEPARENT)
+        with start_trace(request.method, traceparent=traceparent, attributes=attributes) as span, \
+                contextlib.ExitStack() as view_scope, trace_queries():
+            # Entered by process_view, closed here once the response is back
+            request._tracing_view_scope = view_scope
+            response = self.get_response(request)
+
+            route = route_of(request)
+            span.name = f"{request.method} {route}"
+            span.set_attribute('http.route', route)
+            span.set_attribute('http.status_code', response.status_code)
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                span.set_attribute('enduser.id', user.pk)
+            if response.status_code >= 500:
+                span.set_error(f"HTTP {response.status_code}")
+            if span.sampled:
+                response[TRACE_ID_HEADER] = span.trace_id
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_scope = getattr(request, '_tracing_view_scope', None)
+        if view_scope is not None:
+            view_scope.enter_context(start_span(view_name(request)))
+        return None
@@ -1,3 +1,3 @@
-from .base_model import BaseModel
+from .base_model import BaseModel, SoftDeleteQuerySet, ActiveManager, AllObjectsManager, explicit_timestamps, delete_by_pk
 
-__all__ = ['BaseModel']
\ No newline at end of file
+__all__ = ['BaseModel', 'SoftDeleteQuerySet', 'ActiveManager', 'AllObjectsManager', 'explicit_timestamps', 'delete_by_pk']
@@ -1,7 +1,128 @@
-from django.db import models
+import contextlib
+
+from django.db import connections, models, router, transaction
 from django.conf import settings
 from django.utils.timezone import now
 
+from utils_app.signals import post_bulk_soft_delete, post_bulk_restore
+
+SOFT_DELETE_BATCH_SIZE = 500
+
+
+@contextlib.contextmanager
+def explicit_timestamps(model):
+    """
+    Let saves and bulk_create of ``model`` keep the created_at/updated_at they
+    were given, e.g. when importing history, instead of stamping the current time
+
+    The fields are shared by the whole process, so only use it where nothing
+    else saves ``model`` concurrently (management commands, scripts).
+    """
+    fields = [model._meta.get_field(name) for name in ('created_at', 'updated_at')]
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+
+def delete_by_pk(model, pks, using=None):
+    """
+    Delete rows of ``model`` by primary key with plain DELETE statements and
+    return how many went
+
+    Unlike QuerySet.delete() nothing is collected first: no cascades and no
+    pre/post_delete signals. Only for rows no foreign key points at, whose
+    caches the caller invalidates itself.
+    """
+    using = using or router.db_for_write(model)
+    connection = connections[using]
+    table = connection.ops.quote_name(model._meta.db_table)
+    pk_column = connection.ops.quote_name(model._meta.pk.column)
+    pks = list(pks)
+    batch_size = connection.ops.bulk_batch_size([model._meta.pk], pks) or len(pks)
+    deleted = 0
+    with connection.cursor() as cursor:
+        for start in range(0, len(pks), batch_size):
+            batch = pks[start:start + batch_size]
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(f"DELETE FROM {table} WHERE {pk_column} IN ({placeholders})", batch)
+            deleted += cursor.rowcount
+    return deleted
+
+class SoftDeleteQuerySet(models.QuerySet):
+    """
+    QuerySet with set-based soft delete/restore: one UPDATE per batch instead
+    of a save() per object, then a single post_bulk_soft_delete/post_bulk_restore
+    signal with every affected pk for cache and counter invalidation
+    """
+
+    def soft_delete(self, user=None, batch_size=SOFT_DELETE_BATCH_SIZE):
+        """Soft delete the active rows of the queryset, returning the pks that changed"""
+        timestamp = now()
+        return self._bulk_update_state(
+            self.filter(is_active=True),
+            post_bulk_soft_delete,
+            batch_size,
+            is_deleted=True,
+            deleted_at=timestamp,
+            deleted_by=user,
+            is_active=False,
+            updated_at=timestamp,
+            user=user,
+        )
+
+    def restore(self, batch_size=SOFT_DELETE_BATCH_SIZE):
+        """Restore the soft-deleted rows of the queryset, returning the pks that changed"""
+        return self._bulk_update_state(
+            self.filter(is_deleted=True),
+            post_bulk_restore,
+            batch_size,
+            is_deleted=False,
+            deleted_at=None,
+            deleted_by=None,
+            is_active=True,
+            updated_at=now(),
+        )
+
+    def _bulk_update_state(self, queryset, signal, batch_size, user=None, **values):
+        pks = list(queryset.order_by().values_list('pk', flat=True))
+        if not pks:
+            return pks
+        rows = self.model._base_manager.using(self.db)
+        changed = []
+        # update() skips auto_now, so updated_at is set explicitly; it feeds
+        # the ETag probes and the user fragment cache keys
+        with transaction.atomic(using=self.db):
+            for start in range(0, len(pks), batch_size):
+                batch = pks[start:start + batch_size]
+                # Rows a concurrent delete/restore already moved are left alone
+                updated = rows.filter(pk__in=batch, is_active=not values['is_active']).update(**values)
+                if updated < len(batch):
+                    # Keep only the rows this call stamped
+                    batch = list(rows.filter(
+                        pk__in=batch, is_active=values['is_active'], updated_at=values['updated_at']
+                    ).values_list('pk', flat=True))
+                changed.extend(batch)
+            if changed:
+                signal.send(sender=self.model, pks=changed, user=user, using=self.db)
+        return changed
+
+
+class AllObjectsManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """Every row, soft-deleted ones included"""
+
+
+class ActiveManager(AllObjectsManager):
+    """Only the rows that are active"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_active=True)
+
 class BaseModel(models.Model):
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL, 
@@ -30,6 +151,9 @@ class BaseModel(models.Model):
     deleted_at = models.DateTimeField(null=True, blank=True)
     is_deleted = models.BooleanField(default=False)
 
+    objects = AllObjectsManager()
+    active_objects = ActiveManager()
+
     class Meta:
         abstract = True  # Ensures this model is not created as a table
 
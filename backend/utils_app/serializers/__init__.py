@@ -0,0 +1,9 @@
+from .fieldset_serializers import SparseFieldsetMixin, requested_fields, sparse_field_names
+from .bulk_serializers import BulkIdsSerializer
+
+__all__ = [
+    'SparseFieldsetMixin',
+    'requested_fields',
+    'sparse_field_names',
+    'BulkIdsSerializer'
+]
\ No newline at end of file
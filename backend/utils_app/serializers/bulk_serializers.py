@@ -0,0 +1,14 @@
+from rest_framework import serializers
+
+MAX_BULK_IDS = 5000
+
+
+class BulkIdsSerializer(serializers.Serializer):
+    """
+    Primary keys of the rows a bulk action applies to
+    """
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_BULK_IDS
+    )
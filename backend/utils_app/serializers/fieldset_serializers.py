@@ -0,0 +1,48 @@
+FIELDS_QUERY_PARAM = 'fields'
+
+
+def requested_fields(request):
+    """
+    Return the field names asked for with ``?fields=a,b,c`` or None when absent
+    """
+    if request is None:
+        return None
+    value = request.query_params.get(FIELDS_QUERY_PARAM)
+    if not value:
+        return None
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def sparse_field_names(serializer_class, requested=None):
+    """
+    Return the names, in output order, a SparseFieldsetMixin serializer emits for ``requested``
+    """
+    meta = serializer_class.Meta
+    if requested is None:
+        optional = set(getattr(meta, 'optional_fields', ()))
+        return [name for name in meta.fields if name not in optional]
+    return [name for name in meta.fields if name in requested]
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin that prunes its fields to the ``?fields=`` query parameter
+    (or a ``fields`` keyword argument) before any of them is computed, so the
+    SerializerMethodFields and nested serializers that are dropped never run.
+
+    Names listed in ``Meta.optional_fields`` are only emitted when requested.
+    """
+
+    def __init__(self, *args, **kwargs):
+        requested = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if requested is None:
+            requested = requested_fields(self.context.get('request'))
+
+        if requested is None:
+            dropped = set(getattr(self.Meta, 'optional_fields', ()))
+        else:
+            dropped = set(self.fields) - set(requested)
+
+        for name in dropped:
+            self.fields.pop(name, None)
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent once per SoftDeleteQuerySet.soft_delete()/restore() call with
+# sender=model, pks (every affected pk), user (who deleted, None on restore) and using
+post_bulk_soft_delete = Signal()
+post_bulk_restore = Signal()
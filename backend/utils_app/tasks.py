@@ -0,0 +1,20 @@
+from celery import shared_task
+from django.db import connection
+
+
+@shared_task
+def optimize_database(full=False):
+    """Refresh SQLite query planner statistics and truncate the WAL"""
+    if connection.vendor != 'sqlite':
+        return f"Skipped optimizing {connection.vendor} database"
+
+    with connection.cursor() as cursor:
+        if full:
+            cursor.execute('ANALYZE')
+        else:
+            # Bounded sampling keeps this cheap on large tables
+            cursor.execute('PRAGMA analysis_limit=1000')
+            cursor.execute('PRAGMA optimize')
+        cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    return f"Optimized SQLite database ({'ANALYZE' if full else 'PRAGMA optimize'})"
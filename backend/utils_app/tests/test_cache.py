@@ -0,0 +1,107 @@
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from utils_app.utils.custom_cache import LocalLRUCache, TieredCache
+
+
+class LocalLRUCacheTests(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        """Test the oldest untouched key is evicted when full"""
+        lru = LocalLRUCache(maxsize=2, ttl=60)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+
+        self.assertEqual(lru.get('a'), 1)
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(lru.get('c'), 3)
+
+    def test_entries_expire(self):
+        """Test entries are dropped after their TTL"""
+        lru = LocalLRUCache(maxsize=10, ttl=0.05)
+        lru.set('a', 1)
+        time.sleep(0.06)
+        self.assertIsNone(lru.get('a'))
+
+
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = TieredCache(local_maxsize=100, local_ttl=60, wait_timeout=2)
+        self.cache.clear()
+
+    def test_hit_and_miss_counters(self):
+        """Test reads are counted per tier"""
+        self.assertIsNone(self.cache.get('key'))
+        self.cache.set('key', 'value')
+        self.assertEqual(self.cache.get('key'), 'value')
+
+        self.cache.local.clear()
+        self.assertEqual(self.cache.get('key'), 'value')
+
+        stats = self.cache.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['local_hits'], 1)
+        self.assertEqual(stats['shared_hits'], 1)
+
+    def test_get_many_reads_both_tiers(self):
+        """Test get_many merges local and shared hits"""
+        self.cache.set_many({'a': 1, 'b': 2})
+        self.cache.local.delete('b')
+
+        self.assertEqual(self.cache.get_many(['a', 'b', 'c']), {'a': 1, 'b': 2})
+
+    def test_bump_version_invalidates_namespace(self):
+        """Test bumping a scope version orphans its keys without touching other scopes"""
+        key = self.cache.versioned_key('org', 1, 'page', 1)
+        other_key = self.cache.versioned_key('org', 2, 'page', 1)
+        self.cache.set(key, 'stale')
+        self.cache.set(other_key, 'other')
+
+        self.cache.bump_version('org', 1)
+
+        new_key = self.cache.versioned_key('org', 1, 'page', 1)
+        self.assertNotEqual(key, new_key)
+        self.assertIsNone(self.cache.get(new_key))
+        self.assertEqual(self.cache.get(self.cache.versioned_key('org', 2, 'page', 1)), 'other')
+
+    def test_get_or_set_computes_once(self):
+        """Test concurrent cold reads compute the value a single time"""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return 'value'
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.get_or_set('cold', compute)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['value'] * 8)
+        self.assertEqual(self.cache.stats()['computes'], 1)
+
+    def test_get_or_set_waits_for_other_process(self):
+        """Test a reader waits for the value while another process holds the lock"""
+        self.cache.shared.add('lock:busy', 1, 10)
+
+        def publish():
+            time.sleep(0.1)
+            self.cache.shared.set('busy', 'from-other-process')
+
+        thread = threading.Thread(target=publish)
+        thread.start()
+        value = self.cache.get_or_set('busy', lambda: 'computed-here')
+        thread.join()
+
+        self.assertEqual(value, 'from-other-process')
+        self.assertEqual(self.cache.stats()['lock_waits'], 1)
@@ -0,0 +1,99 @@
+import gzip
+import json
+
+import brotli
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from accounts.models import User
+from utils_app.middleware.compression_middleware import CompressionMiddleware, choose_encoding
+from utils_app.utils import tiered_cache
+
+PAYLOAD = json.dumps([{'id': i, 'email': f'user{i}@example.com', 'kudos_received_count': i} for i in range(200)]).encode()
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def process(self, response, path='/api/v1/kudos/leaderboard/', accept_encoding='gzip, deflate, br'):
+        request = self.factory.get(path, HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_choose_encoding(self):
+        """Test Accept-Encoding negotiation honours q-values and server preference"""
+        self.assertEqual(choose_encoding('gzip, br'), 'br')
+        self.assertEqual(choose_encoding('gzip;q=1.0, br;q=0.5'), 'gzip')
+        self.assertEqual(choose_encoding('br;q=0, gzip'), 'gzip')
+        self.assertEqual(choose_encoding('*'), 'br')
+        self.assertIsNone(choose_encoding('identity'))
+        self.assertIsNone(choose_encoding(''))
+
+    def test_compresses_large_api_responses(self):
+        """Test large API bodies are encoded and decode back to the original"""
+        response = self.process(HttpResponse(PAYLOAD, content_type='application/json'))
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), PAYLOAD)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+        response = self.process(HttpResponse(PAYLOAD, content_type='application/json'), accept_encoding='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), PAYLOAD)
+
+    def test_skips_small_and_non_api_responses(self):
+        """Test the size threshold and path scope"""
+        response = self.process(HttpResponse(b'{"ok": true}', content_type='application/json'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+        response = self.process(HttpResponse(PAYLOAD), path='/admin/')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+        response = self.process(HttpResponse(PAYLOAD, content_type='image/png'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_unsupported_encoding_varies(self):
+        """Test clients without a supported encoding get identity and a Vary header"""
+        response = self.process(HttpResponse(PAYLOAD), accept_encoding='deflate')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, PAYLOAD)
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    def test_streaming_response(self):
+        """Test streaming bodies are compressed chunk by chunk"""
+        chunks = [PAYLOAD[i:i + 1000] for i in range(0, len(PAYLOAD), 1000)]
+        response = self.process(StreamingHttpResponse(iter(chunks)), accept_encoding='gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), PAYLOAD)
+
+    def test_weakens_strong_etag(self):
+        """Test encoded responses carry a weak ETag"""
+        original = HttpResponse(PAYLOAD)
+        original['ETag'] = '"abc"'
+        self.assertEqual(self.process(original)['ETag'], 'W/"abc"')
+
+
+@override_settings(COMPRESSION_MIN_SIZE=0)
+class CompressionConditionalTests(APITestCase):
+    fixtures = ['fixtures/test_data.json']
+
+    def setUp(self):
+        tiered_cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.get(email="test@example.com"))
+
+    def test_weak_etag_revalidates(self):
+        """Test the weak ETag of a compressed page still yields 304"""
+        url = reverse('kudos-leaderboard')
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertTrue(response['ETag'].startswith('W/'))
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
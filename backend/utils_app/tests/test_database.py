@@ -0,0 +1,53 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from utils_app.tasks import optimize_database
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite connection settings')
+class SQLiteConnectionTests(TestCase):
+
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_connection_pragmas(self):
+        """Test the init command tunes every new connection"""
+        self.assertEqual(self.pragma('busy_timeout'), 20000)
+        self.assertEqual(self.pragma('synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma('cache_size'), -64 * 1024)
+        self.assertEqual(self.pragma('temp_store'), 2)  # MEMORY
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite maintenance')
+class DatabaseMaintenanceTests(TransactionTestCase):
+
+    def test_optimize_database(self):
+        """Test the maintenance task runs in both modes"""
+        self.assertIn('PRAGMA optimize', optimize_database())
+        self.assertIn('ANALYZE', optimize_database(full=True))
+
+
+@skipUnless(connection.vendor == 'postgresql', 'PostgreSQL profile')
+class PostgreSQLTests(TestCase):
+
+    def test_connection_pool(self):
+        """Test connections come from the psycopg pool"""
+        self.assertIsNotNone(connection.pool)
+        self.assertEqual(connection.settings_dict['CONN_MAX_AGE'], 0)
+
+    def test_vendor_indexes(self):
+        """Test the PostgreSQL-only index exists, and no receiver index duplicates the partial list index"""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'kudos_app_kudos'")
+            indexes = {row[0] for row in cursor.fetchall()}
+        self.assertTrue({'kudos_active_received_idx', 'kudos_created_at_brin'} <= indexes)
+        self.assertNotIn('kudos_active_receiver_idx', indexes)
+
+    def test_maintenance_is_skipped(self):
+        """Test the SQLite maintenance task is a no-op"""
+        self.assertIn('Skipped', optimize_database())
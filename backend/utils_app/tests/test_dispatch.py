@@ -0,0 +1,87 @@
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from accounts.models import User
+from utils_app.middleware.dispatch_middleware import PathDispatchMiddleware
+from utils_app.utils import tiered_cache
+
+
+class HookMiddleware:
+    """Test middleware answering every hook"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        response['X-Hook'] = 'called'
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        return HttpResponse('from process_view')
+
+    def process_template_response(self, request, response):
+        response.content = b'from process_template_response'
+        return response
+
+    def process_exception(self, request, exception):
+        return HttpResponse('from process_exception', status=500)
+
+
+@override_settings(PATH_MIDDLEWARE={'/api/': ['utils_app.tests.test_dispatch.HookMiddleware']})
+class PathDispatchMiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = PathDispatchMiddleware(lambda request: HttpResponse('view'))
+
+    def test_dispatches_by_path(self):
+        """Test API paths get their own stack and other paths the full one"""
+        self.assertEqual(self.middleware(self.factory.get('/api/v1/kudos/'))['X-Hook'], 'called')
+        self.assertFalse(self.middleware(self.factory.get('/admin/')).has_header('X-Hook'))
+
+    def test_proxies_hooks(self):
+        """Test view, template-response and exception hooks of the chosen stack run"""
+        request = self.factory.get('/api/v1/kudos/')
+
+        self.assertEqual(self.middleware.process_view(request, None, (), {}).content, b'from process_view')
+        self.assertEqual(
+            self.middleware.process_template_response(request, HttpResponse('view')).content,
+            b'from process_template_response'
+        )
+        self.assertEqual(self.middleware.process_exception(request, ValueError()).status_code, 500)
+
+        self.assertIsNone(self.middleware.process_exception(self.factory.get('/admin/'), ValueError()))
+
+
+class MiddlewareStackTests(APITestCase):
+    fixtures = ['fixtures/test_data.json']
+
+    def setUp(self):
+        tiered_cache.clear()
+
+    def test_api_skips_admin_middleware(self):
+        """Test API responses don't go through sessions, CSRF or clickjacking protection"""
+        client = APIClient(enforce_csrf_checks=True)
+        client.force_authenticate(user=User.objects.get(email="test@example.com"))
+
+        response = client.get(reverse('kudos-history'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.has_header('X-Frame-Options'))
+        self.assertFalse(hasattr(response.wsgi_request, 'session'))
+
+    def test_admin_uses_full_stack(self):
+        """Test the admin still gets sessions, authentication and CSRF checks"""
+        client = Client(enforce_csrf_checks=True)
+        response = client.get('/admin/login/')
+        self.assertEqual(response['X-Frame-Options'], 'DENY')
+        self.assertIn('csrftoken', response.cookies)
+
+        response = client.post('/admin/login/', {'username': 'admin@example.com', 'password': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        client.force_login(User.objects.get(email='admin@example.com'))
+        self.assertEqual(client.get('/admin/').status_code, status.HTTP_200_OK)
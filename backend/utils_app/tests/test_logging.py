@@ -0,0 +1,157 @@
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from utils_app import log_handlers
+from utils_app.log_handlers import JsonFormatter, QueuedStreamHandler, QueuedWatchedFileHandler, SamplingFilter
+
+
+class SlowStream(io.StringIO):
+    """Stream stalling every write, like a blocked disk or pipe"""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def write(self, text):
+        time.sleep(self.delay)
+        return super().write(text)
+
+
+class QueuedStreamHandlerTests(SimpleTestCase):
+
+    def make_logger(self, handler):
+        handler.setFormatter(JsonFormatter())
+        self.addCleanup(handler.close)
+        logger = logging.getLogger(f'utils_app.tests.logging.{id(handler)}')
+        logger.propagate = False
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        return logger
+
+    def test_slow_sink_does_not_block(self):
+        """Test logging returns at once while the stream stalls, and every record is written"""
+        stream = SlowStream(delay=0.05)
+        handler = QueuedStreamHandler(stream=stream)
+        logger = self.make_logger(handler)
+
+        start = time.perf_counter()
+        for number in range(10):
+            logger.info("Record %s", number, extra={'user': 1})
+        self.assertLess(time.perf_counter() - start, 0.25)
+
+        handler.flush()
+        entries = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([entry['message'] for entry in entries], [f"Record {number}" for number in range(10)])
+        self.assertEqual(entries[0]['user'], 1)
+
+    def test_full_queue_drops_and_reports(self):
+        """Test a full queue drops records instead of blocking and says how many it dropped"""
+        stream = io.StringIO()
+        handler = QueuedStreamHandler(stream=stream, queue_size=2)
+        logger = self.make_logger(handler)
+        release = threading.Event()
+        # Hold the writer thread so the queue fills up
+        with mock.patch.object(handler.target, 'handle', side_effect=lambda record: release.wait()):
+            for number in range(6):
+                logger.info("Record %s", number)
+            self.assertGreater(handler.dropped, 0)
+            dropped = handler.dropped
+            release.set()
+            handler.flush()
+
+        logger.info("After")
+        handler.flush()
+        messages = [json.loads(line)['message'] for line in stream.getvalue().splitlines()]
+        self.assertEqual(messages, [f"Dropped {dropped} log records, the log queue was full", "After"])
+
+    def test_concurrent_starts_start_one_writer(self):
+        """Test threads starting the writer at once, outside the handler lock emit holds, start a single one"""
+        stream = io.StringIO()
+        handler = QueuedStreamHandler(stream=stream)
+        logger = self.make_logger(handler)
+        started = []
+        start = log_handlers.QueueListener.start
+
+        def slow_start(listener):
+            # Widen the window between the check and the start
+            time.sleep(0.05)
+            started.append(listener)
+            start(listener)
+
+        barrier = threading.Barrier(4)
+
+        def log(number):
+            barrier.wait()
+            handler.start_listener()
+            logger.info("Record %s", number)
+
+        with mock.patch.object(log_handlers.QueueListener, 'start', slow_start):
+            threads = [threading.Thread(target=log, args=(number,)) for number in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        handler.flush()
+
+        self.assertEqual(started, [handler.listener])
+        self.assertEqual(len(stream.getvalue().splitlines()), 4)
+
+
+class QueuedWatchedFileHandlerTests(SimpleTestCase):
+
+    def test_shared_file_survives_external_rotation(self):
+        """Test handlers sharing a file, as processes do, keep every record across a logrotate-style move"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'django.log')
+        handlers = [QueuedWatchedFileHandler(path), QueuedWatchedFileHandler(path)]
+        for handler in handlers:
+            handler.setFormatter(JsonFormatter())
+            self.addCleanup(handler.close)
+
+        def log(message):
+            for number, handler in enumerate(handlers):
+                handler.handle(logging.makeLogRecord({'msg': f"{message} {number}", 'levelno': logging.INFO}))
+                handler.flush()
+
+        log("Before")
+        os.rename(path, path + '.1')
+        log("After")
+
+        def messages(name):
+            with open(name) as file:
+                return sorted(json.loads(line)['message'] for line in file)
+        self.assertEqual(messages(path + '.1'), ['Before 0', 'Before 1'])
+        self.assertEqual(messages(path), ['After 0', 'After 1'])
+
+
+class SamplingFilterTests(SimpleTestCase):
+
+    def record(self, name, level=logging.INFO):
+        return logging.LogRecord(name, level, __file__, 0, "message", (), None)
+
+    def test_samples_info_per_logger(self):
+        """Test INFO records of sampled loggers and their children are thinned, others kept"""
+        sampling = SamplingFilter({'celery.app.trace': 0.1, 'accounts': 0})
+
+        with mock.patch('utils_app.log_handlers.random.random', return_value=0.05):
+            self.assertTrue(sampling.filter(self.record('celery.app.trace')))
+        with mock.patch('utils_app.log_handlers.random.random', return_value=0.5):
+            self.assertFalse(sampling.filter(self.record('celery.app.trace')))
+            self.assertFalse(sampling.filter(self.record('accounts.serializers.auth_serializers')))
+            self.assertTrue(sampling.filter(self.record('celery.worker')))
+            self.assertTrue(sampling.filter(self.record('kudos_app')))
+
+    def test_warnings_always_pass(self):
+        """Test warnings and errors are never sampled away"""
+        sampling = SamplingFilter({'accounts': 0})
+        self.assertTrue(sampling.filter(self.record('accounts', logging.WARNING)))
+        self.assertTrue(sampling.filter(self.record('accounts', logging.ERROR)))
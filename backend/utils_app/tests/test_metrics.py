@@ -0,0 +1,115 @@
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from accounts.models import User
+from utils_app.utils import tiered_cache
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Observes one request in a fresh process, as a gunicorn worker would
+OBSERVE = """
+import django
+django.setup()
+from utils_app.utils.custom_metrics import REQUEST_DURATION
+REQUEST_DURATION.labels('GET', '/api/v1/kudos/received/', '200').observe(0.01)
+"""
+
+RENDER = """
+import django
+django.setup()
+from utils_app.utils.custom_metrics import render_metrics
+print(render_metrics()[0].decode())
+"""
+
+
+class MetricsTests(APITestCase):
+    fixtures = ['fixtures/test_data.json']
+
+    def setUp(self):
+        tiered_cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.get(email="test@example.com"))
+
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_records_request_metrics(self):
+        """Test latency, status, query count and size are recorded per route"""
+        route = '/api/v1/kudos/received/'
+        before = self.sample('http_request_duration_seconds_count', method='GET', route=route, status='200')
+        queries_before = self.sample('http_request_db_queries_sum', route=route)
+
+        response = self.client.get(reverse('kudos-received'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.sample('http_request_duration_seconds_count', method='GET', route=route, status='200'), before + 1)
+        self.assertGreater(self.sample('http_request_db_queries_sum', route=route), queries_before)
+        self.assertGreater(self.sample('http_response_size_bytes_count', route=route), 0)
+
+    def test_unmatched_paths_share_a_route(self):
+        """Test requests that resolve to no URL can't add a series per path"""
+        before = self.sample('http_request_duration_seconds_count', method='GET', route='<unmatched>', status='404')
+        self.client.get('/api/v1/no-such-endpoint/1234/')
+        self.assertEqual(self.sample('http_request_duration_seconds_count', method='GET', route='<unmatched>', status='404'), before + 1)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_metrics_endpoint(self):
+        """Test the endpoint serves the Prometheus text format without a JWT"""
+        self.client.get(reverse('kudos-received'))
+        self.client.force_authenticate(user=None)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer scrape-secret')
+
+        response = self.client.get('/api/v1/utils/metrics')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn(b'http_request_duration_seconds_bucket{le="0.005",method="GET",route="/api/v1/kudos/received/"', response.content)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_metrics_token(self):
+        """Test a configured METRICS_TOKEN is required"""
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get('/api/v1/utils/metrics').status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(self.client.get('/api/v1/utils/metrics').status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(self.client.get('/api/v1/utils/metrics').status_code, status.HTTP_200_OK)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_metrics_without_token(self):
+        """Test the endpoint is closed when no METRICS_TOKEN is configured, unless DEBUG is on"""
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get('/api/v1/utils/metrics').status_code, status.HTTP_403_FORBIDDEN)
+
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get('/api/v1/utils/metrics').status_code, status.HTTP_200_OK)
+
+    def test_multiprocess_aggregation(self):
+        """Test the samples of several worker processes are summed in multiprocess mode"""
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                **os.environ,
+                'PROMETHEUS_MULTIPROC_DIR': directory,
+                'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE,
+            }
+            for _ in range(2):
+                subprocess.run([sys.executable, '-c', OBSERVE], cwd=BASE_DIR, env=env, check=True)
+            output = subprocess.run(
+                [sys.executable, '-c', RENDER], cwd=BASE_DIR, env=env, check=True, capture_output=True, text=True
+            ).stdout
+
+        self.assertIn(
+            'http_request_duration_seconds_count{method="GET",route="/api/v1/kudos/received/",status="200"} 2.0',
+            output
+        )
@@ -0,0 +1,98 @@
+import os
+import tempfile
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+from utils_app.utils import custom_profiling, tiered_cache
+
+
+class ProfilingTests(APITestCase):
+    fixtures = ['fixtures/test_data.json']
+
+    def setUp(self):
+        tiered_cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.profile_dir = directory.name
+        profile_dir = override_settings(PROFILE_DIR=self.profile_dir)
+        profile_dir.enable()
+        self.addCleanup(profile_dir.disable)
+        self.user = User.objects.get(email="test@example.com")
+        self.user.is_staff = True
+        self.user.save()
+        self.client = self.client_for(self.user)
+
+    def client_for(self, user):
+        # The middleware sees the bearer token, not DRF's forced authentication
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return client
+
+    def profiled_get(self, client, **extra):
+        with override_settings(PROFILING_ENABLED=True):
+            return client.get(reverse('kudos-leaderboard'), **extra)
+
+    def test_staff_profile_request(self):
+        """Test a staff request asking for a profile stores one and can read it back"""
+        response = self.profiled_get(self.client, data={'_profile': '1'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        profile_id = response['X-Profile-Id']
+
+        response = self.client.get(reverse('profile-detail', args=[profile_id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        summary = response.data['data']
+        self.assertEqual(summary['view'], 'kudos_app.views.kudos_views.OrganizationKudosLeaderboardView')
+        self.assertEqual(summary['query_count'], len(summary['queries']))
+        self.assertGreater(summary['query_count'], 0)
+        self.assertTrue(any('kudos_app/views/kudos_views.py' in function['function'] for function in summary['functions']))
+        self.assertGreater(summary['peak_memory_bytes'], 0)
+
+        response = self.client.get(reverse('profile-download', args=[profile_id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('attachment', response['Content-Disposition'])
+
+    def test_profile_header(self):
+        """Test the X-Profile header works like the query parameter"""
+        response = self.profiled_get(self.client, HTTP_X_PROFILE='1')
+        self.assertTrue(response.has_header('X-Profile-Id'))
+
+    def test_only_staff_can_profile(self):
+        """Test other users get the plain response and can't read profiles"""
+        client = self.client_for(User.objects.get(email="member@example.com"))
+        response = self.profiled_get(client, data={'_profile': '1'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.has_header('X-Profile-Id'))
+        self.assertEqual(os.listdir(self.profile_dir), [])
+
+        profile_id = self.profiled_get(self.client, data={'_profile': '1'})['X-Profile-Id']
+        response = client.get(reverse('profile-detail', args=[profile_id]))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_one_profile_at_a_time(self):
+        """Test a request asking for a profile while another is profiled is served without one"""
+        with custom_profiling._profiling:
+            response = self.profiled_get(self.client, data={'_profile': '1'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.has_header('X-Profile-Id'))
+        self.assertEqual(os.listdir(self.profile_dir), [])
+
+        response = self.profiled_get(self.client, data={'_profile': '1'})
+        self.assertTrue(response.has_header('X-Profile-Id'))
+
+    def test_disabled_by_default(self):
+        """Test nothing is profiled unless PROFILING_ENABLED"""
+        response = self.client.get(reverse('kudos-leaderboard'), {'_profile': '1'})
+        self.assertFalse(response.has_header('X-Profile-Id'))
+        self.assertEqual(os.listdir(self.profile_dir), [])
+
+    def test_old_profiles_are_pruned(self):
+        """Test only the PROFILE_KEEP most recent profiles are kept"""
+        with override_settings(PROFILE_KEEP=1):
+            self.profiled_get(self.client, data={'_profile': '1'})
+            profile_id = self.profiled_get(self.client, data={'_profile': '1'})['X-Profile-Id']
+        self.assertEqual(sorted(os.listdir(self.profile_dir)), [f'{profile_id}.json', f'{profile_id}.prof'])
@@ -0,0 +1,48 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.client import RequestFactory
+
+from utils_app.utils.custom_metrics import track_queries
+from utils_app.utils.custom_query_observer import observe
+from utils_app.utils.custom_slow_log import record_queries
+from utils_app.utils.custom_tracing import InMemorySpanExporter, start_trace, trace_queries, use_exporter
+
+
+@override_settings(SLOW_QUERY_MS=10000, SLOW_QUERY_SAMPLE_RATE=0, SLOW_REQUEST_MS=10000)
+class QueryObserverTests(TestCase):
+
+    def setUp(self):
+        self.request = RequestFactory().get('/api/v1/kudos/received/')
+
+    def run_query(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+
+    def test_consumers_share_one_timing(self):
+        """Test stacked metrics, slow log and tracing install one wrapper and see the same duration"""
+        traceparent = f'00-{"1" * 32}-{"2" * 16}-01'
+        with use_exporter(InMemorySpanExporter()) as exporter, \
+                start_trace('GET', traceparent=traceparent), trace_queries(), \
+                track_queries() as stats, record_queries(self.request) as recorder, trace_queries():
+            self.assertEqual(connection.execute_wrappers.count(observe), 1)
+            self.run_query()
+        self.assertEqual(connection.execute_wrappers, [])
+
+        [span] = [span for span in exporter.spans if span.name == 'SQL SELECT']
+        self.assertEqual(stats.count, 1)
+        self.assertEqual(recorder.queries[0]['ms'], round(stats.seconds * 1000, 3))
+        self.assertEqual(span.end_ns - span.start_ns, round(stats.seconds * 1e9))
+
+    def test_origin_only_when_needed(self):
+        """Test the calling frame is only looked up for logged queries, slow requests and profiles"""
+        with record_queries(self.request) as recorder:
+            self.run_query()
+        self.assertIsNone(recorder.queries[0]['origin'])
+
+        with record_queries(self.request, log=False, origins=True) as recorder:
+            self.run_query()
+        self.assertTrue(recorder.queries[0]['origin'].startswith('utils_app/tests/test_query_observer.py:'))
+
+        with override_settings(SLOW_REQUEST_MS=0), record_queries(self.request) as recorder:
+            self.run_query()
+        self.assertIn('in QueryObserverTests.run_query', recorder.queries[0]['origin'])
@@ -0,0 +1,121 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from unittest import mock
+
+import msgpack
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
+
+from accounts.models import User
+from utils_app.utils import tiered_cache
+from utils_app.utils.custom_parsers import OrjsonParser, MessagePackParser
+from utils_app.utils.custom_renderers import OrjsonRenderer, MessagePackRenderer
+
+
+class RendererTests(SimpleTestCase):
+    data = {
+        'created_at': datetime.datetime(2024, 3, 8, 10, 30, 0, 123456, tzinfo=datetime.timezone.utc),
+        'day': datetime.date(2024, 3, 8),
+        'amount': Decimal('12.50'),
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'errors': {'email': [ErrorDetail('Enter a valid email address', code='invalid')]},
+        'users': {1: {'name': 'Zoë'}, 2: {'name': 'line\u2028separator'}},
+        'rows': [1, 2.5, None, True],
+    }
+
+    def test_orjson_matches_stock_renderer(self):
+        """Test the orjson renderer is byte-for-byte compatible with JSONRenderer"""
+        self.assertEqual(
+            OrjsonRenderer().render(self.data),
+            JSONRenderer().render(self.data)
+        )
+
+    def test_orjson_indent_uses_stock_renderer(self):
+        """Test pretty printing falls back to the stock implementation"""
+        self.assertEqual(
+            OrjsonRenderer().render(self.data, 'application/json; indent=4'),
+            JSONRenderer().render(self.data, 'application/json; indent=4')
+        )
+
+    def test_msgpack_round_trip(self):
+        """Test MessagePack output decodes to the same values as the JSON output"""
+        payload = MessagePackRenderer().render(self.data)
+        decoded = msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+        self.assertEqual(decoded['created_at'], '2024-03-08T10:30:00.123456Z')
+        self.assertEqual(decoded['amount'], 12.5)
+        self.assertEqual(decoded['users'][1], {'name': 'Zoë'})
+
+    def test_parsers(self):
+        """Test both parsers decode their payloads and reject garbage"""
+        self.assertEqual(OrjsonParser().parse(io.BytesIO(b'{"a": [1, 2]}')), {'a': [1, 2]})
+        self.assertEqual(MessagePackParser().parse(io.BytesIO(msgpack.packb({'a': 1}))), {'a': 1})
+
+        with self.assertRaises(ParseError):
+            OrjsonParser().parse(io.BytesIO(b'{"a":'))
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(io.BytesIO(b'\xc1'))
+
+
+    def test_msgpack_missing(self):
+        """Test the MessagePack classes refuse to load without msgpack instead of failing per request"""
+        with mock.patch('utils_app.utils.custom_renderers.msgpack', None), self.assertRaises(ImproperlyConfigured):
+            MessagePackRenderer()
+        with mock.patch('utils_app.utils.custom_parsers.msgpack', None), self.assertRaises(ImproperlyConfigured):
+            MessagePackParser()
+
+class ContentNegotiationTests(APITestCase):
+    fixtures = ['fixtures/test_data.json']
+
+    def setUp(self):
+        tiered_cache.clear()
+        self.client = APIClient()
+        self.sender = User.objects.get(email="test@example.com")
+        self.receiver = User.objects.get(email="member@example.com")
+        self.client.force_authenticate(user=self.sender)
+
+    def test_msgpack_response(self):
+        """Test clients can ask for MessagePack responses"""
+        response = self.client.get(reverse('kudos-history'), HTTP_ACCEPT='application/msgpack')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        body = msgpack.unpackb(response.content, raw=False)
+        self.assertEqual(body['count'], 2)
+
+    def test_etag_depends_on_representation(self):
+        """Test a JSON ETag doesn't make a MessagePack request a 304"""
+        for name in ('kudos-history', 'kudos-leaderboard'):
+            json_etag = self.client.get(reverse(name), HTTP_ACCEPT='application/json')['ETag']
+            response = self.client.get(reverse(name), HTTP_ACCEPT='application/msgpack', HTTP_IF_NONE_MATCH=json_etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, name)
+            self.assertNotEqual(response['ETag'], json_etag)
+            self.assertEqual(response['Content-Type'], 'application/msgpack')
+
+    def test_msgpack_request(self):
+        """Test MessagePack request bodies are parsed"""
+        response = self.client.post(
+            reverse('give-kudos'),
+            msgpack.packb({'receiver': self.receiver.id, 'message': 'Packed thanks!'}),
+            content_type='application/msgpack'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['data']['message'], 'Packed thanks!')
+
+    def test_json_request(self):
+        """Test JSON request bodies go through the orjson parser"""
+        response = self.client.post(
+            reverse('give-kudos'),
+            {'receiver': self.receiver.id, 'message': 'JSON thanks!'},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -0,0 +1,114 @@
+import json
+import logging
+import os
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from accounts.models import User
+from utils_app.log_handlers import JsonFormatter, QueuedWatchedFileHandler
+from utils_app.utils import tiered_cache
+
+
+class SlowLogTests(APITestCase):
+    fixtures = ['fixtures/test_data.json']
+
+    def setUp(self):
+        tiered_cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.get(email="test@example.com"))
+
+    @override_settings(SLOW_QUERY_MS=0)
+    def test_slow_queries_name_view_and_frame(self):
+        """Test a slow query is attributed to the view and the serializer method that ran it"""
+        with self.assertLogs('utils_app.slow_log', 'WARNING') as logs:
+            response = self.client.post(reverse('add-organization-user'), {
+                'email': 'slow@example.com',
+                'first_name': 'Slow',
+                'password': 'testpass@123',
+                'password_confirm': 'testpass@123',
+            })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        queries = [record for record in logs.records if record.event == 'query']
+        self.assertTrue(all(record.slow and record.getMessage() == "Slow query" for record in queries))
+        self.assertEqual({record.view for record in queries}, {'accounts.views.organization_views.AddOrganizationUserView'})
+        role_queries = [record for record in queries if record.origin and 'UserListSerializer.get_role' in record.origin]
+        self.assertEqual(len(role_queries), 1)
+        self.assertTrue(role_queries[0].origin.startswith('accounts/serializers/user_serializers.py:'))
+        self.assertIn('auth_group', role_queries[0].sql)
+
+    @override_settings(SLOW_QUERY_MS=10000, SLOW_QUERY_SAMPLE_RATE=0, SLOW_REQUEST_MS=10000)
+    def test_fast_requests_are_not_logged(self):
+        """Test nothing is logged under the thresholds without sampling"""
+        with self.assertNoLogs('utils_app.slow_log'):
+            self.client.get(reverse('kudos-leaderboard'))
+
+    @override_settings(SLOW_QUERY_MS=10000, SLOW_QUERY_SAMPLE_RATE=1)
+    def test_sampled_queries(self):
+        """Test sampled queries are logged as such"""
+        with self.assertLogs('utils_app.slow_log', 'WARNING') as logs:
+            self.client.get(reverse('kudos-leaderboard'))
+        self.assertTrue(logs.records)
+        self.assertTrue(all(record.getMessage() == "Sampled query" and not record.slow for record in logs.records))
+
+    @override_settings(SLOW_QUERY_MS=10000, SLOW_QUERY_SAMPLE_RATE=0, SLOW_REQUEST_MS=0)
+    def test_slow_requests_carry_their_queries(self):
+        """Test a slow request is logged once with every query it ran"""
+        with self.assertLogs('utils_app.slow_log', 'WARNING') as logs:
+            self.client.get(reverse('kudos-leaderboard'))
+
+        [record] = logs.records
+        self.assertEqual((record.event, record.method, record.status), ('request', 'GET', 200))
+        self.assertEqual(record.view, 'kudos_app.views.kudos_views.OrganizationKudosLeaderboardView')
+        self.assertEqual(record.query_count, len(record.queries))
+        self.assertGreater(record.query_count, 0)
+        self.assertTrue(all({'sql', 'ms', 'database', 'origin'} <= set(query) for query in record.queries))
+
+
+class QueuedFileHandlerTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'slow.log')
+        self.handler = QueuedWatchedFileHandler(self.path)
+        self.handler.setFormatter(JsonFormatter())
+        self.addCleanup(self.handler.close)
+        self.logger = logging.getLogger('utils_app.tests.queued')
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+        self.addCleanup(self.logger.removeHandler, self.handler)
+
+    def test_writes_json_lines_in_the_background(self):
+        """Test records are written as JSON, with their extra fields"""
+        for number in range(10):
+            self.logger.warning("Query %s", number, extra={'sql': 'SELECT 1', 'ms': 1.5})
+        self.handler.flush()
+
+        with open(self.path) as file:
+            lines = file.readlines()
+        self.assertEqual(len(lines), 10)
+        entry = json.loads(lines[-1])
+        self.assertEqual(
+            {key: entry[key] for key in ('level', 'logger', 'message', 'sql', 'ms')},
+            {'level': 'WARNING', 'logger': 'utils_app.tests.queued', 'message': 'Query 9', 'sql': 'SELECT 1', 'ms': 1.5}
+        )
+
+    def test_restarts_writer_after_fork(self):
+        """Test a process that didn't start the writer thread starts its own"""
+        self.logger.warning("Before")
+        parent_listener = self.handler.listener
+        # What a forked child sees: a listener owned by another process
+        self.handler.listener_pid = -1
+        self.logger.warning("After")
+        self.handler.flush()
+
+        self.assertIsNot(self.handler.listener, parent_listener)
+        parent_listener.stop()
+        with open(self.path) as file:
+            # Two writer threads, so the order between them isn't fixed
+            self.assertCountEqual([json.loads(line)['message'] for line in file], ['Before', 'After'])
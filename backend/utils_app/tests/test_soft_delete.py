@@ -0,0 +1,105 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from accounts.models import User
+from accounts.utils.organization_cache import get_organization_version
+from kudos_app.models import Kudos
+from utils_app.models.base_model import SoftDeleteQuerySet
+from utils_app.signals import post_bulk_soft_delete, post_bulk_restore
+from utils_app.utils import tiered_cache
+
+
+class SoftDeleteQuerySetTests(TestCase):
+    fixtures = ['fixtures/test_data.json']
+
+    def setUp(self):
+        tiered_cache.clear()
+        self.owner = User.objects.get(email="test@example.com")
+        self.signals = []
+        for signal in (post_bulk_soft_delete, post_bulk_restore):
+            signal.connect(self.record_signal)
+            self.addCleanup(signal.disconnect, self.record_signal)
+
+    def record_signal(self, signal, sender, pks, **kwargs):
+        self.signals.append((signal, sender, sorted(pks)))
+
+    def test_soft_delete_updates_in_batches(self):
+        """Test one UPDATE runs per batch and one signal per call"""
+        kudos = Kudos.objects.filter(receiver__organization=self.owner.organization)
+        expected = sorted(kudos.values_list('pk', flat=True))
+        before = kudos.order_by('-updated_at').first().updated_at
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                pks = kudos.soft_delete(user=self.owner, batch_size=2)
+
+        updates = [query for query in queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 3)
+        self.assertEqual(sorted(pks), expected)
+        self.assertEqual(self.signals, [(post_bulk_soft_delete, Kudos, expected)])
+
+        self.assertFalse(Kudos.active_objects.filter(pk__in=pks).exists())
+        deleted = Kudos.objects.get(pk=pks[0])
+        self.assertTrue(deleted.is_deleted)
+        self.assertEqual(deleted.deleted_by, self.owner)
+        self.assertGreater(deleted.updated_at, before)
+
+    def test_soft_delete_skips_inactive_rows(self):
+        """Test rows already soft deleted are left alone"""
+        Kudos.objects.filter(pk=1).soft_delete()
+        pks = Kudos.objects.filter(pk__in=[1, 2]).soft_delete()
+        self.assertEqual(pks, [2])
+
+        self.signals.clear()
+        self.assertEqual(Kudos.objects.filter(pk__in=[1, 2]).soft_delete(), [])
+        self.assertEqual(self.signals, [])
+
+    def test_concurrent_soft_delete_is_not_applied_twice(self):
+        """Test a row another call deletes between the pk lookup and the UPDATE keeps that deletion"""
+        earlier = now() - timedelta(hours=1)
+        values_list = SoftDeleteQuerySet.values_list
+        raced = []
+
+        def race(queryset, *args, **kwargs):
+            rows = values_list(queryset, *args, **kwargs)
+            if not raced:
+                # The pk lookup has run, then another request deletes pk 1
+                len(rows)
+                raced.append(True)
+                Kudos.objects.filter(pk=1).update(is_active=False, is_deleted=True, deleted_at=earlier, updated_at=earlier)
+            return rows
+
+        with mock.patch.object(SoftDeleteQuerySet, 'values_list', race):
+            pks = Kudos.objects.filter(pk__in=[1, 2]).soft_delete(user=self.owner)
+
+        self.assertEqual(pks, [2])
+        self.assertEqual(self.signals, [(post_bulk_soft_delete, Kudos, [2])])
+        self.assertEqual(Kudos.objects.get(pk=1).deleted_at, earlier)
+        self.assertIsNone(Kudos.objects.get(pk=1).deleted_by)
+
+    def test_restore(self):
+        """Test restore clears the deletion fields"""
+        Kudos.objects.filter(pk__in=[1, 2]).soft_delete(user=self.owner)
+        pks = Kudos.objects.filter(pk__in=[1, 2]).restore()
+
+        self.assertEqual(sorted(pks), [1, 2])
+        self.assertEqual(self.signals[-1], (post_bulk_restore, Kudos, [1, 2]))
+        self.assertEqual(
+            Kudos.active_objects.filter(pk__in=[1, 2], is_deleted=False, deleted_by=None).count(), 2
+        )
+
+    def test_user_managers(self):
+        """Test users get the bulk methods and the active manager"""
+        member = User.objects.get(email="member@example.com")
+        with self.captureOnCommitCallbacks(execute=True):
+            version = get_organization_version(member.organization_id)
+            User.objects.filter(pk=member.pk).soft_delete(user=self.owner)
+
+        self.assertFalse(User.active_objects.filter(pk=member.pk).exists())
+        self.assertTrue(User.objects.filter(pk=member.pk).exists())
+        self.assertNotEqual(get_organization_version(member.organization_id), version)
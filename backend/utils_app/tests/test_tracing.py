@@ -0,0 +1,194 @@
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+
+from celery import signals
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+from kudos_app.tasks import reset_weekly_kudos
+from utils_app.utils import tiered_cache
+from utils_app.utils.custom_tracing import (
+    TRACEPARENT, BatchSpanProcessor, FileSpanExporter, InMemorySpanExporter, OTLPSpanExporter,
+    Span, SpanExporter, start_span, start_trace, use_exporter
+)
+
+REMOTE_TRACE_ID = '4bf92f3577b34da6a3ce929d0e0e4736'
+REMOTE_SPAN_ID = '00f067aa0ba902b7'
+
+
+@override_settings(TRACING_ENABLED=True, TRACE_SAMPLE_RATE=1.0)
+class RequestTracingTests(APITestCase):
+    fixtures = ['fixtures/test_data.json']
+
+    def setUp(self):
+        tiered_cache.clear()
+        self.exporter = self.enterContext(use_exporter(InMemorySpanExporter()))
+        self.user = User.objects.get(email="test@example.com")
+        # The middleware is loaded per client, under the settings above
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def spans_named(self, name):
+        return [span for span in self.exporter.spans if span.name == name]
+
+    def give_kudos(self, **extra):
+        receiver = User.objects.get(email="member@example.com")
+        return self.client.post(
+            reverse('give-kudos'), {'receiver': receiver.pk, 'message': "Thanks"}, format='json', **extra
+        )
+
+    def test_give_kudos_trace(self):
+        """Test a request is traced through the view, authentication, validation, Kudos.save and its queries"""
+        response = self.give_kudos()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        [root] = self.spans_named('POST /api/v1/kudos/give/')
+        self.assertIsNone(root.parent_id)
+        self.assertEqual(response['X-Trace-Id'], root.trace_id)
+        self.assertEqual(root.attributes['http.status_code'], 201)
+        self.assertEqual(root.attributes['enduser.id'], self.user.pk)
+        self.assertTrue(all(span.trace_id == root.trace_id for span in self.exporter.spans))
+
+        [view] = self.spans_named('kudos_app.views.kudos_views.GiveKudosView')
+        self.assertEqual(view.parent_id, root.span_id)
+        for name in ('authenticate', 'KudosCreateSerializer.is_valid', 'Kudos.save', 'sender quota update'):
+            self.assertEqual(self.spans_named(name)[0].parent_id, view.span_id, name)
+
+        [save] = self.spans_named('Kudos.save')
+        [quota] = self.spans_named('kudos quota update')
+        self.assertEqual(quota.parent_id, save.span_id)
+        queries = [span for span in self.exporter.spans if span.parent_id == quota.span_id]
+        self.assertEqual([span.name for span in queries], ['SQL SELECT', 'SQL UPDATE'])
+        self.assertIn('kudos_available', queries[1].attributes['db.statement'])
+
+        self.assertTrue(self.spans_named('cache.get_many'))
+
+    def test_continues_caller_trace(self):
+        """Test a sampled traceparent header makes the request part of the caller's trace"""
+        self.give_kudos(HTTP_TRACEPARENT=f'00-{REMOTE_TRACE_ID}-{REMOTE_SPAN_ID}-01')
+        [root] = self.spans_named('POST /api/v1/kudos/give/')
+        self.assertEqual((root.trace_id, root.parent_id), (REMOTE_TRACE_ID, REMOTE_SPAN_ID))
+
+    def test_unsampled(self):
+        """Test nothing is recorded for unsampled traces, whether decided here or by the caller"""
+        response = self.give_kudos(HTTP_TRACEPARENT=f'00-{REMOTE_TRACE_ID}-{REMOTE_SPAN_ID}-00')
+        self.assertFalse(response.has_header('X-Trace-Id'))
+
+        with override_settings(TRACE_SAMPLE_RATE=0.0):
+            client = APIClient()
+            client.force_authenticate(self.user)
+            client.get(reverse('kudos-leaderboard'))
+        self.assertEqual(self.exporter.spans, [])
+
+    @override_settings(TRACING_ENABLED=False)
+    def test_disabled(self):
+        response = self.give_kudos()
+        self.assertFalse(response.has_header('X-Trace-Id'))
+        self.assertEqual(self.exporter.spans, [])
+
+
+@override_settings(TRACING_ENABLED=True, TRACE_SAMPLE_RATE=1.0)
+class TaskTracingTests(APITestCase):
+    fixtures = ['fixtures/test_data.json']
+
+    def setUp(self):
+        self.exporter = self.enterContext(use_exporter(InMemorySpanExporter()))
+
+    def test_trace_follows_task(self):
+        """Test publishing a task adds the traceparent header and the task continues that trace"""
+        headers = {}
+        with start_trace('POST /api/v1/kudos/give/') as root:
+            signals.before_task_publish.send(sender=reset_weekly_kudos.name, headers=headers)
+        self.assertEqual(headers[TRACEPARENT], root.traceparent)
+
+        # As the worker would run it, outside any trace
+        reset_weekly_kudos.apply(headers=headers)
+        [task] = [span for span in self.exporter.spans if span.name == 'task kudos_app.tasks.reset_weekly_kudos']
+        self.assertEqual((task.trace_id, task.parent_id), (root.trace_id, root.span_id))
+        self.assertEqual(task.attributes['celery.state'], 'SUCCESS')
+        self.assertIn('SQL UPDATE', [span.name for span in self.exporter.spans if span.parent_id == task.span_id])
+
+    def test_eager_task_joins_current_trace(self):
+        with start_trace('command') as root:
+            reset_weekly_kudos.apply()
+        [task] = [span for span in self.exporter.spans if span.name.startswith('task ')]
+        self.assertEqual(task.parent_id, root.span_id)
+
+
+class SlowExporter(SpanExporter):
+
+    def __init__(self):
+        self.exported = []
+
+    def export(self, spans):
+        time.sleep(0.05)
+        self.exported.extend(spans)
+
+
+class ExportTests(SimpleTestCase):
+
+    def ended_span(self, name='span'):
+        span = Span(name, REMOTE_TRACE_ID, REMOTE_SPAN_ID, attributes={'db.name': 'default', 'rows': 3})
+        span.end_ns = span.start_ns + 1000
+        return span
+
+    def test_file_exporter(self):
+        """Test spans are appended as OTLP/JSON lines"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'traces', 'traces.jsonl')
+            FileSpanExporter(path).export([self.ended_span('a'), self.ended_span('b')])
+            with open(path) as file:
+                lines = [json.loads(line) for line in file]
+        self.assertEqual([line['name'] for line in lines], ['a', 'b'])
+        self.assertEqual(lines[0]['parentSpanId'], REMOTE_SPAN_ID)
+        self.assertIn({'key': 'rows', 'value': {'intValue': '3'}}, lines[0]['attributes'])
+
+    def test_file_exporter_follows_rotation(self):
+        """Test the batches after logrotate moves the file go to a new one"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'traces.jsonl')
+            exporter = FileSpanExporter(path)
+            exporter.export([self.ended_span('a')])
+            os.rename(path, path + '.1')
+            exporter.export([self.ended_span('b')])
+            with open(path + '.1') as rotated, open(path) as current:
+                self.assertEqual([json.loads(line)['name'] for line in rotated], ['a'])
+                self.assertEqual([json.loads(line)['name'] for line in current], ['b'])
+
+    def test_otlp_exporter(self):
+        """Test spans are posted as an OTLP/HTTP JSON export request"""
+        exporter = OTLPSpanExporter('http://collector:4318/v1/traces', 'kudos-backend', headers={'authorization': 'token'})
+        with mock.patch('utils_app.utils.custom_tracing.urllib.request.urlopen') as urlopen:
+            exporter.export([self.ended_span()])
+        request = urlopen.call_args.args[0]
+        self.assertEqual(request.full_url, 'http://collector:4318/v1/traces')
+        self.assertEqual(request.get_header('Authorization'), 'token')
+        [resource] = json.loads(request.data)['resourceSpans']
+        self.assertEqual(resource['resource']['attributes'][0]['value'], {'stringValue': 'kudos-backend'})
+        self.assertEqual(resource['scopeSpans'][0]['spans'][0]['traceId'], REMOTE_TRACE_ID)
+
+    def test_batch_processor_exports_off_thread(self):
+        """Test ending spans doesn't wait for a slow exporter, and flushing delivers them all"""
+        exporter = SlowExporter()
+        processor = BatchSpanProcessor(exporter, batch_size=2, interval=0.01)
+        start = time.perf_counter()
+        for number in range(6):
+            processor.on_end(self.ended_span(str(number)))
+        self.assertLess(time.perf_counter() - start, 0.05)
+
+        processor.force_flush()
+        self.assertEqual([span.name for span in exporter.exported], [str(number) for number in range(6)])
+
+    def test_start_span_outside_trace(self):
+        """Test instrumented code runs untraced outside a trace"""
+        with use_exporter(InMemorySpanExporter()) as exporter, start_span('cache.get') as span:
+            pass
+        self.assertIsNone(span)
+        self.assertEqual(exporter.spans, [])
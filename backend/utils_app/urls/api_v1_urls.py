@@ -1,5 +1,9 @@
 from django.urls import path
+from utils_app.views.metrics_views import MetricsView
+from utils_app.views.profile_views import ProfileDetailView, ProfileDownloadView
 
 urlpatterns = [
-   
-]
\ No newline at end of file
+    path('metrics', MetricsView.as_view(), name='metrics'),
+    path('profiles/<slug:profile_id>/', ProfileDetailView.as_view(), name='profile-detail'),
+    path('profiles/<slug:profile_id>/download/', ProfileDownloadView.as_view(), name='profile-download'),
+]
@@ -1,8 +1,12 @@
 from .custom_messages import SUCCESS_MESSAGES, ERROR_MESSAGES, AUTH_MESSAGES
 from .custom_api_response import api_response
 from .custom_exception_handler import custom_exception_handler
-from .custom_pagination import CustomPagination
-from .custom_permissions import IsOrganizationOwner
+from .custom_pagination import CustomPagination, QuerySetChain
+from .custom_permissions import IsOrganizationOwner, HasMetricsToken
+from .custom_cache import TieredCache, tiered_cache
+from .custom_conditional import make_etag, set_validators, conditional_response
+from .custom_db_router import ReadOnlyViewMixin, use_primary, use_replica, stick_to_primary
+from .custom_tracing import current_span, start_span, traced
 
 __all__ = [
     'SUCCESS_MESSAGES',
@@ -11,5 +15,19 @@ __all__ = [
     'api_response',
     'custom_exception_handler',
     'CustomPagination',
-    'IsOrganizationOwner'
+    'QuerySetChain',
+    'IsOrganizationOwner',
+    'HasMetricsToken',
+    'TieredCache',
+    'tiered_cache',
+    'make_etag',
+    'set_validators',
+    'conditional_response',
+    'ReadOnlyViewMixin',
+    'use_primary',
+    'use_replica',
+    'stick_to_primary',
+    'current_span',
+    'start_span',
+    'traced'
 ]
@@ -1,7 +1,9 @@
 from rest_framework.response import Response
 
+from .custom_conditional import set_validators
 
-def api_response(response_type, data=None, errors=None):
+
+def api_response(response_type, data=None, errors=None, etag=None, last_modified=None):
     """
     Simple standardized API response
     
@@ -9,6 +11,8 @@ def api_response(response_type, data=None, errors=None):
         response_type (dict): Message dictionary from custom_messages.py
         data: Response data (optional)
         errors: Error details (optional)
+        etag: ETag validator for conditional GETs (optional)
+        last_modified: Last-Modified datetime for conditional GETs (optional)
     """
     response_body = {
         "message": response_type["message"],
@@ -18,5 +22,8 @@ def api_response(response_type, data=None, errors=None):
         "errors": errors
     }
 
-    return Response(response_body, status=response_type["status_code"])
+    response = Response(response_body, status=response_type["status_code"])
+    if etag or last_modified:
+        set_validators(response, etag=etag, last_modified=last_modified)
+    return response
 
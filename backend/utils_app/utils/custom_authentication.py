@@ -0,0 +1,11 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from utils_app.utils.custom_tracing import traced
+
+
+class TracedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication timed as an 'authenticate' span of the current trace"""
+
+    @traced('authenticate')
+    def authenticate(self, request):
+        return super().authenticate(request)
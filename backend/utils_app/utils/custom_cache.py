@@ -0,0 +1,280 @@
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from utils_app.utils.custom_tracing import traced
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LocalLRUCache:
+    """
+    Small per-process LRU cache with a TTL, kept in front of the shared cache.
+
+    Values are shared between callers, so they must be treated as read-only.
+    """
+
+    def __init__(self, maxsize=1024, ttl=5):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class TieredCache:
+    """
+    Two-tier cache: a per-process LRU in front of the shared Django cache (Redis).
+
+    Invalidation is done with namespace versions: every key built through
+    ``versioned_key`` embeds the current version of its ``(namespace, scope)``,
+    so bumping the version orphans all of them in O(1).
+    """
+
+    LOCK_STRIPES = 64
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, alias='default', local_maxsize=None, local_ttl=None,
+                 lock_timeout=None, wait_timeout=None):
+        self.alias = alias
+        self.local = LocalLRUCache(
+            maxsize=local_maxsize if local_maxsize is not None
+            else getattr(settings, 'TIERED_CACHE_LOCAL_MAXSIZE', 1024),
+            ttl=local_ttl if local_ttl is not None
+            else getattr(settings, 'TIERED_CACHE_LOCAL_TTL_SECONDS', 5),
+        )
+        self.lock_timeout = lock_timeout if lock_timeout is not None \
+            else getattr(settings, 'TIERED_CACHE_LOCK_TIMEOUT_SECONDS', 10)
+        self.wait_timeout = wait_timeout if wait_timeout is not None \
+            else getattr(settings, 'TIERED_CACHE_WAIT_TIMEOUT_SECONDS', 5)
+        self._key_locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        self._stats_lock = threading.Lock()
+        self._stats = {}
+        self.reset_stats()
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    # Counters
+
+    def _incr_stat(self, name, delta=1):
+        with self._stats_lock:
+            self._stats[name] += delta
+
+    def stats(self):
+        """Return a snapshot of the hit/miss counters of this process"""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats = {
+                'local_hits': 0,
+                'shared_hits': 0,
+                'misses': 0,
+                'computes': 0,
+                'lock_waits': 0,
+            }
+
+    # Plain get/set
+
+    @traced('cache.get')
+    def get(self, key, default=None):
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            self._incr_stat('local_hits')
+            return value
+
+        value = self.shared.get(key, _MISSING)
+        if value is not _MISSING:
+            self._incr_stat('shared_hits')
+            self.local.set(key, value)
+            return value
+
+        self._incr_stat('misses')
+        return default
+
+    @traced('cache.get_many')
+    def get_many(self, keys):
+        """Return a dict with the values found for ``keys``, reading each tier once"""
+        found = {}
+        remaining = []
+        for key in keys:
+            value = self.local.get(key, _MISSING)
+            if value is _MISSING:
+                remaining.append(key)
+            else:
+                found[key] = value
+        self._incr_stat('local_hits', len(found))
+
+        if remaining:
+            shared_found = self.shared.get_many(remaining)
+            for key, value in shared_found.items():
+                self.local.set(key, value)
+            found.update(shared_found)
+            self._incr_stat('shared_hits', len(shared_found))
+            self._incr_stat('misses', len(remaining) - len(shared_found))
+        return found
+
+    @traced('cache.set')
+    def set(self, key, value, timeout=None):
+        timeout = self._timeout(timeout)
+        self.shared.set(key, value, timeout)
+        self.local.set(key, value, timeout)
+
+    @traced('cache.set_many')
+    def set_many(self, mapping, timeout=None):
+        if not mapping:
+            return
+        timeout = self._timeout(timeout)
+        self.shared.set_many(mapping, timeout)
+        for key, value in mapping.items():
+            self.local.set(key, value, timeout)
+
+    @traced('cache.delete')
+    def delete(self, key):
+        self.local.delete(key)
+        self.shared.delete(key)
+
+    def clear(self):
+        """Clear both tiers (mostly useful in tests)"""
+        self.local.clear()
+        self.shared.clear()
+
+    def _timeout(self, timeout):
+        if timeout is None:
+            timeout = getattr(settings, 'TIERED_CACHE_DEFAULT_TIMEOUT_SECONDS', 300)
+        return timeout
+
+    # Namespace versions
+
+    @staticmethod
+    def _version_key(namespace, scope):
+        return f"nsv:{namespace}:{scope}"
+
+    @staticmethod
+    def _initial_version():
+        # Seeding with a clock value instead of 1 keeps a version that was
+        # evicted from colliding with keys written under its old value.
+        return int(time.time() * 1000)
+
+    @traced('cache.get_version')
+    def get_version(self, namespace, scope):
+        """Return the current version of ``(namespace, scope)``, always read from the shared tier"""
+        version_key = self._version_key(namespace, scope)
+        version = self.shared.get(version_key)
+        if version is None:
+            self.shared.add(version_key, self._initial_version(), None)
+            version = self.shared.get(version_key)
+        return version
+
+    @traced('cache.bump_version')
+    def bump_version(self, namespace, scope):
+        """Invalidate every key of ``(namespace, scope)`` by moving to a new version"""
+        version_key = self._version_key(namespace, scope)
+        try:
+            return self.shared.incr(version_key)
+        except ValueError:
+            version = self._initial_version()
+            if not self.shared.add(version_key, version, None):
+                return self.shared.incr(version_key)
+            return version
+
+    def versioned_key(self, namespace, scope, *parts, version=None):
+        """Build a key under the current (or given) version of ``(namespace, scope)``"""
+        if version is None:
+            version = self.get_version(namespace, scope)
+        suffix = ':'.join(str(part) for part in parts)
+        return f"{namespace}:{scope}:v{version}:{suffix}"
+
+    # Single-flight recomputation
+
+    def _key_lock(self, key):
+        return self._key_locks[zlib.crc32(key.encode()) % self.LOCK_STRIPES]
+
+    @traced('cache.get_or_set')
+    def get_or_set(self, key, compute, timeout=None):
+        """
+        Return the cached value for ``key`` or compute it exactly once.
+
+        Threads of this process serialize on a striped lock and other
+        processes on a short-lived lock key in the shared cache; losers wait
+        for the winner's value instead of recomputing it.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._key_lock(key):
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+            lock_key = f"lock:{key}"
+            if self.shared.add(lock_key, 1, self.lock_timeout):
+                try:
+                    return self._compute_and_set(key, compute, timeout)
+                finally:
+                    self.shared.delete(lock_key)
+
+            self._incr_stat('lock_waits')
+            deadline = time.monotonic() + self.wait_timeout
+            while time.monotonic() < deadline:
+                time.sleep(self.POLL_INTERVAL)
+                value = self.shared.get(key, _MISSING)
+                if value is not _MISSING:
+                    self._incr_stat('shared_hits')
+                    self.local.set(key, value)
+                    return value
+
+            logger.warning(f"Timed out waiting for cache key {key}, computing it locally")
+            return self._compute_and_set(key, compute, timeout)
+
+    def _compute_and_set(self, key, compute, timeout):
+        value = compute()
+        self._incr_stat('computes')
+        self.set(key, value, timeout)
+        return value
+
+
+tiered_cache = TieredCache()
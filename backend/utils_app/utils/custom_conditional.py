@@ -0,0 +1,83 @@
+import hashlib
+
+from django.db.models import Count, Max, Value
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+def make_etag(*parts):
+    """
+    Build a quoted ETag from the given parts (versions, ids, request path...)
+    """
+    seed = ':'.join(str(part) for part in parts)
+    return '"%s"' % hashlib.md5(seed.encode(), usedforsecurity=False).hexdigest()
+
+
+def queryset_validators(queryset, *parts):
+    """
+    Derive (etag, count) from a cheap MAX(updated_at)/COUNT probe
+
+    No Last-Modified is derived: MAX(updated_at) of the remaining rows doesn't
+    move when a row is deleted or the cache version is bumped, and HTTP dates
+    only have second precision, so the ETag (which also covers the count and
+    the parts) is the only validator.
+
+    Args:
+        queryset: Queryset of a model with ``updated_at`` (filters only, no ordering needed),
+            or a QuerySetChain of them, probed part by part
+        parts: Extra ETag parts, e.g. the request path or a cache version
+    """
+    parts_to_probe = getattr(queryset, 'querysets', (queryset,))
+    probes = [
+        part.order_by().annotate(probe=Value(1)).values('probe')
+        .annotate(last_modified=Max('updated_at'), count=Count('pk'))
+        .values('last_modified', 'count')
+        for part in parts_to_probe
+    ]
+    # One round trip however many parts there are
+    rows = list(probes[0].union(*probes[1:], all=True)) if len(probes) > 1 else list(probes[0])
+    count = sum(row['count'] for row in rows)
+    last_modified = max((row['last_modified'] for row in rows if row['last_modified']), default=None)
+    etag = make_etag(
+        count,
+        last_modified.isoformat() if last_modified else None,
+        *parts
+    )
+    return etag, count
+
+
+def set_validators(response, etag=None, last_modified=None):
+    """
+    Attach ETag/Last-Modified to a response and ask clients to revalidate.
+
+    Args:
+        response: Response to update
+        etag: Quoted ETag (optional)
+        last_modified: Aware datetime of the last change (optional)
+    """
+    if etag:
+        response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_response(request, etag=None, last_modified=None):
+    """
+    Return a 304 response when the client's validators still match, else None
+
+    Meant to be called before any expensive query or serialization.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return None
+
+    validators = set_validators(HttpResponse(), etag, last_modified)
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+        response=validators,
+    )
+    return None if response is validators else response
@@ -0,0 +1,121 @@
+import contextlib
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+PRIMARY_ALIAS = 'default'
+REPLICA_ALIAS = 'replica'
+
+# Set while a read-only view runs; the router sends its reads to the replica
+_replica_reads = ContextVar('replica_reads', default=False)
+# Per-request record of writes, installed by PrimaryStickinessMiddleware
+_write_tracker = ContextVar('write_tracker', default=None)
+
+
+def has_replica():
+    return REPLICA_ALIAS in connections.settings
+
+
+def sticky_key(scope, key):
+    return f"primary-sticky:{scope}:{key}"
+
+
+def stick_to_primary(scope, key):
+    """
+    Keep reads of ``scope`` (e.g. a user or an organization) on the primary
+    for DATABASE_REPLICA_STICKY_SECONDS, so replica lag can't hide a write
+
+    Stored in the shared cache, not the tiered one, so every process sees it at once.
+    """
+    if key is None or not has_replica():
+        return
+    cache.set(sticky_key(scope, key), True, timeout=settings.DATABASE_REPLICA_STICKY_SECONDS)
+
+
+def is_stuck_to_primary(*scopes):
+    """Return True when any (scope, key) pair wrote recently"""
+    keys = [sticky_key(scope, key) for scope, key in scopes if key is not None]
+    return bool(keys) and bool(cache.get_many(keys))
+
+
+@contextlib.contextmanager
+def use_replica():
+    """Route the reads of the enclosed block to the replica"""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextlib.contextmanager
+def use_primary():
+    """Route the reads of the enclosed block to the primary, even inside a read-only view"""
+    token = _replica_reads.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextlib.contextmanager
+def track_writes():
+    """Yield a dict whose ``wrote`` flag turns True once the block routes a write"""
+    tracker = {'wrote': False}
+    token = _write_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _write_tracker.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Database router sending the reads of read-only views to the ``replica``
+    alias when one is configured; everything else uses the primary
+    """
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and has_replica():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        tracker = _write_tracker.get()
+        if tracker is not None:
+            tracker['wrote'] = True
+        return PRIMARY_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return {obj1._state.db, obj2._state.db} <= {PRIMARY_ALIAS, REPLICA_ALIAS}
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_ALIAS
+
+
+class ReadOnlyViewMixin:
+    """
+    APIView mixin marking the view read-only: queries of safe requests run on
+    the replica, unless the user or their organization wrote within the
+    sticky window. Authentication still reads from the primary.
+    """
+
+    def get_sticky_scopes(self, request):
+        # 'org' is accounts.utils.organization_cache.ORGANIZATION_NAMESPACE
+        return [('user', request.user.pk), ('org', getattr(request.user, 'organization_id', None))]
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and has_replica() and not is_stuck_to_primary(*self.get_sticky_scopes(request)):
+            self._replica_token = _replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            _replica_reads.reset(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
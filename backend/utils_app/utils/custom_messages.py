@@ -15,6 +15,11 @@ SUCCESS_MESSAGES = {
         "status_code": 200,
         "action": "deleted"
     },
+    "RESTORE": {
+        "message": "Data restored successfully",
+        "status_code": 200,
+        "action": "restored"
+    },
     "RETRIEVE": {
         "message": "Data retrieved successfully",
         "status_code": 200,
@@ -0,0 +1,90 @@
+import os
+
+from utils_app.utils.custom_query_observer import QueryConsumer, observe_queries
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # Metrics are disabled without the client
+    prometheus_client = None
+
+# Set (before the app is imported) to aggregate the metrics of several worker
+# processes through files in this directory; gunicorn.conf.py does it
+MULTIPROCESS_ENV = 'PROMETHEUS_MULTIPROC_DIR'
+
+# Requests that resolve to no URL pattern share one label, so scanners can't
+# create a series per path
+UNMATCHED_ROUTE = '<unmatched>'
+
+if prometheus_client is not None:
+    REQUEST_DURATION = prometheus_client.Histogram(
+        'http_request_duration_seconds', 'Request latency per route',
+        ['method', 'route', 'status'],
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    )
+    REQUEST_DB_QUERIES = prometheus_client.Histogram(
+        'http_request_db_queries', 'Database queries per request',
+        ['route'],
+        buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+    )
+    REQUEST_DB_DURATION = prometheus_client.Histogram(
+        'http_request_db_duration_seconds', 'Time per request spent in database queries',
+        ['route'],
+        buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+    )
+    RESPONSE_SIZE = prometheus_client.Histogram(
+        'http_response_size_bytes', 'Response body size per route, after compression',
+        ['route'],
+        buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576)
+    )
+
+
+def metrics_enabled():
+    return prometheus_client is not None
+
+
+class QueryStats(QueryConsumer):
+    """Query consumer counting the queries it sees and the time they take"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def query_finished(self, query):
+        self.count += 1
+        self.seconds += query.seconds
+
+
+def track_queries():
+    """Yield a QueryStats recording the queries of the enclosed block on every database"""
+    return observe_queries(QueryStats())
+
+
+def route_of(request):
+    """Return the URL pattern a request resolved to, e.g. 'api/v1/kudos/received/'"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return UNMATCHED_ROUTE
+    return '/' + match.route
+
+
+def observe_request(request, response, seconds, queries):
+    route = route_of(request)
+    REQUEST_DURATION.labels(request.method, route, str(response.status_code)).observe(seconds)
+    REQUEST_DB_QUERIES.labels(route).observe(queries.count)
+    REQUEST_DB_DURATION.labels(route).observe(queries.seconds)
+    if not response.streaming:
+        RESPONSE_SIZE.labels(route).observe(len(response.content))
+
+
+def render_metrics():
+    """
+    Return (body, content type) of the metrics in the Prometheus text format,
+    summed over every worker process in multiprocess mode
+    """
+    if os.environ.get(MULTIPROCESS_ENV):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
@@ -1,6 +1,61 @@
+from django.core.paginator import Paginator as DjangoPaginator
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from .custom_messages import SUCCESS_MESSAGES
+from .custom_conditional import queryset_validators, conditional_response, set_validators
+
+class QuerySetChain:
+    """
+    Read-only sequence of ordered querysets paginated as one list, e.g. hot
+    rows followed by their archive. Each part must sort entirely after the
+    previous one.
+
+    A slice only queries a part once it reaches it, and the row count of a
+    part is only needed when a slice starts past its end.
+    """
+    ordered = True
+
+    def __init__(self, *querysets):
+        self.querysets = querysets
+        self._counts = {}
+
+    def map(self, function):
+        """Return a chain of ``function(queryset)`` for every part"""
+        return QuerySetChain(*(function(queryset) for queryset in self.querysets))
+
+    def part_count(self, index):
+        if index not in self._counts:
+            self._counts[index] = self.querysets[index].count()
+        return self._counts[index]
+
+    def count(self):
+        return sum(self.part_count(index) for index in range(len(self.querysets)))
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice) or key.step is not None:
+            raise TypeError("QuerySetChain only supports slicing without a step")
+        start, stop = key.start or 0, key.stop
+        rows = []
+        for index, queryset in enumerate(self.querysets):
+            part = list(queryset[start:stop])
+            rows.extend(part)
+            if stop is not None and len(part) == stop - start:
+                break
+            # The part ended inside the slice or before it; a non-empty short
+            # read tells its size without a COUNT
+            if part or start == 0:
+                self._counts[index] = start + len(part)
+            size = self.part_count(index)
+            start = max(0, start - size)
+            if stop is not None:
+                stop -= size
+                if stop <= 0:
+                    break
+        return rows
+
 
 class CustomPagination(PageNumberPagination):
     """
@@ -11,11 +66,40 @@ class CustomPagination(PageNumberPagination):
     max_page_size = 100
     page_query_param = 'page'
 
-    def get_paginated_response(self, data):
+    # Validators remembered by get_conditional_response()
+    etag = None
+    probed_count = None
+
+    def get_conditional_response(self, request, queryset, *parts):
+        """
+        Probe the queryset validators and return a 304 response when the client's
+        copy is still fresh, before the page query and serializer run.
+        Otherwise the validators are attached by get_paginated_response().
+        Each renderer's representation gets its own ETag.
+        """
+        self.etag, self.probed_count = queryset_validators(
+            queryset, request.get_full_path(), request.accepted_renderer.format, *parts
+        )
+        return conditional_response(request, etag=self.etag)
+
+    def django_paginator_class(self, object_list, per_page):
+        """
+        Build the Django paginator, reusing the row count of the validator probe
+        """
+        paginator = DjangoPaginator(object_list, per_page)
+        if self.probed_count is not None:
+            paginator.count = self.probed_count
+        return paginator
+
+    def get_paginated_response(self, data, extra=None):
         """
         Return paginated response with metadata at outer level
+
+        Args:
+            data: Serialized page
+            extra (dict): Additional top-level keys, e.g. side-loaded objects (optional)
         """
-        return Response({
+        body = {
             "message": SUCCESS_MESSAGES["RETRIEVE"]["message"],
             "status_code": SUCCESS_MESSAGES["RETRIEVE"]["status_code"],
             "action": SUCCESS_MESSAGES["RETRIEVE"]["action"],
@@ -26,8 +110,13 @@ class CustomPagination(PageNumberPagination):
             "total_pages": self.page.paginator.num_pages,
             "page_size": self.page_size,
             "data": data,
+            **(extra or {}),
             "errors": None
-        }, status=SUCCESS_MESSAGES["RETRIEVE"]["status_code"])
+        }
+        response = Response(body, status=SUCCESS_MESSAGES["RETRIEVE"]["status_code"])
+        if self.etag:
+            set_validators(response, etag=self.etag)
+        return response
 
     def get_paginated_response_schema(self, schema):
         """
@@ -1,3 +1,6 @@
+import hmac
+
+from django.conf import settings
 from rest_framework.permissions import BasePermission
 
 class IsOrganizationOwner(BasePermission):
@@ -7,4 +10,18 @@ class IsOrganizationOwner(BasePermission):
     message = "Only organization owners can perform this action"
 
     def has_permission(self, request, view):
-        return request.user.groups.filter(name='org_owner').exists() 
\ No newline at end of file
+        return request.user.groups.filter(name='org_owner').exists()
+
+
+class HasMetricsToken(BasePermission):
+    """
+    Allow scrapers sending ``Authorization: Bearer <METRICS_TOKEN>``. Without
+    a METRICS_TOKEN nobody is allowed, except under DEBUG
+    """
+    message = "A valid metrics token is required"
+
+    def has_permission(self, request, view):
+        if not settings.METRICS_TOKEN:
+            return settings.DEBUG
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        return scheme.lower() == 'bearer' and hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode())
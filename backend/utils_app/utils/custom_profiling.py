@@ -0,0 +1,136 @@
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from utils_app.utils.custom_slow_log import record_queries, view_name
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_PARAM = '_profile'
+PROFILE_ID_HEADER = 'X-Profile-Id'
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+
+# cProfile and tracemalloc are process wide, so one request is profiled at a time
+_profiling = threading.Lock()
+
+
+def profile_requested(request):
+    return request.GET.get(PROFILE_PARAM) == '1' or request.headers.get(PROFILE_HEADER) == '1'
+
+
+def profiling_user(request):
+    """
+    Return the staff user asking for a profile, or None
+
+    Runs before DRF authenticates the request, so the bearer token is checked here.
+    """
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        try:
+            authenticated = JWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return None
+        user = authenticated[0] if authenticated else None
+    return user if user is not None and user.is_staff else None
+
+
+def profile_path(profile_id, extension):
+    return os.path.join(settings.PROFILE_DIR, f"{profile_id}.{extension}")
+
+
+def run_profiled(get_response, request, user):
+    """
+    Serve the request under cProfile and tracemalloc, store the profile and
+    summary in PROFILE_DIR and tag the response with the profile id; while
+    another request is being profiled it is served without a profile
+    """
+    if not _profiling.acquire(blocking=False):
+        return get_response(request)
+    try:
+        profiler = cProfile.Profile()
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.take_snapshot()
+
+            start = time.perf_counter()
+            with record_queries(request, log=False, origins=True) as recorder:
+                profiler.enable()
+                try:
+                    response = get_response(request)
+                finally:
+                    profiler.disable()
+            seconds = time.perf_counter() - start
+
+            memory_after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+    finally:
+        _profiling.release()
+
+    # Sorts by time, which pruning relies on
+    profile_id = f"{timezone.now():%Y%m%d-%H%M%S-%f}-{uuid.uuid4().hex[:8]}"
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    profiler.dump_stats(profile_path(profile_id, 'prof'))
+
+    stats = pstats.Stats(profiler).sort_stats('cumulative')
+    summary = {
+        'id': profile_id,
+        'user': user.pk,
+        'method': request.method,
+        'path': request.path,
+        'view': view_name(request),
+        'status': response.status_code,
+        'ms': round(seconds * 1000, 3),
+        'query_count': len(recorder.queries),
+        'query_ms': recorder.total_ms,
+        'queries': recorder.queries,
+        'peak_memory_bytes': peak,
+        'allocations': [
+            {'where': str(stat.traceback[0]), 'size_bytes': stat.size_diff, 'count': stat.count_diff}
+            for stat in memory_after.compare_to(memory_before, 'lineno')[:TOP_ALLOCATIONS]
+        ],
+        'functions': [top_function(stats, function) for function in stats.fcn_list[:TOP_FUNCTIONS]],
+    }
+    with open(profile_path(profile_id, 'json'), 'w') as file:
+        json.dump(summary, file, default=str)
+    prune_profiles()
+
+    response[PROFILE_ID_HEADER] = profile_id
+    return response
+
+
+def top_function(stats, function):
+    filename, line, name = function
+    _, calls, own_seconds, cumulative_seconds, _ = stats.stats[function]
+    return {
+        'function': f"{filename}:{line}({name})",
+        'calls': calls,
+        'own_ms': round(own_seconds * 1000, 3),
+        'cumulative_ms': round(cumulative_seconds * 1000, 3),
+    }
+
+
+def prune_profiles():
+    """Keep the PROFILE_KEEP most recent profiles"""
+    profile_ids = sorted(name[:-len('.json')] for name in os.listdir(settings.PROFILE_DIR) if name.endswith('.json'))
+    for profile_id in profile_ids[:-settings.PROFILE_KEEP]:
+        for extension in ('json', 'prof'):
+            try:
+                os.remove(profile_path(profile_id, extension))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,81 @@
+import contextlib
+import contextvars
+import sys
+import time
+
+from django.db import connections
+
+# Consumers watching the queries of the current context, outermost first
+_consumers = contextvars.ContextVar('query_consumers', default=())
+
+
+class ObservedQuery:
+    """
+    One query as the consumers see it. ``frame`` is the frame that called
+    execute(); it is only valid inside the consumer hooks, so anything
+    derived from the stack has to be taken there.
+    """
+
+    def __init__(self, sql, many, connection, frame):
+        self.sql = sql
+        self.many = many
+        self.connection = connection
+        self.frame = frame
+        self.started = time.perf_counter()
+        self.seconds = None
+        self.error = None
+
+
+class QueryConsumer:
+    """Base for the consumers of observed queries"""
+
+    def query_started(self, query):
+        pass
+
+    def query_finished(self, query):
+        pass
+
+
+def observe(execute, sql, params, many, context):
+    """
+    The one database execute wrapper: times each query once and hands it to
+    every consumer of the current context
+    """
+    consumers = _consumers.get()
+    if not consumers:
+        return execute(sql, params, many, context)
+    query = ObservedQuery(sql, many, context['connection'], sys._getframe(1))
+    for consumer in consumers:
+        consumer.query_started(query)
+    try:
+        return execute(sql, params, many, context)
+    except Exception as e:
+        query.error = e
+        raise
+    finally:
+        query.seconds = time.perf_counter() - query.started
+        for consumer in reversed(consumers):
+            consumer.query_finished(query)
+        query.frame = None
+
+
+@contextlib.contextmanager
+def observe_queries(consumer):
+    """
+    Hand the queries of the enclosed block, on every database, to
+    ``consumer``. Nested blocks share the wrapper a connection already has,
+    and a consumer already watching is not added twice.
+    """
+    consumers = _consumers.get()
+    if consumer in consumers:
+        yield consumer
+        return
+    token = _consumers.set(consumers + (consumer,))
+    try:
+        with contextlib.ExitStack() as stack:
+            for connection in connections.all():
+                if observe not in connection.execute_wrappers:
+                    stack.enter_context(connection.execute_wrapper(observe))
+            yield consumer
+    finally:
+        _consumers.reset(token)
@@ -0,0 +1,113 @@
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.utils import encoders
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder of DRF
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+ENVELOPE_QUERY_PARAM = 'envelope'
+ENVELOPE_KEYS = ('message', 'status_code', 'action')
+
+_drf_encoder = encoders.JSONEncoder()
+
+
+def encode_default(obj):
+    """
+    Fallback for objects the fast encoders don't handle natively.
+
+    Delegates to DRF's JSONEncoder so datetimes (``...Z``), Decimals, lazy
+    strings, UUIDs and querysets render exactly like the stock renderer.
+    """
+    return _drf_encoder.default(obj)
+
+
+def compact_envelope(data):
+    """
+    Strip the message/status_code/action wrapper (and empty errors) from a standard response body
+    """
+    if not isinstance(data, dict) or 'status_code' not in data:
+        return data
+    compact = {key: value for key, value in data.items() if key not in ENVELOPE_KEYS}
+    if compact.get('errors') is None:
+        compact.pop('errors', None)
+    return compact
+
+
+def wants_compact_envelope(renderer_context):
+    request = (renderer_context or {}).get('request')
+    return request is not None and request.query_params.get(ENVELOPE_QUERY_PARAM) == 'compact'
+
+
+class EnvelopeRendererMixin:
+    """
+    Renderer mixin applying the opt-in compact envelope (``?envelope=compact``)
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if wants_compact_envelope(renderer_context):
+            data = compact_envelope(data)
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+class OrjsonRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson, byte-compatible with DRF's JSONRenderer.
+
+    Pretty-printed output (``indent``, browsable API) and environments without
+    orjson use the stock implementation.
+    """
+    options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=encode_default, option=self.options)
+
+        # Same strict javascript subset escaping as JSONRenderer
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renderer which serializes to MessagePack.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def __init__(self, *args, **kwargs):
+        if msgpack is None:
+            raise ImproperlyConfigured("msgpack must be installed to render application/msgpack")
+        super().__init__(*args, **kwargs)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
+
+
+class CustomJSONRenderer(EnvelopeRendererMixin, OrjsonRenderer):
+    """
+    Default JSON renderer: orjson-backed and supporting the compact envelope
+    """
+
+
+class CustomMessagePackRenderer(EnvelopeRendererMixin, MessagePackRenderer):
+    """
+    MessagePack renderer supporting the compact envelope
+    """
@@ -0,0 +1,113 @@
+import logging
+import os
+import random
+import sys
+import time
+
+from django.conf import settings
+
+from utils_app.utils.custom_query_observer import QueryConsumer, observe_queries
+
+logger = logging.getLogger('utils_app.slow_log')
+
+# Frames in here are instrumentation or framework code, never the cause of a query
+_SKIPPED_DIRS = tuple(
+    os.path.join(str(settings.BASE_DIR), directory) + os.sep
+    for directory in ('utils_app/utils', 'utils_app/middleware')
+)
+_PROJECT_DIR = str(settings.BASE_DIR) + os.sep
+SQL_MAX_LENGTH = 2000
+
+
+def query_origin(frame=None):
+    """
+    Return the innermost project frame on the stack as
+    'accounts/serializers/user_serializers.py:106 in UserListSerializer.get_role',
+    skipping Django, DRF and the instrumentation itself
+    """
+    frame = frame or sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(_PROJECT_DIR)
+            and not filename.startswith(_SKIPPED_DIRS)
+            and 'site-packages' not in filename
+        ):
+            return f"{filename[len(_PROJECT_DIR):]}:{frame.f_lineno} in {frame.f_code.co_qualname}"
+        frame = frame.f_back
+    return None
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    return match._func_path if match is not None else None
+
+
+class QueryRecorder(QueryConsumer):
+    """
+    Query consumer logging every query slower than SLOW_QUERY_MS, plus a
+    SLOW_QUERY_SAMPLE_RATE sample of the rest, with the view and the project
+    frame that ran it. Also keeps the request's full query list for the
+    slow-request log; with ``log=False`` it only keeps the list.
+
+    Finding the frame walks the stack, so it is only done for logged queries,
+    for those a request runs once it has taken SLOW_REQUEST_MS, and, with
+    ``origins=True``, for every query.
+    """
+
+    def __init__(self, request, log=True, origins=False):
+        self.request = request
+        self.queries = []
+        self.log = log
+        self.origins = origins
+        self.threshold = settings.SLOW_QUERY_MS / 1000
+        self.sample_rate = settings.SLOW_QUERY_SAMPLE_RATE
+        self.started = time.perf_counter()
+        self.slow_request_at = self.started + settings.SLOW_REQUEST_MS / 1000
+
+    def query_finished(self, query):
+        slow = query.seconds >= self.threshold
+        logged = self.log and (slow or random.random() < self.sample_rate)
+        with_origin = logged or self.origins or query.started + query.seconds >= self.slow_request_at
+        entry = {
+            'sql': query.sql[:SQL_MAX_LENGTH],
+            'ms': round(query.seconds * 1000, 3),
+            'database': query.connection.alias,
+            'origin': query_origin(query.frame) if with_origin else None,
+        }
+        self.queries.append(entry)
+
+        if logged:
+            logger.warning(
+                "Slow query" if slow else "Sampled query",
+                extra={'event': 'query', 'slow': slow, 'view': view_name(self.request), **entry}
+            )
+
+    @property
+    def total_ms(self):
+        return round(sum(query['ms'] for query in self.queries), 3)
+
+
+def record_queries(request, log=True, origins=False):
+    """Yield a QueryRecorder watching the queries of the enclosed block on every database"""
+    return observe_queries(QueryRecorder(request, log=log, origins=origins))
+
+
+def log_slow_request(request, response, seconds, recorder):
+    """Log the request, with its full query list, when it took SLOW_REQUEST_MS or longer"""
+    if seconds * 1000 < settings.SLOW_REQUEST_MS:
+        return
+    logger.warning(
+        "Slow request",
+        extra={
+            'event': 'request',
+            'method': request.method,
+            'path': request.path,
+            'view': view_name(request),
+            'status': response.status_code,
+            'ms': round(seconds * 1000, 3),
+            'query_count': len(recorder.queries),
+            'query_ms': recorder.total_ms,
+            'queries': recorder.queries,
+        }
+    )
@@ -0,0 +1,463 @@
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from utils_app.utils.custom_query_observer import QueryConsumer, observe_queries
+
+logger = logging.getLogger(__name__)
+
+# W3C trace context header, also used as the Celery task header
+TRACEPARENT = 'traceparent'
+_TRACEPARENT_RE = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+
+# OTLP span kinds and status codes
+INTERNAL, SERVER, CLIENT, PRODUCER, CONSUMER = 1, 2, 3, 4, 5
+STATUS_UNSET, STATUS_OK, STATUS_ERROR = 0, 1, 2
+
+SQL_MAX_LENGTH = 2000
+
+
+def _new_id(size):
+    return f"{random.getrandbits(size * 8) or 1:0{size * 2}x}"
+
+
+class Span:
+    """
+    One timed operation of a trace. Spans of unsampled traces only carry the
+    ids on, so the decision follows the trace into Celery tasks; they record
+    and export nothing.
+    """
+
+    def __init__(self, name, trace_id, parent_id=None, kind=INTERNAL, attributes=None, sampled=True):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.sampled = sampled
+        self.attributes = dict(attributes or {}) if sampled else {}
+        self.status = STATUS_UNSET
+        self.status_message = ''
+        self.start_ns = time.time_ns() if sampled else 0
+        self.end_ns = None
+
+    @property
+    def traceparent(self):
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    @property
+    def duration_ms(self):
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key, value):
+        if self.sampled:
+            self.attributes[key] = value
+
+    def set_error(self, message):
+        if self.sampled:
+            self.status, self.status_message = STATUS_ERROR, str(message)
+
+    def end(self, end_ns=None):
+        if self.sampled and self.end_ns is None:
+            self.end_ns = end_ns or time.time_ns()
+            get_processor().on_end(self)
+
+    def to_otlp(self):
+        """The span in the OTLP/JSON encoding"""
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': [{'key': key, 'value': otlp_value(value)} for key, value in self.attributes.items()],
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        if self.status != STATUS_UNSET:
+            span['status'] = {'code': self.status, 'message': self.status_message}
+        return span
+
+
+def otlp_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+def current_span():
+    """Return the span of the enclosing trace, or None outside one"""
+    return _current_span.get()
+
+
+def tracing_enabled():
+    return settings.TRACING_ENABLED
+
+
+def parse_traceparent(value):
+    """Return (trace id, parent span id, sampled) of a traceparent header, or None when malformed"""
+    match = _TRACEPARENT_RE.match(value or '')
+    if match is None:
+        return None
+    trace_id, parent_id, flags = match.groups()
+    return trace_id, parent_id, bool(int(flags, 16) & 1)
+
+
+@contextlib.contextmanager
+def _activate(span):
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.set_error(f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+
+
+@contextlib.contextmanager
+def start_trace(name, kind=SERVER, traceparent=None, attributes=None):
+    """
+    Make a root span current for the enclosed block. It continues the remote
+    trace ``traceparent`` names, keeping its sampling decision; otherwise a
+    new trace is sampled at TRACE_SAMPLE_RATE.
+    """
+    parent = parse_traceparent(traceparent)
+    if parent is not None:
+        trace_id, parent_id, sampled = parent
+    else:
+        trace_id, parent_id, sampled = _new_id(16), None, random.random() < settings.TRACE_SAMPLE_RATE
+    with _activate(Span(name, trace_id, parent_id, kind, attributes, sampled)) as span:
+        yield span
+
+
+@contextlib.contextmanager
+def start_span(name, kind=INTERNAL, attributes=None):
+    """
+    Time the enclosed block as a child of the current span. Outside a sampled
+    trace it yields the current span (or None) and records nothing, so
+    instrumented code can call it unconditionally.
+    """
+    parent = _current_span.get()
+    if parent is None or not parent.sampled:
+        yield parent
+        return
+    with _activate(Span(name, parent.trace_id, parent.span_id, kind, attributes)) as span:
+        yield span
+
+
+def traced(name=None, kind=INTERNAL):
+    """Decorator running the function in a child span, named after it by default"""
+    def decorator(function):
+        span_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            parent = _current_span.get()
+            if parent is None or not parent.sampled:
+                return function(*args, **kwargs)
+            with start_span(span_name, kind):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class QuerySpans(QueryConsumer):
+    """Query consumer recording each query of a sampled trace as a span"""
+
+    def query_started(self, query):
+        parent = _current_span.get()
+        if parent is None or not parent.sampled:
+            query.span = None
+            return
+        operation = (query.sql.split(None, 1) or ['SQL'])[0].upper()
+        attributes = {
+            'db.system': query.connection.vendor,
+            'db.name': query.connection.alias,
+            'db.statement': query.sql[:SQL_MAX_LENGTH],
+        }
+        query.span = Span(f"SQL {operation}", parent.trace_id, parent.span_id, CLIENT, attributes)
+
+    def query_finished(self, query):
+        span = query.span
+        if span is not None:
+            if query.error is not None:
+                span.set_error(f"{type(query.error).__name__}: {query.error}")
+            # Timed by the observer, which measured the query already
+            span.end(span.start_ns + round(query.seconds * 1e9))
+
+
+_query_spans = QuerySpans()
+
+
+def trace_queries():
+    """Time the queries of the enclosed block, on every database, as spans of the current trace"""
+    return observe_queries(_query_spans)
+
+
+# Exporters
+
+class SpanExporter:
+    def export(self, spans):
+        raise NotImplementedError
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keep the exported spans in a list, for tests"""
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def export(self, spans):
+        with self._lock:
+            self.spans.extend(spans)
+
+    def clear(self):
+        with self._lock:
+            self.spans = []
+
+
+class FileSpanExporter(SpanExporter):
+    """
+    Append spans to a file, one OTLP/JSON span per line. It never rotates
+    the file, which every process shares; the file is opened per batch, so
+    logrotate (logrotate.conf) can move it away at any time.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def export(self, spans):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        lines = ''.join(json.dumps(span.to_otlp()) + '\n' for span in spans)
+        # One append per batch keeps the lines of several processes whole
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(lines)
+
+
+class OTLPSpanExporter(SpanExporter):
+    """
+    POST spans to an OTLP/HTTP endpoint with the JSON encoding, which the
+    OpenTelemetry Collector, Jaeger and Tempo accept
+    """
+
+    def __init__(self, endpoint, service_name, headers=None, timeout=10):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+
+    def payload(self, spans):
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': [{'key': 'service.name', 'value': otlp_value(self.service_name)}]},
+                'scopeSpans': [{
+                    'scope': {'name': __name__},
+                    'spans': [span.to_otlp() for span in spans],
+                }],
+            }],
+        }
+
+    def export(self, spans):
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(self.payload(spans)).encode(),
+            headers={'Content-Type': 'application/json', **self.headers},
+            method='POST',
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+# Processors
+
+class SimpleSpanProcessor:
+    """Export each span on the thread that ends it"""
+
+    def __init__(self, exporter):
+        self.exporter = exporter
+
+    def on_end(self, span):
+        self.exporter.export([span])
+
+    def force_flush(self):
+        pass
+
+
+class BatchSpanProcessor:
+    """
+    Queue ended spans and export them in batches from a background thread, so
+    a slow collector never holds up requests or tasks. When the queue is full
+    spans are dropped and counted, and the count is logged with the next
+    batch. The thread is (re)started per process, like QueuedHandler's.
+    """
+
+    def __init__(self, exporter, queue_size=2048, batch_size=512, interval=1.0):
+        self.exporter = exporter
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.interval = interval
+        self.queue = None
+        self.pid = None
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self.pid != os.getpid():
+            with self._lock:
+                if self.pid != os.getpid():
+                    # A forked child inherits the queue but not the export thread
+                    self.queue = queue.Queue(self.queue_size)
+                    threading.Thread(target=self.run, name='span-exporter', daemon=True).start()
+                    self.pid = os.getpid()
+
+    def on_end(self, span):
+        self.start()
+        try:
+            self.queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def next_batch(self):
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def run(self):
+        while True:
+            batch = self.next_batch()
+            if self.dropped:
+                dropped, self.dropped = self.dropped, 0
+                logger.warning("Dropped %d spans, the span queue was full", dropped)
+            try:
+                self.exporter.export(batch)
+            except Exception:
+                logger.warning("Exporting %d spans failed", len(batch), exc_info=True)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def force_flush(self):
+        """Wait until the queued spans are exported"""
+        if self.pid == os.getpid():
+            self.queue.join()
+
+
+_processor = None
+_processor_lock = threading.Lock()
+
+
+def build_processor():
+    if settings.TRACE_EXPORTER == 'file':
+        exporter = FileSpanExporter(settings.TRACE_FILE)
+    elif settings.TRACE_EXPORTER == 'otlp':
+        exporter = OTLPSpanExporter(
+            settings.TRACE_OTLP_ENDPOINT, settings.TRACE_SERVICE_NAME, headers=settings.TRACE_OTLP_HEADERS
+        )
+    else:
+        raise ImproperlyConfigured(f"Unknown TRACE_EXPORTER {settings.TRACE_EXPORTER!r}, use 'file' or 'otlp'")
+    return BatchSpanProcessor(exporter, queue_size=settings.TRACE_QUEUE_SIZE)
+
+
+def get_processor():
+    global _processor
+    if _processor is None:
+        with _processor_lock:
+            if _processor is None:
+                _processor = build_processor()
+    return _processor
+
+
+@contextlib.contextmanager
+def use_exporter(exporter):
+    """Export the spans ended in the enclosed block straight to ``exporter``, e.g. an InMemorySpanExporter"""
+    global _processor
+    previous, _processor = _processor, SimpleSpanProcessor(exporter)
+    try:
+        yield exporter
+    finally:
+        _processor = previous
+
+
+# Celery
+
+# Task id -> (span, ExitStack closing it), from task_prerun to task_postrun
+_task_scopes = {}
+
+
+def inject_task_headers(headers=None, **kwargs):
+    """before_task_publish receiver passing the current trace on to the task"""
+    span = _current_span.get()
+    if span is not None and headers is not None:
+        headers.setdefault(TRACEPARENT, span.traceparent)
+
+
+def start_task_span(task_id=None, task=None, **kwargs):
+    """task_prerun receiver opening the span of the task, continuing the publisher's trace"""
+    if not tracing_enabled():
+        return
+    request = task.request
+    traceparent = request.get(TRACEPARENT) or (request.headers or {}).get(TRACEPARENT)
+    attributes = {'celery.task_name': task.name, 'celery.task_id': task_id}
+    scope = contextlib.ExitStack()
+    name = f"task {task.name}"
+    if traceparent is None and _current_span.get() is not None:
+        # Run eagerly, inside the caller's trace
+        span = scope.enter_context(start_span(name, CONSUMER, attributes))
+    else:
+        span = scope.enter_context(start_trace(name, CONSUMER, traceparent, attributes))
+    scope.enter_context(trace_queries())
+    _task_scopes[task_id] = (span, scope)
+
+
+def fail_task_span(task_id=None, exception=None, **kwargs):
+    """task_failure receiver marking the task's span as failed"""
+    if task_id in _task_scopes:
+        _task_scopes[task_id][0].set_error(f"{type(exception).__name__}: {exception}")
+
+
+def end_task_span(task_id=None, state=None, **kwargs):
+    """task_postrun receiver ending the task's span"""
+    if task_id in _task_scopes:
+        span, scope = _task_scopes.pop(task_id)
+        span.set_attribute('celery.state', state)
+        scope.close()
+
+
+def connect_celery_signals():
+    from celery import signals
+
+    signals.before_task_publish.connect(inject_task_headers, weak=False, dispatch_uid='tracing_publish')
+    signals.task_prerun.connect(start_task_span, weak=False, dispatch_uid='tracing_prerun')
+    signals.task_failure.connect(fail_task_span, weak=False, dispatch_uid='tracing_failure')
+    signals.task_postrun.connect(end_task_span, weak=False, dispatch_uid='tracing_postrun')
@@ -0,0 +1,50 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+
+from utils_app.serializers import BulkIdsSerializer
+from utils_app.utils import (
+    SUCCESS_MESSAGES,
+    ERROR_MESSAGES,
+    api_response,
+    IsOrganizationOwner
+)
+
+
+class BulkSoftDeleteView(APIView):
+    """
+    Base owner-only API view soft deleting, or with ``restore=True`` restoring,
+    the rows listed in ``ids`` with one UPDATE per batch
+
+    Ids outside get_queryset() are ignored; the response lists the rows that changed.
+    """
+    permission_classes = [IsAuthenticated, IsOrganizationOwner]
+    restore = False
+
+    def get_queryset(self, request):
+        raise NotImplementedError
+
+    def post(self, request):
+        serializer = BulkIdsSerializer(data=request.data)
+
+        if serializer.is_valid():
+            try:
+                queryset = self.get_queryset(request).filter(pk__in=serializer.validated_data['ids'])
+                if self.restore:
+                    pks = queryset.restore()
+                else:
+                    pks = queryset.soft_delete(user=request.user)
+
+                return api_response(
+                    SUCCESS_MESSAGES["RESTORE" if self.restore else "DELETE"],
+                    data={'ids': sorted(pks), 'count': len(pks)}
+                )
+            except Exception as e:
+                return api_response(
+                    ERROR_MESSAGES["SERVER_ERROR"],
+                    errors={"detail": str(e)}
+                )
+
+        return api_response(
+            ERROR_MESSAGES["VALIDATION"],
+            errors=serializer.errors
+        )
@@ -0,0 +1,19 @@
+from django.http import HttpResponse
+from rest_framework.views import APIView
+
+from utils_app.utils import ERROR_MESSAGES, api_response, HasMetricsToken
+from utils_app.utils.custom_metrics import metrics_enabled, render_metrics
+
+
+class MetricsView(APIView):
+    """
+    API view exposing the request and database metrics in the Prometheus text format
+    """
+    authentication_classes = []
+    permission_classes = [HasMetricsToken]
+
+    def get(self, request):
+        if not metrics_enabled():
+            return api_response(ERROR_MESSAGES["NOT_FOUND"])
+        body, content_type = render_metrics()
+        return HttpResponse(body, content_type=content_type)
@@ -0,0 +1,45 @@
+import json
+import os
+
+from django.http import FileResponse
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+
+from utils_app.utils import SUCCESS_MESSAGES, ERROR_MESSAGES, api_response
+from utils_app.utils.custom_profiling import profile_path
+
+
+class ProfileDetailView(APIView):
+    """
+    API view for staff reading the summary of a profiled request: SQL
+    timings, top functions by cumulative time and memory allocations
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request, profile_id):
+        try:
+            with open(profile_path(profile_id, 'json')) as file:
+                summary = json.load(file)
+        except FileNotFoundError:
+            return api_response(ERROR_MESSAGES["NOT_FOUND"])
+        except Exception as e:
+            return api_response(
+                ERROR_MESSAGES["SERVER_ERROR"],
+                errors={"detail": str(e)}
+            )
+
+        return api_response(SUCCESS_MESSAGES["RETRIEVE"], data=summary)
+
+
+class ProfileDownloadView(APIView):
+    """
+    API view for staff downloading the cProfile stats of a profiled request,
+    e.g. for snakeviz or pstats
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request, profile_id):
+        path = profile_path(profile_id, 'prof')
+        if not os.path.exists(path):
+            return api_response(ERROR_MESSAGES["NOT_FOUND"])
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=os.path.basename(path))